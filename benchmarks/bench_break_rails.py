@@ -0,0 +1,35 @@
+"""
+Compares breaking the rails with an exception and with a sentinel result.
+
+Usage: python -m benchmarks.bench_break_rails
+"""
+import timeit
+
+from on_rails.BreakRailsMode import BreakRailsMode
+from on_rails.decorator import def_result
+from on_rails.Result import Result
+
+N = 20_000
+
+
+def make_func(mode):
+    @def_result()
+    def func(value):
+        return Result.ok(value) \
+            .break_rails(value > 0, mode=mode) \
+            .on_success(lambda v: v * 2) \
+            .on_success_tee(lambda: None) \
+            .finally_tee(lambda: None)
+
+    return func
+
+
+def main():
+    for mode in BreakRailsMode:
+        func = make_func(mode)
+        seconds = min(timeit.repeat(lambda: func(1), number=N, repeat=5))
+        print(f"{mode.name:<12}{seconds / N * 1e6:>8.2f} us/call")
+
+
+if __name__ == '__main__':
+    main()
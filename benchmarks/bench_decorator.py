@@ -0,0 +1,34 @@
+"""
+Measures the per-call overhead of def_result against a bare function call.
+
+Usage: python -m benchmarks.bench_decorator
+"""
+import timeit
+
+from on_rails.decorator import def_result
+
+N = 200_000
+
+
+def add(a, b=1):
+    return a + b
+
+
+def fail(a, b=1):
+    raise ValueError("fake")
+
+
+def main():
+    cases = [
+        ("bare call", add),
+        ("def_result()", def_result()(add)),
+        ("def_result(num_of_try=2)", def_result(num_of_try=2)(add)),
+        ("def_result() raising", def_result()(fail)),
+    ]
+    for name, func in cases:
+        seconds = min(timeit.repeat(lambda: func(1, b=2), number=N, repeat=5))
+        print(f"{name:<28}{seconds / N * 1e9:>8.0f} ns/call")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Measures the memory (bytes per instance) of Result and ResultDetail objects.
+
+The "with __dict__" numbers use subclasses that do not define `__slots__`, which is how the classes were
+stored before they were slotted.
+
+Usage: python -m benchmarks.bench_memory
+"""
+import tracemalloc
+
+from on_rails.Result import Result
+from on_rails.ResultDetails.ErrorDetail import StackTraceMode, StackTracePolicy
+from on_rails.ResultDetails.Errors.ValidationError import ValidationError
+
+N = 100_000
+NO_STACK_TRACE = StackTracePolicy(StackTraceMode.OFF)
+
+
+class DictResult(Result):
+    pass
+
+
+class DictValidationError(ValidationError):
+    pass
+
+
+def measure(factory) -> float:
+    tracemalloc.start()
+    objects = [factory(i) for i in range(N)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / N
+
+
+def chain(result_cls):
+    def factory(i):
+        return result_cls(True, value=i) \
+            .on_success(lambda value: result_cls(True, value=value + 1)) \
+            .on_success(lambda value: result_cls(True, value=value * 2)) \
+            .on_success_tee(lambda value: None) \
+            .on_success(lambda value: result_cls(True, value=value - 1)) \
+            .on_success(lambda value: result_cls(True, value=value))
+
+    return factory
+
+
+def main():
+    cases = [
+        ("Result.ok", lambda i: Result.ok(i), lambda i: DictResult(True, value=i)),
+        ("Result.fail(ValidationError())",
+         lambda i: Result.fail(ValidationError(stack_trace_policy=NO_STACK_TRACE)),
+         lambda i: DictResult(False, DictValidationError(stack_trace_policy=NO_STACK_TRACE))),
+        ("5-step chain", chain(Result), chain(DictResult)),
+    ]
+    print(f"{'case':<32}{'with __dict__':>16}{'slotted':>12}")
+    for name, slotted, with_dict in cases:
+        print(f"{name:<32}{measure(with_dict):>14.1f} B{measure(slotted):>10.1f} B")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Measures the time and the peak memory of writing and reading failed results as NDJSON with `on_rails.io`.
+The write time includes creating the failures (and their stack traces). The peak memory should not grow with the
+number of the results.
+
+Usage: python -m benchmarks.bench_ndjson
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+from on_rails.io import read_ndjson, write_ndjson
+from on_rails.Result import Result
+from on_rails.ResultDetails.Errors.NotFoundError import NotFoundError
+from on_rails.ResultDetails.Errors.ValidationError import ValidationError
+
+
+def generate_failures(count):
+    for i in range(count):
+        if i % 2:
+            detail = ValidationError(message="The input is not valid.", errors={'name': 'is required', 'age': '< 0'})
+        else:
+            detail = NotFoundError(message=f"The user {i} is not found.", more_data=[{'user_id': i}])
+        yield Result.fail(detail)
+
+
+def measure(name, count, func):
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    # The memory is traced in a second run, since tracing slows the first one down.
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{name:<8}{count:>10,} results {seconds * 1e3:>10.1f} ms {peak / 1024:>10,.0f} KiB peak")
+
+
+def write(path, count):
+    with open(path, 'wb') as file:
+        write_ndjson(generate_failures(count), file)
+
+
+def read(path):
+    with open(path, 'rb') as file:
+        for _ in read_ndjson(file):
+            pass
+
+
+def main():
+    fd, path = tempfile.mkstemp(suffix='.ndjson')
+    os.close(fd)
+    try:
+        for count in (10_000, 50_000):
+            measure('write', count, lambda: write(path, count))
+            measure('read', count, lambda: read(path))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Compares a compiled Pipeline with the equivalent fluent Result chain.
+
+Usage: python -m benchmarks.bench_pipeline
+"""
+import timeit
+
+from on_rails.Pipeline import Pipeline
+from on_rails.Result import Result
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+
+N = 20_000
+ERROR = ErrorDetail("negative value")
+
+
+def double(value):
+    return value * 2
+
+
+def log(value):
+    pass
+
+
+def recover(prev):
+    return 0
+
+
+def chain(value):
+    return Result.ok(value) \
+        .on_success(double) \
+        .on_success_tee(log) \
+        .on_success_fail_when(lambda v: v < 0, ERROR) \
+        .on_fail(recover) \
+        .finally_tee(lambda: None)
+
+
+PIPELINE = Pipeline() \
+    .on_success(double) \
+    .on_success_tee(log) \
+    .on_success_fail_when(lambda v: v < 0, ERROR) \
+    .on_fail(recover) \
+    .finally_tee(lambda: None)
+
+
+def main():
+    for name, func in [("fluent chain", chain), ("Pipeline.run", PIPELINE.run)]:
+        seconds = min(timeit.repeat(lambda: [func(i) for i in range(-5, 5)], number=N // 10, repeat=5))
+        print(f"{name:<16}{seconds / N * 1e6:>8.2f} us/run")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Compares rendering error details as RFC 7807 problem details with `write_problem` and with a dictionary and
+`json.dumps`.
+
+Usage: python -m benchmarks.bench_problem_details
+"""
+import json
+import timeit
+
+from on_rails.problem_details import get_problem_type, write_problem
+from on_rails.ResultDetails.ErrorDetail import StackTraceMode, StackTracePolicy
+from on_rails.ResultDetails.Errors import (BadRequestError, ConflictError,
+                                           ForbiddenError, InternalError,
+                                           NotFoundError, UnauthorizedError,
+                                           ValidationError)
+
+N = 10_000
+POLICY = StackTracePolicy(StackTraceMode.OFF)
+
+
+def make_details():
+    classes = (BadRequestError, ConflictError, ForbiddenError, InternalError, NotFoundError, UnauthorizedError)
+    details = [cls(message=f"The request {i} failed.", stack_trace_policy=POLICY)
+               for i, cls in zip(range(N), classes * N)]
+    details[::4] = [ValidationError(errors={'name': 'is required'}, stack_trace_policy=POLICY)] * len(details[::4])
+    return details
+
+
+def render_with_dict(detail):
+    problem = {'type': get_problem_type(detail.__class__), 'status': detail.code or 500, 'title': detail.title}
+    if detail.message:
+        problem['detail'] = detail.message
+    if detail.errors:
+        problem['errors'] = detail.errors
+    return json.dumps(problem).encode()
+
+
+def main():
+    details = make_details()
+
+    def render_to_buffer():
+        buffer = bytearray()
+        for detail in details:
+            write_problem(detail, buffer)
+            buffer.clear()
+
+    for name, func in (('write_problem', render_to_buffer),
+                       ('dict + json.dumps', lambda: [render_with_dict(detail) for detail in details])):
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        print(f"{name:<20}{seconds / N * 1e6:>8.2f} us/detail")
+
+
+if __name__ == '__main__':
+    main()
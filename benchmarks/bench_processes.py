@@ -0,0 +1,46 @@
+"""
+Measures the size of the pickled results and the per-item overhead of Result.map_processes.
+
+Usage: python -m benchmarks.bench_processes
+"""
+import pickle
+import time
+
+from on_rails.Result import Result
+
+N = 20_000
+
+
+def validate(value):
+    if value % 10 == 0:
+        raise ValueError(f"{value} is not valid")
+    return value
+
+
+def nested_failure(depth):
+    if depth:
+        return nested_failure(depth - 1)
+    return Result.ok(0).on_success(validate)
+
+
+def measure(name, func):
+    started_at = time.perf_counter()
+    results = list(func())
+    seconds = time.perf_counter() - started_at
+    assert len(results) == N
+    print(f"{name:<32}{seconds / N * 1e6:>8.2f} us/item")
+
+
+def main():
+    result = nested_failure(30)
+    print(f"{'pickled failed result':<32}{len(pickle.dumps(result)):>8} bytes")
+    print(f"{'pickled successful result':<32}{len(pickle.dumps(Result.ok(1))):>8} bytes")
+
+    measure("sequential", lambda: (Result.ok(i).on_success(validate) for i in range(N)))
+    for chunksize in [1, 64, 512]:
+        measure(f"map_processes chunksize={chunksize}",
+                lambda: Result.map_processes(validate, range(N), max_workers=4, chunksize=chunksize))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""
+Measures the round trip of failed results through JSON (`dumps` and `Result.from_json`) and pickle.
+
+Usage: python -m benchmarks.bench_round_trip
+"""
+import pickle
+import timeit
+
+from benchmarks.bench_serialization import N, make_failures
+from on_rails.Result import Result
+from on_rails.serialization import dumps
+
+
+def main():
+    failures = make_failures()
+    text = dumps(failures)
+    dicts = [result.to_dict() for result in failures]
+    data = pickle.dumps(failures)
+    for name, func in (('from_dicts', lambda: Result.from_dicts(dicts)),
+                       ('from_dict (each)', lambda: [Result.from_dict(item) for item in dicts]),
+                       ('from_json (batch)', lambda: Result.from_json(text)),
+                       ('dumps + from_json', lambda: Result.from_json(dumps(failures))),
+                       ('pickle.loads', lambda: pickle.loads(data)),
+                       ('pickle round trip', lambda: pickle.loads(pickle.dumps(failures)))):
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        print(f"{name:<22}{seconds * 1e3:>8.1f} ms per {N} failures {N / seconds:>12,.0f} failures/s")
+
+
+if __name__ == '__main__':
+    main()
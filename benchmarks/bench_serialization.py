@@ -0,0 +1,39 @@
+"""
+Measures the serialization of failed results with `Result.to_dict` and `dumps`.
+
+Usage: python -m benchmarks.bench_serialization
+"""
+import json
+import timeit
+
+from on_rails.Result import Result
+from on_rails.ResultDetails.Errors.NotFoundError import NotFoundError
+from on_rails.ResultDetails.Errors.ValidationError import ValidationError
+from on_rails.serialization import dumps
+
+N = 10_000
+
+
+def make_failures():
+    failures = []
+    for i in range(N):
+        if i % 2:
+            detail = ValidationError(message="The input is not valid.", errors={'name': 'is required', 'age': '< 0'})
+        else:
+            detail = NotFoundError(message=f"The user {i} is not found.", more_data=[{'user_id': i}])
+        failures.append(Result.fail(detail))
+    return failures
+
+
+def main():
+    failures = make_failures()
+    for name, func in (('to_dict', lambda: [result.to_dict() for result in failures]),
+                       ('dumps (each)', lambda: [dumps(result) for result in failures]),
+                       ('dumps (batch)', lambda: dumps(failures)),
+                       ('json.dumps(to_dict)', lambda: [json.dumps(result.to_dict()) for result in failures])):
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        print(f"{name:<22}{seconds * 1e3:>8.1f} ms per {N} failures {N / seconds:>12,.0f} failures/s")
+
+
+if __name__ == '__main__':
+    main()
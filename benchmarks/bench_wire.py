@@ -0,0 +1,37 @@
+"""
+Compares the size and the speed of the binary wire format (`on_rails.wire`) with JSON (`dumps` and
+`Result.from_json`) and pickle for a batch of failed results and for a single failed result.
+
+Usage: python -m benchmarks.bench_wire
+"""
+import pickle
+import timeit
+
+from benchmarks.bench_serialization import N, make_failures
+from on_rails import wire
+from on_rails.Result import Result
+from on_rails.serialization import dumps
+
+FORMATS = (('wire', wire.encode, wire.decode),
+           ('json', dumps, Result.from_json),
+           ('pickle', pickle.dumps, pickle.loads))
+
+
+def measure(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main():
+    failures = make_failures()
+    for title, obj, number, count in (('batch', failures, 1, N), ('single', failures[0], 1000, 1)):
+        print(f"{title} ({count} failures)")
+        for name, encode, decode in FORMATS:
+            data = encode(obj)
+            encode_seconds = measure(lambda: encode(obj), number)  # pylint: disable=cell-var-from-loop
+            decode_seconds = measure(lambda: decode(data), number)  # pylint: disable=cell-var-from-loop
+            print(f"  {name:<8}{len(data) / count:>8.1f} bytes per failure"
+                  f"{encode_seconds * 1e6 / count:>8.2f} µs encode{decode_seconds * 1e6 / count:>8.2f} µs decode")
+
+
+if __name__ == '__main__':
+    main()
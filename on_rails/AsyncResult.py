@@ -0,0 +1,241 @@
+import inspect
+from typing import Any, Awaitable, Callable, Generator, List, Optional, Union
+
+from on_rails._utility import is_func_valid
+from on_rails.Result import (BreakFunctionException, BreakRailsException,
+                             Result, _call_with_retries_async,
+                             _get_condition_result, _get_constant_condition,
+                             _get_func_args)
+from on_rails.ResultDetails.Errors.ExceptionError import ExceptionError
+from on_rails.ResultDetails.Errors.ValidationError import ValidationError
+from on_rails.RetryPolicy import RetryPolicy
+
+
+class AsyncResult:
+    """ Stores an asynchronous chain of functions that produces a Result.
+
+    The chaining methods (`on_success`, `on_fail`, ...) only queue the steps. The whole chain runs when the
+    AsyncResult is awaited, in the running event loop, so async functions are awaited natively and no nested
+    event loop is created. Like a coroutine, an AsyncResult can be awaited only once.
+
+    Example:
+        result = await AsyncResult(fetch_user(user_id)).on_success(load_orders).on_fail(log_error)
+    """
+
+    def __init__(self, source: Union[Awaitable, Result, Any] = None):
+        """
+        Initializes a new instance of the AsyncResult class.
+
+        :param source: The source of the chain. It can be an awaitable (like a coroutine), a Result or any value.
+        The output of the source is converted to a Result. If the awaitable raises an exception, the chain starts with
+        a failed result whose detail is an `ExceptionError`.
+        """
+        self._source = source
+        self._steps: List[Callable] = []
+
+    @staticmethod
+    def from_result(result: Result):
+        """
+        Returns an AsyncResult that starts with the given result.
+
+        :param result: The first result of the chain
+        :type result: Result
+        """
+        return AsyncResult(result)
+
+    def __await__(self) -> Generator[Any, None, Result]:
+        return self._run().__await__()
+
+    async def _run(self) -> Result:
+        result = self._source
+        if inspect.isawaitable(result):
+            try:
+                result = await result
+            except BreakFunctionException:
+                raise  # Must be captured and managed in @def_result decorator.
+            except BreakRailsException as e:
+                result = e.result
+            except Exception as e:
+                result = Result.fail(ExceptionError(e))
+        result = Result.convert_to_result(result)
+
+        for step in self._steps:
+            result = await step(result)
+            if result.is_broken:
+                break
+        return result
+
+    def _add_step(self, step: Callable):
+        self._steps.append(step)
+        return self
+
+    # region on_success
+
+    def on_success(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions=True,
+                   retry_policy: Optional[RetryPolicy] = None):
+        """
+        Queues a function that is executed only if the previous result was successful.
+        The function can be sync or async and can take the previous value and the previous result as optional arguments.
+        See `Result.on_success`.
+        """
+
+        async def step(prev: Result):
+            if not prev.success:
+                return prev
+            return await _call_func(func, [prev.value, prev], num_of_try, try_only_on_exceptions,
+                                    retry_policy=retry_policy, step='on_success')
+
+        return self._add_step(step)
+
+    def on_success_tee(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions=True,
+                       ignore_errors: bool = False):
+        """
+        Queues a function that is executed only if the previous result was successful.
+        The previous result is kept unless the function fails and `ignore_errors` is False.
+        See `Result.on_success_tee`.
+        """
+
+        async def step(prev: Result):
+            if not prev.success:
+                return prev
+            result = await _call_func(func, [prev.value, prev], num_of_try, try_only_on_exceptions,
+                                      step='on_success_tee')
+            if result.success or ignore_errors:
+                return prev
+            return result
+
+        return self._add_step(step)
+
+    def on_success_operate_when(self, condition_or_func: Union[Callable, bool], func: Callable,
+                                num_of_try: int = 1, try_only_on_exceptions=True, break_rails: bool = False):
+        """
+        Queues a function that is executed when the previous result was successful and the condition is met.
+        See `Result.on_success_operate_when`.
+        """
+
+        async def step(prev: Result):
+            if not prev.success:
+                return prev
+            return await _operate_when(prev, condition_or_func, func, [prev.value, prev],
+                                       num_of_try, try_only_on_exceptions, break_rails, step='on_success_operate_when')
+
+        return self._add_step(step)
+
+    # endregion
+
+    # region on_fail
+
+    def on_fail(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions=True,
+                none_means_success: bool = False, retry_policy: Optional[RetryPolicy] = None):
+        """
+        Queues a function that is executed only if the previous result was not successful.
+        The function can take the previous result as optional argument.
+        See `Result.on_fail`.
+        """
+
+        async def step(prev: Result):
+            if not is_func_valid(func):
+                return Result.fail(ValidationError(message="The input function is not valid."))
+            if prev.success:
+                return prev
+            return await _call_func(func, [prev], num_of_try, try_only_on_exceptions, none_means_success,
+                                    retry_policy, step='on_fail')
+
+        return self._add_step(step)
+
+    def on_fail_tee(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions=True,
+                    ignore_errors: bool = False):
+        """
+        Queues a function that is executed only if the previous result was not successful.
+        The previous result is kept unless the function fails and `ignore_errors` is False.
+        See `Result.on_fail_tee`.
+        """
+
+        async def step(prev: Result):
+            if prev.success:
+                return prev
+            result = await _call_func(func, [prev], num_of_try, try_only_on_exceptions, step='on_fail_tee')
+            if result.success or ignore_errors:
+                return prev
+            return result
+
+        return self._add_step(step)
+
+    def on_fail_operate_when(self, condition_or_func: Union[Callable, bool], func: Callable,
+                             num_of_try: int = 1, try_only_on_exceptions=True, break_rails: bool = False):
+        """
+        Queues a function that is executed when the previous result was not successful and the condition is met.
+        See `Result.on_fail_operate_when`.
+        """
+
+        async def step(prev: Result):
+            if prev.success:
+                return prev
+            return await _operate_when(prev, condition_or_func, func, [prev], num_of_try,
+                                       try_only_on_exceptions, break_rails, none_means_success=False,
+                                       step='on_fail_operate_when')
+
+        return self._add_step(step)
+
+    # endregion
+
+    def operate_when(self, condition_or_func: Union[Callable, bool], func: Callable,
+                     num_of_try: int = 1, try_only_on_exceptions=True, break_rails: bool = False):
+        """
+        Queues a function that is executed when the condition is met, whether the previous result was successful or not.
+        See `Result.operate_when`.
+        """
+
+        async def step(prev: Result):
+            return await _operate_when(prev, condition_or_func, func, [prev],
+                                       num_of_try, try_only_on_exceptions, break_rails, step='operate_when')
+
+        return self._add_step(step)
+
+    def finally_tee(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions: bool = True):
+        """
+        Queues a function that is executed whether the previous result was successful or not.
+        See `Result.finally_tee`.
+        """
+
+        async def step(prev: Result):
+            result = await _call_func(func, [prev], num_of_try, try_only_on_exceptions, step='finally_tee')
+            if result.success:
+                return prev
+            return result
+
+        return self._add_step(step)
+
+
+async def _call_func(func: Callable, optional_args: Optional[List[Any]] = None,
+                     num_of_try: int = 1, try_only_on_exceptions: bool = False,
+                     none_means_success: bool = True, retry_policy: Optional[RetryPolicy] = None,
+                     step: str = 'try_func_async') -> Result:
+    args = _get_func_args(func, optional_args)
+    if isinstance(args, Result):
+        return args  # The function can not be called
+    return await _call_with_retries_async(func, args, {}, num_of_try,
+                                          try_only_on_exceptions, none_means_success, retry_policy, None, None, step)
+
+
+async def _is_condition_pass(condition_or_func: Union[Callable, bool], optional_args: Optional[List[Any]] = None,
+                             num_of_try: int = 1, try_only_on_exceptions: bool = True,
+                             step: str = 'try_func_async') -> Result:
+    result = _get_constant_condition(condition_or_func)
+    if result is None:  # The condition is a function
+        result = _get_condition_result(
+            await _call_func(condition_or_func, optional_args, num_of_try, try_only_on_exceptions, step=step))
+    return result
+
+
+async def _operate_when(prev: Result, condition_or_func: Union[Callable, bool],
+                        func: Callable, optional_args: Optional[List[Any]] = None,
+                        num_of_try: int = 1, try_only_on_exceptions=True, break_rails: bool = False,
+                        none_means_success: bool = True, step: str = 'try_func_async') -> Result:
+    result = await _is_condition_pass(condition_or_func, optional_args, num_of_try, try_only_on_exceptions, step)
+    if not result.success:
+        return result  # Return error result
+    if not result.value:  # The condition is not true
+        return prev
+    result = await _call_func(func, optional_args, num_of_try, try_only_on_exceptions, none_means_success, step=step)
+    return result.break_rails(break_rails)
@@ -0,0 +1,37 @@
+from enum import Enum
+
+
+class BreakRailsMode(Enum):
+    """
+    Determines how `break_rails` breaks the chain of functions.
+
+    EXCEPTION: A `BreakRailsException` is raised (default).
+    SENTINEL: A broken result is returned. The chaining methods of a broken result do nothing and return it, until
+    it reaches `try_func` (or the functions that use it like `on_success` and `@def_result`), which returns it as a
+    normal result. It is faster than raising an exception.
+    """
+    EXCEPTION = 'exception'
+    SENTINEL = 'sentinel'
+
+
+_default_break_rails_mode = BreakRailsMode.EXCEPTION
+
+
+def set_default_break_rails_mode(mode: BreakRailsMode) -> None:
+    """
+    Sets the mode that is used by `break_rails` functions when no mode is given.
+
+    :param mode: The new default mode
+    :type mode: BreakRailsMode
+    """
+    global _default_break_rails_mode  # pylint: disable=global-statement
+    if not isinstance(mode, BreakRailsMode):
+        raise ValueError("mode must be an instance of BreakRailsMode")
+    _default_break_rails_mode = mode
+
+
+def get_default_break_rails_mode() -> BreakRailsMode:
+    """
+    Returns the mode that is used by `break_rails` functions when no mode is given.
+    """
+    return _default_break_rails_mode
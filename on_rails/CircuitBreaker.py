@@ -0,0 +1,250 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Optional
+
+from on_rails.Result import Result
+from on_rails.ResultDetails.ErrorDetail import StackTraceMode, StackTracePolicy
+from on_rails.ResultDetails.Errors.ServiceUnavailableError import \
+    ServiceUnavailableError
+
+
+class CircuitState(Enum):
+    """
+    The state of a circuit breaker.
+
+    CLOSED: The calls are allowed and their results are recorded.
+    OPEN: The calls are rejected until the recovery timeout is over.
+    HALF_OPEN: A limited number of trial calls are allowed. If all of them are successful, the circuit is closed,
+    otherwise it is opened again.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitPermit:
+    """
+    The permission of an allowed call that is returned by `CircuitBreaker.allow_request`. The result of the call is
+    recorded with it, so a half-open circuit only counts the results of its own trial calls.
+
+    Attributes:
+        trial_period (int, optional): The half-open period in which the call is allowed as a trial call, or None if
+        the call is allowed while the circuit is closed.
+    """
+    __slots__ = ('trial_period',)
+
+    def __init__(self, trial_period: Optional[int] = None):
+        self.trial_period = trial_period
+
+
+class _OutcomeWindow:
+    """ The outcomes (True for a failure) of the last calls and the number of failures among them. """
+    __slots__ = ('outcomes', 'num_of_failures')
+
+    def __init__(self, window_size: int):
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)
+        self.num_of_failures = 0
+
+    def add(self, failed: bool) -> None:
+        """ Adds the outcome of a call. The oldest outcome leaves the window when it is full. """
+        if len(self.outcomes) == self.outcomes.maxlen and self.outcomes[0]:
+            self.num_of_failures -= 1
+        self.outcomes.append(failed)
+        if failed:
+            self.num_of_failures += 1
+
+    def clear(self) -> None:
+        """ Removes all the outcomes. """
+        self.outcomes.clear()
+        self.num_of_failures = 0
+
+
+class _CircuitStatus:
+    """ The mutable state of a circuit breaker. It is only changed under its lock. """
+    __slots__ = ('lock', 'window', 'state', 'opened_at', 'trial_period', 'num_of_trials', 'num_of_trial_successes')
+
+    def __init__(self, window_size: int):
+        self.lock = threading.Lock()
+        self.window = _OutcomeWindow(window_size)
+        self.state = CircuitState.CLOSED
+        self.opened_at = 0.0
+        self.trial_period = 0
+        self.num_of_trials = 0
+        self.num_of_trial_successes = 0
+
+
+_CLOSED_PERMIT = CircuitPermit()
+
+
+class CircuitBreaker:
+    """ Stops calling an operation that keeps failing and lets it recover.
+
+    The breaker records the outcome of the last `window_size` calls. When at least `min_calls` outcomes are recorded
+    and the failure rate reaches `failure_threshold`, the circuit opens and the calls are rejected with a
+    `ServiceUnavailableError` (code 503) without running the operation. After `recovery_timeout` seconds, the circuit
+    is half-open and `half_open_max_calls` trial calls are allowed. Only the results of the trial calls decide whether
+the circuit is closed or opened again; the late results of the calls that were allowed before are ignored.
+
+    The state is protected by a lock that is never held while the operation runs, so a breaker can be shared between
+    threads and between the tasks of an event loop.
+
+    Example:
+        breaker = CircuitBreaker(failure_threshold=0.5, window_size=20, recovery_timeout=30)
+
+        @def_result(circuit_breaker=breaker)
+        def fetch_orders(user_id):
+            ...
+
+    Attributes:
+        failure_threshold (float): The failure rate (between 0 and 1) that opens the circuit. Defaults to 0.5.
+        window_size (int): The number of the last calls that are used to calculate the failure rate. Defaults to 20.
+        min_calls (int): The minimum number of recorded calls before the circuit can open. Defaults to 5.
+        recovery_timeout (float): The time (in seconds) that the circuit stays open. Defaults to 30.
+        half_open_max_calls (int): The number of trial calls in the half-open state. Defaults to 1.
+        is_failure (callable, optional): A function that takes a result and determines whether it is a failure.
+        Defaults to None (the results that are not successful).
+    """
+    failure_threshold: float
+    window_size: int
+    min_calls: int
+    recovery_timeout: float
+    half_open_max_calls: int
+    is_failure: Optional[Callable[[Result], bool]]
+
+    def __init__(self, failure_threshold: float = 0.5, window_size: int = 20, min_calls: int = 5,
+                 recovery_timeout: float = 30, half_open_max_calls: int = 1,
+                 is_failure: Optional[Callable[[Result], bool]] = None):
+        """
+        Initializes a new instance of the CircuitBreaker class.
+
+        :raises ValueError: If failure_threshold is not in (0, 1], window_size, min_calls or half_open_max_calls is
+        less than 1, min_calls is greater than window_size or recovery_timeout is negative.
+        """
+        if not 0 < failure_threshold <= 1:
+            raise ValueError("failure_threshold must be greater than 0 and less than or equal to 1")
+        if window_size < 1 or min_calls < 1 or half_open_max_calls < 1:
+            raise ValueError("window_size, min_calls and half_open_max_calls must be greater than 0")
+        if min_calls > window_size:
+            raise ValueError("min_calls can not be greater than window_size")
+        if recovery_timeout < 0:
+            raise ValueError("recovery_timeout can not be negative")
+        if is_failure is not None and not callable(is_failure):
+            raise ValueError("is_failure must be a function")
+        self.failure_threshold = failure_threshold
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.is_failure = is_failure
+
+        self._status = _CircuitStatus(window_size)
+
+    @property
+    def state(self) -> CircuitState:
+        """ The current state of the circuit. """
+        with self._status.lock:
+            return self._get_state()
+
+    def _get_state(self) -> CircuitState:
+        status = self._status
+        if status.state == CircuitState.OPEN and time.monotonic() - status.opened_at >= self.recovery_timeout:
+            status.state = CircuitState.HALF_OPEN
+            status.trial_period += 1
+            status.num_of_trials = 0
+            status.num_of_trial_successes = 0
+        return status.state
+
+    def allow_request(self) -> Optional[CircuitPermit]:
+        """
+        Checks whether a call is allowed. In the half-open state, each allowed call is counted as a trial call, so
+        its result must be recorded with `record_result` or its trial must be released with `release_trial`.
+
+        :return: The permit of the call that is passed to `record_result` or `release_trial`, or None if the call is
+        rejected.
+        """
+        with self._status.lock:
+            state = self._get_state()
+            if state == CircuitState.CLOSED:
+                return _CLOSED_PERMIT
+            status = self._status
+            if state == CircuitState.HALF_OPEN and status.num_of_trials < self.half_open_max_calls:
+                status.num_of_trials += 1
+                return CircuitPermit(status.trial_period)
+            return None
+
+    def record_result(self, result: Result, permit: Optional[CircuitPermit] = None) -> None:
+        """
+        Records the result of an allowed call. The results of the trial calls are only counted in the half-open
+        period that allowed them, and the other results are only counted while the circuit is closed.
+
+        :param result: The result of the call
+        :type result: Result
+        :param permit: The permit that `allow_request` returned for the call. Defaults to None (a call that is allowed
+        while the circuit is closed).
+        :type permit: Optional[CircuitPermit]
+        """
+        failed = self.is_failure(result) if self.is_failure is not None else not result.success
+        with self._status.lock:
+            state = self._get_state()
+            if self._is_current_trial(state, permit):
+                if failed:
+                    self._open()
+                    return
+                self._status.num_of_trial_successes += 1
+                if self._status.num_of_trial_successes >= self.half_open_max_calls:
+                    self._close()
+            elif state == CircuitState.CLOSED and (permit is None or permit.trial_period is None):
+                self._record_outcome(failed)
+
+    def release_trial(self, permit: Optional[CircuitPermit] = None) -> None:
+        """
+        Releases the trial of an allowed call that has no result to record (for example, a cancelled call), so
+        another call can be tried in the half-open state.
+
+        :param permit: The permit that `allow_request` returned for the call. Defaults to None (a trial of the current
+        half-open period).
+        :type permit: Optional[CircuitPermit]
+        """
+        with self._status.lock:
+            state = self._get_state()
+            if permit is None and state == CircuitState.HALF_OPEN:
+                permit = CircuitPermit(self._status.trial_period)
+            if self._is_current_trial(state, permit) and self._status.num_of_trials > 0:
+                self._status.num_of_trials -= 1
+
+    def get_open_result(self) -> Result:
+        """
+        Returns the failed result of a rejected call. The stack trace is not captured for it.
+        """
+        return Result.fail(ServiceUnavailableError(
+            message="The circuit breaker is open. The operation is not called.",
+            stack_trace_policy=_NO_STACK_TRACE_POLICY))
+
+    def reset(self) -> None:
+        """ Closes the circuit and clears the recorded outcomes. """
+        with self._status.lock:
+            self._close()
+
+    def _is_current_trial(self, state: CircuitState, permit: Optional[CircuitPermit]) -> bool:
+        return state == CircuitState.HALF_OPEN and permit is not None and \
+            permit.trial_period == self._status.trial_period
+
+    def _record_outcome(self, failed: bool) -> None:
+        window = self._status.window
+        window.add(failed)
+        if len(window.outcomes) >= self.min_calls and \
+                window.num_of_failures / len(window.outcomes) >= self.failure_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self._status.state = CircuitState.OPEN
+        self._status.opened_at = time.monotonic()
+
+    def _close(self) -> None:
+        self._status.state = CircuitState.CLOSED
+        self._status.window.clear()
+
+
+_NO_STACK_TRACE_POLICY = StackTracePolicy(StackTraceMode.OFF)
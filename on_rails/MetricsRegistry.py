@@ -0,0 +1,304 @@
+import os
+import tempfile
+import threading
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from on_rails.instrument import Observer, StepEvent
+from on_rails.Result import Result
+
+# The default upper bounds (in seconds) of the buckets of the latency histograms in the Prometheus format.
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_SUB_BUCKET_BITS = 3
+_SUB_BUCKET_COUNT = 1 << _SUB_BUCKET_BITS
+
+
+class HistogramSnapshot(NamedTuple):
+    """ A copy of a latency histogram. The latencies are in nanoseconds.
+
+    Attributes:
+        count (int): The number of the recorded latencies.
+        sum_ns (int): The sum of the recorded latencies.
+        min_ns (int): The minimum recorded latency (0 if nothing is recorded).
+        max_ns (int): The maximum recorded latency (0 if nothing is recorded).
+        buckets (tuple): The `(upper_bound_ns, count)` pairs of the non-empty buckets, sorted by the upper bound.
+    """
+    count: int
+    sum_ns: int
+    min_ns: int
+    max_ns: int
+    buckets: Tuple[Tuple[int, int], ...]
+
+    def percentile(self, percent: float) -> int:
+        """
+        Returns the latency (in nanoseconds) that `percent` percent of the recorded latencies are less than or equal to.
+        The error is at most 12.5%.
+
+        :raises ValueError: If percent is not between 0 and 100.
+        """
+        if not 0 <= percent <= 100:
+            raise ValueError("percent must be between 0 and 100")
+        if self.count == 0:
+            return 0
+        target = max(1, -(-self.count * percent // 100))  # ceil
+        seen = 0
+        for upper_bound, count in self.buckets:
+            seen += count
+            if seen >= target:
+                return max(self.min_ns, min(upper_bound, self.max_ns))
+        return self.max_ns  # pragma: no cover
+
+
+class LatencyHistogram:
+    """ Records latencies (in nanoseconds) in HDR-style log-linear buckets.
+
+    Each power of two is split into 8 buckets, so the relative error of a bucket is at most 12.5% and the number of
+    buckets is small (about 8 per power of two) for any range of latencies. It is not thread-safe.
+    """
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self._count = 0
+        self._sum = 0
+        self._min = 0
+        self._max = 0
+
+    def record(self, value_ns: int) -> None:
+        """ Records a latency. The negative values are recorded as 0. """
+        value_ns = max(0, value_ns)
+        index = _get_bucket_index(value_ns)
+        self._counts[index] = self._counts.get(index, 0) + 1
+        if self._count == 0 or value_ns < self._min:
+            self._min = value_ns
+        if value_ns > self._max:
+            self._max = value_ns
+        self._count += 1
+        self._sum += value_ns
+
+    def snapshot(self) -> HistogramSnapshot:
+        """ Returns a copy of the histogram. """
+        buckets = tuple((_get_bucket_upper_bound(index), self._counts[index]) for index in sorted(self._counts))
+        return HistogramSnapshot(self._count, self._sum, self._min, self._max, buckets)
+
+
+def _get_bucket_index(value: int) -> int:
+    if value < _SUB_BUCKET_COUNT * 2:
+        return value
+    shift = value.bit_length() - _SUB_BUCKET_BITS - 1
+    return (shift + 1) * _SUB_BUCKET_COUNT + (value >> shift) - _SUB_BUCKET_COUNT
+
+
+def _get_bucket_upper_bound(index: int) -> int:
+    if index < _SUB_BUCKET_COUNT * 2:
+        return index
+    shift = index // _SUB_BUCKET_COUNT - 1
+    mantissa = index % _SUB_BUCKET_COUNT + _SUB_BUCKET_COUNT
+    return ((mantissa + 1) << shift) - 1
+
+
+class FunctionMetrics(NamedTuple):
+    """ The metrics of the calls of a decorated function.
+
+    Attributes:
+        calls (int): The number of the calls.
+        successes (int): The number of the successful results.
+        failures (int): The number of the failed results.
+        results (dict): The number of the results by `(success, detail class name)`. The class name of a result
+        without detail is an empty string.
+        latency (HistogramSnapshot): The latencies of the calls, including all the attempts and the delays between
+        them.
+    """
+    calls: int
+    successes: int
+    failures: int
+    results: Dict[Tuple[bool, str], int]
+    latency: HistogramSnapshot
+
+
+class StepMetrics(NamedTuple):
+    """ The metrics of the attempts of a step (like `try_func`) of a function.
+
+    Attributes:
+        attempts (int): The number of the attempts.
+        retries (int): The number of the attempts after the first one.
+        failures (int): The number of the failed attempts.
+    """
+    attempts: int
+    retries: int
+    failures: int
+
+
+class MetricsSnapshot(NamedTuple):
+    """ A copy of the metrics of a registry.
+
+    Attributes:
+        functions (dict): The metrics of the calls by the function name.
+        steps (dict): The metrics of the attempts by `(step, function name)`.
+    """
+    functions: Dict[str, FunctionMetrics]
+    steps: Dict[Tuple[str, str], StepMetrics]
+
+    def to_prometheus(self, buckets: Sequence[float] = DEFAULT_BUCKETS, prefix: str = 'on_rails') -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+
+        :param buckets: The upper bounds (in seconds) of the buckets of the latency histograms. The count of an
+        upper bound is estimated from the HDR buckets.
+        :param prefix: The prefix of the metric names. Defaults to `on_rails`.
+        :return: The text of the metrics.
+        """
+        lines: List[str] = []
+        _add_metric_header(lines, f'{prefix}_calls_total', 'counter', 'The number of the calls of the function.')
+        for name, metrics in sorted(self.functions.items()):
+            lines.append(f'{prefix}_calls_total{{function="{_escape(name)}"}} {metrics.calls}')
+
+        _add_metric_header(lines, f'{prefix}_results_total', 'counter',
+                           'The number of the results of the function by the detail class.')
+        for name, metrics in sorted(self.functions.items()):
+            for (success, detail), count in sorted(metrics.results.items()):
+                lines.append(f'{prefix}_results_total{{function="{_escape(name)}",'
+                             f'success="{str(success).lower()}",detail="{_escape(detail)}"}} {count}')
+
+        metric_name = f'{prefix}_call_duration_seconds'
+        _add_metric_header(lines, metric_name, 'histogram', 'The duration of the calls of the function.')
+        for name, metrics in sorted(self.functions.items()):
+            label = f'function="{_escape(name)}"'
+            for upper_bound, count in _get_cumulative_counts(metrics.latency, buckets):
+                lines.append(f'{metric_name}_bucket{{{label},le="{upper_bound}"}} {count}')
+            lines.append(f'{metric_name}_bucket{{{label},le="+Inf"}} {metrics.latency.count}')
+            lines.append(f'{metric_name}_sum{{{label}}} {metrics.latency.sum_ns / 1e9}')
+            lines.append(f'{metric_name}_count{{{label}}} {metrics.latency.count}')
+
+        for field, help_text in (('attempts', 'The number of the attempts of the step.'),
+                                 ('retries', 'The number of the attempts after the first one.'),
+                                 ('failures', 'The number of the failed attempts of the step.')):
+            metric_name = f'{prefix}_step_{field}_total'
+            _add_metric_header(lines, metric_name, 'counter', help_text)
+            for (step, name), metrics in sorted(self.steps.items()):
+                lines.append(f'{metric_name}{{step="{_escape(step)}",function="{_escape(name)}"}} '
+                             f'{getattr(metrics, field)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _add_metric_header(lines: List[str], name: str, metric_type: str, help_text: str) -> None:
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} {metric_type}')
+
+
+def _get_cumulative_counts(histogram: HistogramSnapshot, buckets: Sequence[float]) -> List[Tuple[float, int]]:
+    counts = []
+    index = 0
+    seen = 0
+    for upper_bound in sorted(buckets):
+        upper_bound_ns = upper_bound * 1e9
+        while index < len(histogram.buckets) and histogram.buckets[index][0] <= upper_bound_ns:
+            seen += histogram.buckets[index][1]
+            index += 1
+        counts.append((upper_bound, seen))
+    return counts
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsRegistry(Observer):
+    """ Records the metrics of the decorated functions in the process.
+
+    The calls of the functions that are decorated with `def_result(metrics=registry)` are counted by their results
+    (success or failure and the class of the detail) and their latencies are recorded in HDR-style histograms.
+    The attempts of their calls (the retries of `def_result`) are counted too, whichever observer is installed.
+    When the registry is installed as the observer (`instrument.set_observer(registry)`), the attempts of every other
+    step (like `try_func` and `on_success`) are counted as well. The registry is thread-safe.
+
+    Example:
+        registry = MetricsRegistry()
+
+        @def_result(num_of_try=3, metrics=registry)
+        def fetch_orders(user_id):
+            ...
+
+        registry.write_prometheus('/var/lib/node_exporter/on_rails.prom')
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._functions: Dict[str, _FunctionRecord] = {}
+        self._steps: Dict[Tuple[str, str], List[int]] = {}
+
+    def record_call(self, func_name: str, result: Result, duration_ns: int) -> None:
+        """
+        Records a call of a function.
+
+        :param func_name: The name of the function.
+        :param result: The result of the call.
+        :param duration_ns: The duration of the call in nanoseconds.
+        """
+        key = (result.success, type(result.detail).__name__ if result.detail is not None else '')
+        with self._lock:
+            record = self._functions.get(func_name)
+            if record is None:
+                record = self._functions[func_name] = _FunctionRecord()
+            record.results[key] = record.results.get(key, 0) + 1
+            record.latency.record(duration_ns)
+
+    def on_step_end(self, event: StepEvent) -> None:
+        """ Records an attempt of a step. """
+        key = (event.step, event.func_name)
+        with self._lock:
+            counts = self._steps.get(key)
+            if counts is None:
+                counts = self._steps[key] = [0, 0, 0]
+            counts[0] += 1
+            if event.attempt > 1:
+                counts[1] += 1
+            if not event.success:
+                counts[2] += 1
+
+    def snapshot(self) -> MetricsSnapshot:
+        """ Returns a copy of the metrics. """
+        with self._lock:
+            functions = {name: record.snapshot() for name, record in self._functions.items()}
+            steps = {key: StepMetrics(*counts) for key, counts in self._steps.items()}
+        return MetricsSnapshot(functions, steps)
+
+    def reset(self) -> None:
+        """ Removes all the metrics. """
+        with self._lock:
+            self._functions.clear()
+            self._steps.clear()
+
+    def to_prometheus(self, buckets: Sequence[float] = DEFAULT_BUCKETS, prefix: str = 'on_rails') -> str:
+        """ Renders a snapshot of the metrics in the Prometheus text format. See `MetricsSnapshot.to_prometheus`. """
+        return self.snapshot().to_prometheus(buckets, prefix)
+
+    def write_prometheus(self, file_path: str, buckets: Sequence[float] = DEFAULT_BUCKETS,
+                         prefix: str = 'on_rails') -> None:
+        """
+        Writes a snapshot of the metrics in the Prometheus text format to a file (for example, for the textfile
+        collector of the node exporter). The file is replaced atomically, so a reader never sees a partial file.
+        """
+        text = self.to_prometheus(buckets, prefix)
+        directory = os.path.dirname(os.path.abspath(file_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                file.write(text)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+class _FunctionRecord:
+    __slots__ = ('results', 'latency')
+
+    def __init__(self):
+        self.results: Dict[Tuple[bool, str], int] = {}
+        self.latency = LatencyHistogram()
+
+    def snapshot(self) -> FunctionMetrics:
+        """ Returns a copy of the counters and the latency histogram of the function. """
+        successes = sum(count for (success, _), count in self.results.items() if success)
+        failures = sum(count for (success, _), count in self.results.items() if not success)
+        return FunctionMetrics(successes + failures, successes, failures, dict(self.results), self.latency.snapshot())
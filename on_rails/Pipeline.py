@@ -0,0 +1,498 @@
+import copy
+import inspect
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Coroutine, List, Optional, Union
+
+from on_rails._utility import generate_error, get_loop, is_func_valid
+from on_rails.Result import (BreakFunctionException, BreakRailsException,
+                             Result, _get_num_of_function_parameters, try_func,
+                             try_func_async)
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.RetryPolicy import RetryPolicy
+
+
+class Pipeline:
+    """ A chain of functions that is built once and can be run many times.
+
+    The pipeline records the same steps as the `Result` chaining methods. The functions are validated and the number
+    of their parameters is detected when the step is added, so running the pipeline does no introspection.
+    Unlike the `Result` methods, an invalid function raises `ValueError` when the step is added.
+
+    `break_rails` steps (and `break_rails=True` of the operate_when steps) stop the pipeline without raising
+    `BreakRailsException`, and the last result is returned by `run`.
+
+    Example:
+        pipeline = Pipeline().on_success(parse).on_success_tee(save).on_fail(log_error)
+        result = pipeline.run(data)
+    """
+
+    def __init__(self):
+        self._steps: List[_Step] = []
+
+    def run(self, value: Any = None) -> Result:
+        """
+        Runs the pipeline synchronously.
+
+        :param value: The input of the pipeline. If it is not a Result, it is converted to a successful Result.
+        :return: The result of the last step.
+        """
+        result = Result.convert_to_result(value)
+        for step in self._steps:
+            result = step.run(result)
+            if result.__class__ is _BrokenRails:
+                return result.result
+        return result
+
+    async def run_async(self, value: Any = None) -> Result:
+        """
+        Runs the pipeline in the current event loop. The functions can be sync or async.
+
+        :param value: The input of the pipeline. It can be an awaitable. If it is not a Result, it is converted to a
+        successful Result.
+        :return: The result of the last step.
+        """
+        if inspect.isawaitable(value):
+            value = await value
+        result = Result.convert_to_result(value)
+        for step in self._steps:
+            result = await step.run_async(result)
+            if result.__class__ is _BrokenRails:
+                return result.result
+        return result
+
+    def __len__(self):
+        return len(self._steps)
+
+    def _add_step(self, step):
+        self._steps.append(step)
+        return self
+
+    # region on_success
+
+    def on_success(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions=True,
+                   retry_policy: Optional[RetryPolicy] = None):
+        """
+        Adds a step that executes the function if the previous result was successful. See `Result.on_success`.
+        """
+        invoker = _Invoker(func, True, num_of_try, try_only_on_exceptions, retry_policy=retry_policy)
+        return self._add_step(_OnSuccessStep(invoker))
+
+    def on_success_tee(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions=True,
+                       ignore_errors: bool = False):
+        """
+        Adds a step that executes the function if the previous result was successful and keeps the previous result.
+        See `Result.on_success_tee`.
+        """
+        invoker = _Invoker(func, True, num_of_try, try_only_on_exceptions)
+        return self._add_step(_OnSuccessStep(invoker, tee=True, ignore_errors=ignore_errors))
+
+    def on_success_operate_when(self, condition_or_func: Union[Callable, bool], func: Callable,
+                                num_of_try: int = 1, try_only_on_exceptions=True, break_rails: bool = False):
+        """
+        Adds a step that executes the function when the previous result was successful and the condition is met.
+        See `Result.on_success_operate_when`.
+        """
+        condition = _Condition(condition_or_func, True, num_of_try, try_only_on_exceptions)
+        invoker = _Invoker(func, True, num_of_try, try_only_on_exceptions)
+        return self._add_step(_OperateWhenStep(True, condition, invoker, break_rails))
+
+    def on_success_fail_when(self, condition_or_func: Union[Callable, bool],
+                             error_detail: Optional[ErrorDetail] = None):
+        """
+        Adds a step that fails when the previous result was successful and the condition is met.
+        See `Result.on_success_fail_when`. A copy of `error_detail` is returned on each run.
+        """
+        condition = _Condition(condition_or_func, True)
+        return self._add_step(_FailWhenStep(True, condition, error_detail, add_prev_detail=False))
+
+    def on_success_break_rails(self, condition_or_func: Union[Callable, bool] = True):
+        """
+        Adds a step that stops the pipeline when the previous result was successful and the condition is met.
+        See `Result.on_success_break_rails`.
+        """
+        return self._add_step(_BreakRailsStep(True, _Condition(condition_or_func, True)))
+
+    # endregion
+
+    # region on_fail
+
+    def on_fail(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions=True,
+                none_means_success: bool = False, retry_policy: Optional[RetryPolicy] = None):
+        """
+        Adds a step that executes the function if the previous result was not successful. See `Result.on_fail`.
+        """
+        invoker = _Invoker(func, False, num_of_try, try_only_on_exceptions, none_means_success, retry_policy)
+        return self._add_step(_OnFailStep(invoker))
+
+    def on_fail_tee(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions=True,
+                    ignore_errors: bool = False):
+        """
+        Adds a step that executes the function if the previous result was not successful and keeps the previous
+        result. See `Result.on_fail_tee`.
+        """
+        invoker = _Invoker(func, False, num_of_try, try_only_on_exceptions)
+        return self._add_step(_OnFailStep(invoker, tee=True, ignore_errors=ignore_errors))
+
+    def on_fail_operate_when(self, condition_or_func: Union[Callable, bool], func: Callable,
+                             num_of_try: int = 1, try_only_on_exceptions=True, break_rails: bool = False):
+        """
+        Adds a step that executes the function when the previous result was not successful and the condition is met.
+        See `Result.on_fail_operate_when`.
+        """
+        condition = _Condition(condition_or_func, False, num_of_try, try_only_on_exceptions)
+        invoker = _Invoker(func, False, num_of_try, try_only_on_exceptions, none_means_success=False)
+        return self._add_step(_OperateWhenStep(False, condition, invoker, break_rails))
+
+    def on_fail_break_rails(self, condition_or_func: Union[Callable, bool] = True):
+        """
+        Adds a step that stops the pipeline when the previous result was not successful and the condition is met.
+        See `Result.on_fail_break_rails`.
+        """
+        return self._add_step(_BreakRailsStep(False, _Condition(condition_or_func, False)))
+
+    # endregion
+
+    def operate_when(self, condition_or_func: Union[Callable, bool], func: Callable,
+                     num_of_try: int = 1, try_only_on_exceptions=True, break_rails: bool = False):
+        """
+        Adds a step that executes the function when the condition is met. See `Result.operate_when`.
+        """
+        condition = _Condition(condition_or_func, False, num_of_try, try_only_on_exceptions)
+        invoker = _Invoker(func, False, num_of_try, try_only_on_exceptions)
+        return self._add_step(_OperateWhenStep(None, condition, invoker, break_rails))
+
+    def fail_when(self, condition_or_func: Union[Callable, bool],
+                  error_detail: Optional[ErrorDetail] = None, add_prev_detail: bool = False):
+        """
+        Adds a step that fails when the condition is met. See `Result.fail_when`.
+        A copy of `error_detail` is returned on each run.
+        """
+        condition = _Condition(condition_or_func, False)
+        return self._add_step(_FailWhenStep(None, condition, error_detail, add_prev_detail))
+
+    def break_rails(self, condition_or_func: Union[Callable, bool] = True):
+        """
+        Adds a step that stops the pipeline when the condition is met. See `Result.break_rails`.
+        """
+        return self._add_step(_BreakRailsStep(None, _Condition(condition_or_func, False)))
+
+    def finally_tee(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions: bool = True):
+        """
+        Adds a step that executes the function whether the previous result was successful or not.
+        See `Result.finally_tee`.
+        """
+        invoker = _Invoker(func, False, num_of_try, try_only_on_exceptions)
+        return self._add_step(_FinallyTeeStep(invoker))
+
+
+class _BrokenRails:
+    """ The last result of a pipeline that is stopped by a break_rails step. """
+    __slots__ = ('result',)
+
+    def __init__(self, result: Result):
+        self.result = result
+
+
+def _get_func_name(func: Callable) -> str:
+    return getattr(func, '__name__', type(func).__name__)
+
+
+def _bind_args(func: Callable, pass_value: bool) -> Callable[[Result], Any]:
+    """
+    Detects the number of function parameters and returns a function that calls it with the optional arguments.
+    The optional arguments are `(previous value, previous result)` if `pass_value` is True, otherwise
+    `(previous result)`.
+
+    :raises ValueError: If the function is not valid or takes more parameters than the optional arguments.
+    """
+    if not is_func_valid(func):
+        raise ValueError("The input function is not valid.")
+
+    result = _get_num_of_function_parameters(func)
+    if not result.success:
+        raise ValueError(result.detail.message)
+    num_of_function_params = result.value
+
+    max_num_of_params = 2 if pass_value else 1
+    if num_of_function_params > max_num_of_params:
+        raise ValueError(f"{_get_func_name(func)}() takes {num_of_function_params} arguments. "
+                         f"It cannot be executed. maximum of {max_num_of_params} parameters is acceptable.")
+
+    if num_of_function_params == 0:
+        return lambda prev: func()
+    if num_of_function_params == 2:
+        return lambda prev: func(prev.value, prev)
+    if pass_value:
+        return lambda prev: func(prev.value)
+    return func
+
+
+class _Invoker:
+    """ Calls a function with pre-detected arguments and converts its output to a Result like `try_func`. """
+    __slots__ = ('call', 'num_of_try', 'try_only_on_exceptions', 'none_means_success', 'retry_policy')
+
+    def __init__(self, func: Callable, pass_value: bool, num_of_try: int = 1, try_only_on_exceptions: bool = True,
+                 none_means_success: bool = True, retry_policy: Optional[RetryPolicy] = None):
+        self.call = _bind_args(func, pass_value)
+        self.num_of_try = num_of_try
+        self.try_only_on_exceptions = try_only_on_exceptions
+        self.none_means_success = none_means_success
+        self.retry_policy = retry_policy
+
+    def invoke(self, prev: Result) -> Result:
+        """ Calls the function with the arguments of the previous result and returns its result. """
+        if self.num_of_try != 1 or self.retry_policy is not None:
+            call = self.call
+            return try_func(lambda: call(prev), self.num_of_try, self.try_only_on_exceptions,
+                            self.none_means_success, self.retry_policy)
+
+        try:
+            output = self.call(prev)
+            if isinstance(output, Coroutine):
+                output = get_loop().run_until_complete(output)
+        except BreakRailsException as e:
+            return e.result
+        except BreakFunctionException:
+            raise  # Must be captured and managed in @def_result decorator.
+        except Exception as e:
+            return Result.fail(generate_error([e], 1))
+        return self._convert(output)
+
+    async def invoke_async(self, prev: Result) -> Result:
+        """ The async version of `invoke`. The function can be sync or async. """
+        if self.num_of_try != 1 or self.retry_policy is not None:
+            call = self.call
+            return await try_func_async(lambda: call(prev), self.num_of_try, self.try_only_on_exceptions,
+                                        self.none_means_success, self.retry_policy)
+
+        try:
+            output = self.call(prev)
+            if inspect.isawaitable(output):
+                output = await output
+        except BreakRailsException as e:
+            return e.result
+        except BreakFunctionException:
+            raise  # Must be captured and managed in @def_result decorator.
+        except Exception as e:
+            return Result.fail(generate_error([e], 1))
+        return self._convert(output)
+
+    def _convert(self, output: Any) -> Result:
+        result = Result.convert_to_result(output, none_means_success=self.none_means_success)
+        if result.is_broken:
+            result = Result(result.success, result.detail, result.value)
+        if result.success or self.try_only_on_exceptions:
+            return result
+        return Result.fail(generate_error([result.detail] if result.detail else [], 1))
+
+
+class _Condition:
+    """ A pre-detected condition of a step. It is a boolean constant or a function. """
+    __slots__ = ('constant', 'invoker')
+
+    def __init__(self, condition_or_func: Union[Callable, bool], pass_value: bool,
+                 num_of_try: int = 1, try_only_on_exceptions: bool = True):
+        if isinstance(condition_or_func, bool):
+            self.constant = Result.ok(condition_or_func)
+            self.invoker = None
+        elif callable(condition_or_func):
+            self.constant = None
+            self.invoker = _Invoker(condition_or_func, pass_value, num_of_try, try_only_on_exceptions)
+        else:
+            raise ValueError(f"The condition only can be a function or a boolean. "
+                             f"{type(condition_or_func).__name__} is not acceptable.")
+
+    def check(self, prev: Result) -> Result:
+        """ Returns a successful result with the boolean value of the condition or the failed result of it. """
+        if self.invoker is None:
+            return self.constant
+        return self._to_bool(self.invoker.invoke(prev))
+
+    async def check_async(self, prev: Result) -> Result:
+        """ The async version of `check`. """
+        if self.invoker is None:
+            return self.constant
+        return self._to_bool(await self.invoker.invoke_async(prev))
+
+    @staticmethod
+    def _to_bool(result: Result) -> Result:
+        if not result.success:
+            return result
+        if isinstance(result.value, bool):
+            return Result.ok(result.value)
+        return Result.ok(True)
+
+
+class _Step(ABC):
+    """ A step of the pipeline. `on_success` is True/False if the step only runs on success/failure, or None. """
+    __slots__ = ('on_success',)
+
+    def __init__(self, on_success: Optional[bool]):
+        self.on_success = on_success
+
+    @abstractmethod
+    def run(self, prev: Result):
+        """ Runs the step on the previous result. A `_BrokenRails` output stops the pipeline. """
+
+    @abstractmethod
+    async def run_async(self, prev: Result):
+        """ The async version of `run`. """
+
+
+class _OnSuccessStep(_Step):
+    __slots__ = ('invoker', 'tee', 'ignore_errors')
+
+    def __init__(self, invoker: _Invoker, tee: bool = False, ignore_errors: bool = False):
+        super().__init__(True)
+        self.invoker = invoker
+        self.tee = tee
+        self.ignore_errors = ignore_errors
+
+    def run(self, prev: Result):
+        if not prev.success:
+            return prev
+        return self._get_output(prev, self.invoker.invoke(prev))
+
+    async def run_async(self, prev: Result):
+        if not prev.success:
+            return prev
+        return self._get_output(prev, await self.invoker.invoke_async(prev))
+
+    def _get_output(self, prev: Result, result: Result) -> Result:
+        if self.tee and (result.success or self.ignore_errors):
+            return prev
+        return result
+
+
+class _OnFailStep(_OnSuccessStep):
+    __slots__ = ()
+
+    def __init__(self, invoker: _Invoker, tee: bool = False, ignore_errors: bool = False):
+        super().__init__(invoker, tee, ignore_errors)
+        self.on_success = False
+
+    def run(self, prev: Result):
+        if prev.success:
+            return prev
+        return self._get_output(prev, self.invoker.invoke(prev))
+
+    async def run_async(self, prev: Result):
+        if prev.success:
+            return prev
+        return self._get_output(prev, await self.invoker.invoke_async(prev))
+
+
+class _FinallyTeeStep(_Step):
+    __slots__ = ('invoker',)
+
+    def __init__(self, invoker: _Invoker):
+        super().__init__(None)
+        self.invoker = invoker
+
+    def run(self, prev: Result):
+        result = self.invoker.invoke(prev)
+        return prev if result.success else result
+
+    async def run_async(self, prev: Result):
+        result = await self.invoker.invoke_async(prev)
+        return prev if result.success else result
+
+
+class _OperateWhenStep(_Step):
+    __slots__ = ('condition', 'invoker', 'break_rails')
+
+    def __init__(self, on_success: Optional[bool], condition: _Condition, invoker: _Invoker, break_rails: bool):
+        super().__init__(on_success)
+        self.condition = condition
+        self.invoker = invoker
+        self.break_rails = break_rails
+
+    def run(self, prev: Result):
+        if self.on_success is not None and prev.success != self.on_success:
+            return prev
+        result = self.condition.check(prev)
+        if not result.success:
+            return result
+        if not result.value:
+            return prev
+        return self._get_output(self.invoker.invoke(prev))
+
+    async def run_async(self, prev: Result):
+        if self.on_success is not None and prev.success != self.on_success:
+            return prev
+        result = await self.condition.check_async(prev)
+        if not result.success:
+            return result
+        if not result.value:
+            return prev
+        return self._get_output(await self.invoker.invoke_async(prev))
+
+    def _get_output(self, result: Result):
+        return _BrokenRails(result) if self.break_rails else result
+
+
+class _FailWhenStep(_Step):
+    __slots__ = ('condition', 'error_detail', 'add_prev_detail')
+
+    def __init__(self, on_success: Optional[bool], condition: _Condition, error_detail: Optional[ErrorDetail],
+                 add_prev_detail: bool):
+        super().__init__(on_success)
+        self.condition = condition
+        self.error_detail = error_detail
+        self.add_prev_detail = add_prev_detail
+
+    def run(self, prev: Result):
+        if self.on_success is not None and prev.success != self.on_success:
+            return prev
+        return self._get_output(prev, self.condition.check(prev))
+
+    async def run_async(self, prev: Result):
+        if self.on_success is not None and prev.success != self.on_success:
+            return prev
+        return self._get_output(prev, await self.condition.check_async(prev))
+
+    def _get_output(self, prev: Result, condition_result: Result) -> Result:
+        if not condition_result.success:
+            return condition_result
+        if not condition_result.value:
+            return prev
+
+        # The given detail is copied, so changing the result of a run does not change the other runs.
+        error_detail = _copy_error_detail(self.error_detail) if self.error_detail else ErrorDetail()
+        if self.add_prev_detail and prev.detail:
+            error_detail.add_more_data({"prev_detail": prev.detail})
+        return Result.fail(error_detail)
+
+
+def _copy_error_detail(error_detail: ErrorDetail) -> ErrorDetail:
+    error_detail = copy.copy(error_detail)
+    error_detail.more_data = list(error_detail.more_data) if error_detail.more_data else []
+    if error_detail.errors is not None:
+        error_detail.errors = dict(error_detail.errors)
+    return error_detail
+
+
+class _BreakRailsStep(_Step):
+    __slots__ = ('condition',)
+
+    def __init__(self, on_success: Optional[bool], condition: _Condition):
+        super().__init__(on_success)
+        self.condition = condition
+
+    def run(self, prev: Result):
+        if self.on_success is not None and prev.success != self.on_success:
+            return prev
+        return self._get_output(prev, self.condition.check(prev))
+
+    async def run_async(self, prev: Result):
+        if self.on_success is not None and prev.success != self.on_success:
+            return prev
+        return self._get_output(prev, await self.condition.check_async(prev))
+
+    @staticmethod
+    def _get_output(prev: Result, condition_result: Result):
+        if not condition_result.success:
+            return condition_result
+        if not condition_result.value:
+            return prev
+        return _BrokenRails(prev)
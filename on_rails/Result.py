@@ -1,34 +1,62 @@
-from typing import (Any, Callable, Coroutine, Generic, List, Optional, TypeVar,
-                    Union)
+from typing import Any, Callable, Generic, List, Optional, TypeVar, Union
 
-from on_rails._utility import (await_func, generate_error,
-                               get_num_of_function_parameters, is_func_valid)
+from on_rails._batch import _ResultBatchMixin
+from on_rails._utility import is_func_valid
+from on_rails.BreakRailsMode import (BreakRailsMode,
+                                     get_default_break_rails_mode)
 from on_rails.ResultDetail import ResultDetail
 from on_rails.ResultDetails.ErrorDetail import ErrorDetail
 from on_rails.ResultDetails.Errors.ValidationError import ValidationError
 from on_rails.ResultDetails.SuccessDetail import SuccessDetail
+from on_rails.RetryPolicy import RetryPolicy
+from on_rails.serialization import _ResultDictMixin
 
 T = TypeVar('T')
 
 
-class Result(Generic[T]):
+class Result(_ResultDictMixin, _ResultBatchMixin, Generic[T]):
     """ Stores the result of a function.
 
     Attributes:
         success (bool): A flag indicating whether the result was successful.
         detail (ResultDetail, optional): The details of the result. Defaults to None.
         value (T, optional): The value of the result. Defaults to None.
+
+    The class uses `__slots__`, so instances have no `__dict__`. To attach custom attributes, inherit from it
+    without defining `__slots__`.
+
+    `Result.ok()` and `Result.fail()` without value and detail return shared frozen instances.
+    The methods that change a result (like `on_success_new_detail`) return a copy instead of changing them.
     """
 
+    __slots__ = ('success', 'detail', 'value')
+
     success: bool
-    detail: Optional[ResultDetail] = None
-    value: Optional[T] = None
+    detail: Optional[ResultDetail]
+    value: Optional[T]
+
+    _is_frozen = False
+    _is_broken = False
 
     def __init__(self, success: bool, detail: Optional[ResultDetail] = None, value: Optional[T] = None):
         self.success = success
         self.detail = detail
         self.value = value
 
+    def _get_mutable(self):
+        """
+        Returns self or a mutable copy of self if it is frozen.
+        """
+        return Result(self.success, self.detail, self.value) if self._is_frozen else self
+
+    @property
+    def is_broken(self) -> bool:
+        """
+        Whether the rails are broken by `break_rails` in `BreakRailsMode.SENTINEL` mode.
+        The chaining methods of a broken result do nothing and return it.
+        """
+        return self._is_broken
+
     def __str__(self) -> str:
         result = f"success: {self.success}\n"
         if self.value:
@@ -45,6 +73,9 @@ class Result(Generic[T]):
             result += f"Detail:\n{repr(self.detail)}\n"
         return result
 
+    def __reduce__(self):
+        return self.__class__, (self.success, self.detail, self.value)
+
     # region Static Methods
 
     @staticmethod
@@ -57,7 +88,10 @@ class Result(Generic[T]):
         :param detail: Optional[ResultDetail] = None
         :type detail: Optional[ResultDetail]
         :return: A successful Result with the value. The detail and value are optional.
+        If both of them are None, the shared frozen instance is returned.
         """
+        if value is None and detail is None:
+            return _EMPTY_OK
         return Result(True, detail=detail, value=value)
 
     @staticmethod
@@ -68,7 +102,10 @@ class Result(Generic[T]):
         :param detail: Optional[ResultDetail] = None
         :type detail: Optional[ResultDetail]
         :return: A failed Result object. The detail is optional.
+        If the detail is None, the shared frozen instance is returned.
         """
+        if detail is None:
+            return _EMPTY_FAIL
         return Result(False, detail)
 
     @staticmethod
@@ -113,9 +150,22 @@ class Result(Generic[T]):
             return self.detail.code
         return default_success_code if self.success else default_error_code
 
+    def to_async(self):
+        """
+        Converts the result to an `AsyncResult`. The next functions of the chain can be sync or async and all of them
+        run in the current event loop when the `AsyncResult` is awaited.
+
+        :return: An `AsyncResult` that starts with this result.
+        """
+        from on_rails.AsyncResult import \
+            AsyncResult  # pylint: disable=import-outside-toplevel,cyclic-import
+
+        return AsyncResult.from_result(self)
+
     # region on_success
 
-    def on_success(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions=True):
+    def on_success(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions=True,
+                   retry_policy: Optional[RetryPolicy] = None):
         """
         This function executes a given function only if the previous attempts were successful.
 
@@ -129,14 +179,18 @@ class Result(Generic[T]):
         function will be retried regardless of whether an exception is raised or Result is not success, defaults to True
         :type try_only_on_exceptions: bool (optional)
 
+        :param retry_policy: The policy of waiting between the attempts. Defaults to None (no waiting).
+        :type retry_policy: Optional[RetryPolicy]
+
         :return: The method `on_success` returns either self or the result of given function.
         """
 
-        if not self.success:
+        if self._is_broken or not self.success:
             return self
 
-        return self.__call_func(func, optional_args=[self.value, self],
-                                num_of_try=num_of_try, try_only_on_exceptions=try_only_on_exceptions)
+        return _call_func(func, optional_args=[self.value, self],
+                                num_of_try=num_of_try, try_only_on_exceptions=try_only_on_exceptions,
+                                retry_policy=retry_policy, step='on_success')
 
     def on_success_add_more_data(self, object_or_func: Union[Any, Callable], ignore_errors: bool = False):
         """
@@ -152,23 +206,26 @@ class Result(Generic[T]):
         any errors that occur will be ignored. If `ignore_error` is set to False, any errors that occur during the execution of the function will be returned.
         :type ignore_errors: bool (optional)
         """
-        if not self.success or object_or_func is None:
+        if self._is_broken or not self.success or object_or_func is None:
             return self
 
         if callable(object_or_func):
-            result = self.__call_func(object_or_func, optional_args=[self.value, self])
+            result = _call_func(object_or_func, optional_args=[self.value, self],
+                                      step='on_success_add_more_data')
             if not result.success:
                 return self if ignore_errors else result
             obj = result.value
         else:
             obj = object_or_func
 
-        if not self.detail:
-            self.detail = SuccessDetail()
+        target = self
+        if not target.detail:
+            target = self._get_mutable()
+            target.detail = SuccessDetail()
 
-        result = try_func(lambda: self.detail.add_more_data(obj))
+        result = try_func(lambda: target.detail.add_more_data(obj))
         if result.success or ignore_errors:
-            return self
+            return target
         return result  # pragma: no cover
 
     def on_success_new_detail(self, new_detail_or_func: Union[SuccessDetail, Callable]):
@@ -182,12 +239,13 @@ class Result(Generic[T]):
         :type new_detail_or_func: Union[SuccessDetail, Callable]
         """
 
-        if not self.success:
+        if self._is_broken or not self.success:
             return self
 
         new_detail = None
         if callable(new_detail_or_func):
-            result = self.__call_func(new_detail_or_func, optional_args=[self.value, self])
+            result = _call_func(new_detail_or_func, optional_args=[self.value, self],
+                                      step='on_success_new_detail')
             if not result.success:
                 return result
             new_detail = result.value
@@ -198,8 +256,9 @@ class Result(Generic[T]):
             return Result.fail(
                 ErrorDetail(message=f"Type of new detail '{type(new_detail).__name__}' "
                                     "is not instance of 'SuccessDetail'"))
-        self.detail = new_detail
-        return self
+        target = self._get_mutable()
+        target.detail = new_detail
+        return target
 
     def on_success_tee(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions=True,
                        ignore_errors: bool = False):
@@ -219,7 +278,10 @@ class Result(Generic[T]):
         :param ignore_errors: If it is false, it will return the error result when the result of the function fails, otherwise it will be ignored.
         :type ignore_errors: bool (optional)
         """
-        result = self.on_success(func, num_of_try, try_only_on_exceptions)
+        if self._is_broken or not self.success:
+            return self
+
+        result = _call_func(func, [self.value, self], num_of_try, try_only_on_exceptions, step='on_success_tee')
         if result.success or ignore_errors:
             return self  # ignore result
         return result
@@ -252,12 +314,13 @@ class Result(Generic[T]):
         :return: If condition pass, returns result of function as Result object.
         If condition not pass, returns previous Result object.
         """
-        if not self.success:
+        if self._is_broken or not self.success:
             return self
         return self.__operate_when(condition_or_func, func, [self.value, self],
-                                   num_of_try, try_only_on_exceptions, break_rails)
+                                   num_of_try, try_only_on_exceptions, break_rails, step='on_success_operate_when')
 
-    def on_success_break_rails(self, condition_or_func: Union[Callable, bool] = True):
+    def on_success_break_rails(self, condition_or_func: Union[Callable, bool] = True,
+                               mode: Optional[BreakRailsMode] = None):
         """
         The function raises a BreakRailsException if a given condition is true.
         The BreakRailsException breaks all chaining functions and can catch by
@@ -268,23 +331,26 @@ class Result(Generic[T]):
         will be called with two optional arguments: the value and the result of the previous operation.
         :type condition_or_func: Union[Callable, bool]
 
+        :param mode: How to break the rails. In `BreakRailsMode.SENTINEL` mode, a broken result is returned instead
+        of raising the exception. Defaults to the global mode.
+        :type mode: Optional[BreakRailsMode]
+
         :return: If `condition_or_func` is callable function and fails, it returns error result.
         Otherwise, raise BreakRails exception
 
         :raise BreakRailsException
         """
 
-        if not self.success:
+        if self._is_broken or not self.success:
             return self
 
-        result = self.__is_condition_pass(condition_or_func, [self.value, self])
+        result = _is_condition_pass(condition_or_func, [self.value, self], step='on_success_break_rails')
         if not result.success:
             return result  # return error result
         if not result.value:  # The condition is not true
             return self
 
-        self.__break_rails()
-        return Result.fail(ErrorDetail(message="The BreakRailsException not raised."))  # pragma: no cover
+        return self.__break_rails(mode)
 
     def on_success_break_function(self, condition_or_func: Union[Callable, bool] = True):
         """
@@ -303,10 +369,10 @@ class Result(Generic[T]):
         :raise BreakFunctionException
         """
 
-        if not self.success:
+        if self._is_broken or not self.success:
             return self
 
-        result = self.__is_condition_pass(condition_or_func, [self.value, self])
+        result = _is_condition_pass(condition_or_func, [self.value, self], step='on_success_break_function')
         if not result.success:
             return result  # return error result
         if not result.value:  # The condition is not true
@@ -328,13 +394,17 @@ class Result(Generic[T]):
         :type error_detail: Optional[ErrorDetail]
         """
 
+        if self._is_broken:
+            return self
+
         return self.on_success_operate_when(condition_or_func, lambda: self.__fail_when(error_detail))
 
     # endregion
 
     # region on_fail
 
-    def on_fail(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions=True, none_means_success: bool = False):
+    def on_fail(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions=True, none_means_success: bool = False,
+                retry_policy: Optional[RetryPolicy] = None):
         """
         If the result is not successful, call the function with the given arguments
 
@@ -354,15 +424,22 @@ class Result(Generic[T]):
         function will return a `Result.ok()` instance. If `none_means_success` is, defaults to True
         :type none_means_success: bool (optional)
 
+        :param retry_policy: The policy of waiting between the attempts. Defaults to None (no waiting).
+        :type retry_policy: Optional[RetryPolicy]
+
         :return: The result object is being returned.
         """
 
+        if self._is_broken:
+            return self
+
         if not is_func_valid(func):
             return Result.fail(ValidationError(message="The input function is not valid."))
         if self.success:
             return self
-        return self.try_func(func, num_of_try, ignore_previous_error=True,
-                             try_only_on_exceptions=try_only_on_exceptions, none_means_success=none_means_success)
+        return self.__try_func(func, num_of_try, ignore_previous_error=True,
+                               try_only_on_exceptions=try_only_on_exceptions, none_means_success=none_means_success,
+                               retry_policy=retry_policy, step='on_fail')
 
     def on_fail_add_more_data(self, object_or_func: Union[Any, Callable], ignore_errors: bool = False):
         """
@@ -379,25 +456,27 @@ class Result(Generic[T]):
         any errors that occur will be ignored. If `ignore_error` is set to False, any errors that occur during the execution of the function will be returned.
         :type ignore_errors: bool (optional)
         """
-        if self.success or object_or_func is None:
+        if self._is_broken or self.success or object_or_func is None:
             return self
 
         if callable(object_or_func):
-            result = self.__call_func(object_or_func, optional_args=[self])
+            result = _call_func(object_or_func, optional_args=[self], step='on_fail_add_more_data')
             if not result.success:
                 return self if ignore_errors else result
             obj = result.value
         else:
             obj = object_or_func
 
-        if not self.detail:
-            self.detail = ErrorDetail()
+        target = self
+        if not target.detail:
+            target = self._get_mutable()
+            target.detail = ErrorDetail()
 
-        result = try_func(lambda: self.detail.add_more_data(obj))
+        result = try_func(lambda: target.detail.add_more_data(obj))
         if result.success or ignore_errors:
-            return self
+            return target
 
-        result.detail.add_more_data(f"previous error: {self.detail}")  # pragma: no cover
+        result.detail.add_more_data(f"previous error: {target.detail}")  # pragma: no cover
         return result  # pragma: no cover
 
     def on_fail_new_detail(self, new_detail_or_func: Union[ErrorDetail, Callable]):
@@ -411,11 +490,11 @@ class Result(Generic[T]):
         :type new_detail_or_func: Union[ErrorDetail, Callable]
         """
 
-        if self.success:
+        if self._is_broken or self.success:
             return self
 
         if callable(new_detail_or_func):
-            result = self.__call_func(new_detail_or_func, optional_args=[self])
+            result = _call_func(new_detail_or_func, optional_args=[self], step='on_fail_new_detail')
             if not result.success:
                 return result
             new_detail = result.value
@@ -426,8 +505,9 @@ class Result(Generic[T]):
             return Result.fail(
                 ErrorDetail(message=f"Type of new detail '{type(new_detail).__name__}' "
                                     f"is not instance of '{ErrorDetail.__name__}'."))
-        self.detail = new_detail
-        return self
+        target = self._get_mutable()
+        target.detail = new_detail
+        return target
 
     def on_fail_tee(self, func: Callable, num_of_try: int = 1, try_only_on_exceptions=True,
                     ignore_errors: bool = False):
@@ -449,7 +529,12 @@ class Result(Generic[T]):
         :return: an instance of the class that it belongs to (presumably named `self`).
         """
 
-        result = self.on_fail(func, num_of_try, try_only_on_exceptions, none_means_success=True)
+        if self._is_broken or (self.success and is_func_valid(func)):
+            return self
+
+        result = self.__try_func(func, num_of_try, ignore_previous_error=True,
+                                 try_only_on_exceptions=try_only_on_exceptions, none_means_success=True,
+                                 retry_policy=None, step='on_fail_tee')
         if result.success or ignore_errors:
             return self  # ignore result
         return result
@@ -464,7 +549,7 @@ class Result(Generic[T]):
         :type exception_type: Optional[type]
         :return: Returns self or raise Exception
         """
-        if self.success:
+        if self._is_broken or self.success:
             return self
         detail = self.detail if self.detail else ""
         if exception_type:
@@ -500,12 +585,14 @@ class Result(Generic[T]):
         If condition not pass, returns previous Result object.
         """
 
-        if self.success:
+        if self._is_broken or self.success:
             return self
         return self.__operate_when(condition_or_func, func, [self], num_of_try,
-                                   try_only_on_exceptions, break_rails, none_means_success=False)
+                                   try_only_on_exceptions, break_rails, none_means_success=False,
+                                   step='on_fail_operate_when')
 
-    def on_fail_break_rails(self, condition_or_func: Union[Callable, bool] = True):
+    def on_fail_break_rails(self, condition_or_func: Union[Callable, bool] = True,
+                            mode: Optional[BreakRailsMode] = None):
         """
         The function raises a BreakRailsException if a given condition is true.
         The BreakRailsException breaks all chaining functions and can catch by
@@ -516,16 +603,20 @@ class Result(Generic[T]):
         will be called with two optional arguments: the value and the result of the previous operation.
         :type condition_or_func: Union[Callable, bool]
 
+        :param mode: How to break the rails. In `BreakRailsMode.SENTINEL` mode, a broken result is returned instead
+        of raising the exception. Defaults to the global mode.
+        :type mode: Optional[BreakRailsMode]
+
         :return: If `condition_or_func` is callable function and fails, it returns error result.
         Otherwise, raise BreakRailsException
 
         :raise BreakRailsException
         """
 
-        if self.success:
+        if self._is_broken or self.success:
             return self
 
-        return self.break_rails(condition_or_func)
+        return self.break_rails(condition_or_func, mode)
 
     def on_fail_break_function(self, condition_or_func: Union[Callable, bool] = True):
         """
@@ -542,7 +633,7 @@ class Result(Generic[T]):
         :raise BreakFunctionException
         """
 
-        if self.success:
+        if self._is_broken or self.success:
             return self
 
         return self.break_function(condition_or_func)
@@ -565,6 +656,9 @@ class Result(Generic[T]):
         :return: Result object
         """
 
+        if self._is_broken:
+            return self
+
         return self.operate_when(condition_or_func, lambda: self.__fail_when(error_detail, add_prev_detail))
 
     def __fail_when(self, error_detail: Optional[ErrorDetail] = None, add_prev_detail: bool = False):
@@ -604,14 +698,17 @@ class Result(Generic[T]):
         If condition not pass, returns previous Result object.
         """
 
+        if self._is_broken:
+            return self
+
         return self.__operate_when(condition_or_func=condition_or_func,
                                    func=func, optional_args=[self],
                                    num_of_try=num_of_try, try_only_on_exceptions=try_only_on_exceptions,
-                                   break_rails=break_rails)
+                                   break_rails=break_rails, step='operate_when')
 
     def try_func(self, func: Callable, num_of_try: int = 1,
                  ignore_previous_error: bool = False, try_only_on_exceptions: bool = True,
-                 none_means_success: bool = True):
+                 none_means_success: bool = True, retry_policy: Optional[RetryPolicy] = None):
         """
         The function `try_func` attempts to execute a given function with a specified number of tries and handles errors.
 
@@ -637,29 +734,37 @@ class Result(Generic[T]):
         function will return a `Result.ok()` instance. If `none_means_success` is, defaults to True
         :type none_means_success: bool (optional)
 
+        :param retry_policy: The policy of waiting between the attempts. Defaults to None (no waiting).
+        :type retry_policy: Optional[RetryPolicy]
+
         :return: a `Result` object.
             :return: an instance of the `Result` class, which contains either a successful result or an error message.
         """
 
-        if not is_func_valid(func):
-            return Result.fail(ValidationError(message="The input function is not valid."))
+        if self._is_broken:
+            return self
 
-        result = _get_num_of_function_parameters(func)
+        return self.__try_func(func, num_of_try, ignore_previous_error, try_only_on_exceptions, none_means_success,
+                               retry_policy, step='try_func')
+
+    def __try_func(self, func: Callable, num_of_try: int, ignore_previous_error: bool, try_only_on_exceptions: bool,
+                   none_means_success: bool, retry_policy: Optional[RetryPolicy], step: str):
+        result = _get_num_of_valid_function_parameters(func)
         if not result.success:
             return result
         num_of_function_params = result.value
 
         if num_of_function_params == 0:
             if self.success or ignore_previous_error:
-                return try_func(func, num_of_try=num_of_try, try_only_on_exceptions=try_only_on_exceptions,
-                                none_means_success=none_means_success)
+                return _call_with_retries(func, (), {}, num_of_try, try_only_on_exceptions, none_means_success,
+                                          retry_policy, None, None, step)
             return Result.fail(ValidationError(
                 message="The previous function failed. "
                         "The new function does not have a parameter to get the previous result. "
                         "Either define a function that accepts a parameter or set skip_previous_error to True."))
         if num_of_function_params == 1:
-            return try_func(lambda: func(self), num_of_try=num_of_try,
-                            try_only_on_exceptions=try_only_on_exceptions, none_means_success=none_means_success)
+            return _call_with_retries(func, (self,), {}, num_of_try, try_only_on_exceptions, none_means_success,
+                                      retry_policy, None, None, step)
         return Result.fail(ValidationError(
             message=f"{func.__name__}() takes {num_of_function_params} arguments. It cannot be executed."))
 
@@ -681,12 +786,15 @@ class Result(Generic[T]):
         :param try_only_on_exceptions: `try_only_on_exceptions` is a boolean parameter that determines whether the `func`
         should only be retried if an exception is raised or not.
         """
-        result = self.__call_func(func, [self], num_of_try, try_only_on_exceptions)
+        if self._is_broken:
+            return self
+
+        result = _call_func(func, [self], num_of_try, try_only_on_exceptions, step='finally_tee')
         if result.success:
             return self
         return result
 
-    def break_rails(self, condition_or_func: Union[Callable, bool] = True):
+    def break_rails(self, condition_or_func: Union[Callable, bool] = True, mode: Optional[BreakRailsMode] = None):
         """
         The function raises a BreakRailsException if a given condition is true.
         The BreakRailsException breaks all chaining functions and can catch by
@@ -697,20 +805,26 @@ class Result(Generic[T]):
         will be called with previous result as optional parameter.
         :type condition_or_func: Union[Callable, bool]
 
+        :param mode: How to break the rails. In `BreakRailsMode.SENTINEL` mode, a broken result is returned instead
+        of raising the exception. Defaults to the global mode.
+        :type mode: Optional[BreakRailsMode]
+
         :return: If `condition_or_func` is callable function and fails, it returns error result.
         Otherwise, raise BreakRails exception
 
         :raise BreakRails
         """
 
-        result = self.__is_condition_pass(condition_or_func, [self])
+        if self._is_broken:
+            return self
+
+        result = _is_condition_pass(condition_or_func, [self], step='break_rails')
         if not result.success:
             return result  # return error result
         if not result.value:  # The condition is not true
             return self
 
-        self.__break_rails()
-        return Result.fail(ErrorDetail(message="The BreakRails exception not raised."))  # pragma: no cover
+        return self.__break_rails(mode)
 
     def break_function(self, condition_or_func: Union[Callable, bool] = True):
         """
@@ -731,7 +845,10 @@ class Result(Generic[T]):
         :raise BreakFunctionException
         """
 
-        result = self.__is_condition_pass(condition_or_func, [self])
+        if self._is_broken:
+            return self
+
+        result = _is_condition_pass(condition_or_func, [self], step='break_function')
         if not result.success:
             return result  # return error result
         if not result.value:  # The condition is not true
@@ -742,192 +859,37 @@ class Result(Generic[T]):
 
     # region private methods
 
-    @staticmethod
-    def __call_func(func: callable, optional_args: List[Any] = None,
-                    num_of_try: int = 1, try_only_on_exceptions: bool = False, none_means_success: bool = True):
-        if not is_func_valid(func):
-            return Result.fail(ValidationError(message="The input function is not valid."))
-
-        optional_args = optional_args if optional_args else []
-
-        result = _get_num_of_function_parameters(func)
-        if not result.success:
-            return result
-        num_of_function_params = result.value
-
-        if num_of_function_params > len(optional_args):
-            return Result.fail(ValidationError(
-                message=f"{func.__name__}() takes {num_of_function_params} arguments. It cannot be executed. "
-                        f"maximum of {len(optional_args)} parameters is acceptable."))
-
-        return try_func(lambda: func(*optional_args[:num_of_function_params]),
-                        num_of_try, try_only_on_exceptions, none_means_success=none_means_success)
-
-    def __is_condition_pass(self, condition_or_func: Union[Callable, bool],
-                            optional_args: List[Any] = None,
-                            num_of_try: int = 1, try_only_on_exceptions: bool = True):
-        """
-        This function checks if a given condition or function is true or false and returns a result accordingly.
-        If `condition_or_func` is a boolean value, it returns condition.
-        If `condition_or_func` is a callable function, it calls the function, then if function fails, returns error result,
-        otherwise checks the value of result function. if it exists and be boolean value, it returns value,
-        otherwise returns True.
-        """
-
-        if isinstance(condition_or_func, bool):
-            return Result.ok(condition_or_func)
-
-        if not callable(condition_or_func):
-            return Result.fail(ValidationError(message=f"The condition only can be a function or a boolean. "
-                                                       f"{type(condition_or_func).__name__} is not acceptable."))
-
-        result = self.__call_func(condition_or_func, optional_args, num_of_try, try_only_on_exceptions)
-        if not result.success:
-            return result
-        if result.value is not None and isinstance(result.value, bool):
-            return Result.ok(result.value)
-        return Result.ok(True)
-
     def __operate_when(self, condition_or_func: Union[Callable, bool],
                        func: Callable, optional_args: List[Any] = None,
                        num_of_try: int = 1, try_only_on_exceptions=True, break_rails: bool = False,
-                       none_means_success: bool = True):
-        result = self.__is_condition_pass(condition_or_func, optional_args, num_of_try, try_only_on_exceptions)
+                       none_means_success: bool = True, step: str = 'try_func'):
+        result = _is_condition_pass(condition_or_func, optional_args, num_of_try, try_only_on_exceptions, step)
         if not result.success:
             return result  # Return error result
         if not result.value:  # The condition is not true
             return self
-        return self.__call_func(func, optional_args, num_of_try,
-                                try_only_on_exceptions, none_means_success=none_means_success) \
+        return _call_func(func, optional_args, num_of_try,
+                                try_only_on_exceptions, none_means_success=none_means_success, step=step) \
             .break_rails(break_rails)
 
-    def __break_rails(self):
+    def __break_rails(self, mode: Optional[BreakRailsMode] = None):
+        mode = mode if mode else get_default_break_rails_mode()
+        if mode == BreakRailsMode.SENTINEL:
+            return _BrokenResult(self.success, self.detail, self.value)
         raise BreakRailsException(result=self)
 
+    def _get_unbroken(self):
+        """
+        Returns a normal result with the same data if the rails are broken, otherwise self.
+        """
+        return Result(self.success, self.detail, self.value) if self._is_broken else self
+
     def __break_function(self):
         raise BreakFunctionException(result=self)
 
     # endregion
 
 
-def try_func(func: Callable, num_of_try: int = 1, try_only_on_exceptions: bool = True,
-             none_means_success: bool = True) -> Result:
-    """
-    The function `try_func` attempts to execute a given function with a specified number of tries and handles errors.
-
-    :param func: The input function that needs to be executed
-    :param num_of_try: The number of times the input function will be attempted to execute in case of failure. The default
-    value is 1, meaning the function will be executed only once by default, defaults to 1 (optional)
-    :return: a `Result` object. The `Result` object can either be a successful result or a failed result with an
-    `ValidationError` object containing information about the error.
-
-    :param try_only_on_exceptions: A boolean parameter that determines whether the function should only be retried if an
-    exception is raised. If set to True, the function will only be retried if an exception is raised. If set to False, the
-    function will be retried regardless of whether an exception is raised or Result is not success, defaults to True
-    :type try_only_on_exceptions: bool (optional)
-
-    :param none_means_success: A boolean parameter that determines whether a `None` output should be considered a
-        success or a failure. If `none_means_success` is `True`, then a `None` output will be considered a success and the
-        function will return a `Result.ok()` instance. If `none_means_success` is, defaults to True
-    :type none_means_success: bool (optional)
-
-    :return: a `Result` object.
-    """
-
-    if not is_func_valid(func):
-        return Result.fail(ValidationError(message="The input function is not valid."))
-
-    result = _get_num_of_function_parameters(func)
-    if not result.success:
-        return result
-    num_of_function_params = result.value
-
-    if num_of_function_params > 0:
-        return Result.fail(ValidationError(
-            message=f"{func.__name__}() takes {num_of_function_params} arguments. It cannot be executed."))
-
-    errors = []
-    for _ in range(num_of_try):
-        try:
-            result = await_func(func)
-            result = Result.convert_to_result(result, none_means_success=none_means_success)
-            if result.success or try_only_on_exceptions:
-                return result
-            if result.detail:
-                errors.append(result.detail)
-        except BreakFunctionException:
-            raise  # Must be captured and managed in @def_result decorator.
-        except BreakRailsException as e:
-            return e.result
-        except Exception as e:
-            errors.append(e)
-
-    error_detail = generate_error(errors, num_of_try)
-    return Result.fail(error_detail)
-
-
-async def try_func_async(func_async: Callable, num_of_try: int = 1, try_only_on_exceptions: bool = True) -> Result:
-    """
-    The function `try_func` attempts to execute a given function with a specified number of tries and handles errors.
-
-    :param func_async: The input function that needs to be executed
-    :param num_of_try: The number of times the input function will be attempted to execute in case of failure. The default
-    value is 1, meaning the function will be executed only once by default, defaults to 1 (optional)
-    :return: a `Result` object. The `Result` object can either be a successful result or a failed result with an
-    `ValidationError` object containing information about the error.
-
-    :param try_only_on_exceptions: A boolean parameter that determines whether the function should only be retried if an
-    exception is raised. If set to True, the function will only be retried if an exception is raised. If set to False, the
-    function will be retried regardless of whether an exception is raised or Result is not success, defaults to True
-    :type try_only_on_exceptions: bool (optional)
-
-    :return: a `Result` object.
-    """
-
-    if not is_func_valid(func_async):
-        return Result.fail(ValidationError(message="The input function is not valid."))
-
-    result = _get_num_of_function_parameters(func_async)
-    if not result.success:
-        return result
-    num_of_function_params = result.value
-
-    if num_of_function_params > 0:
-        return Result.fail(ValidationError(
-            message=f"{func_async.__name__}() takes {num_of_function_params} arguments. It cannot be executed."))
-
-    errors = []
-    for _ in range(num_of_try):
-        try:
-            result = func_async()
-            if isinstance(result, Coroutine):
-                result = await result
-            result = Result.convert_to_result(result)
-            if result.success or try_only_on_exceptions:
-                return result
-            if result.detail:
-                errors.append(result.detail)
-        except BreakFunctionException:
-            raise  # Must be captured and managed in @def_result decorator.
-        except BreakRailsException as e:
-            return e.result
-        except Exception as e:
-            errors.append(e)
-
-    error_detail = generate_error(errors, num_of_try)
-    return Result.fail(error_detail)
-
-
-def _get_num_of_function_parameters(func: Callable):
-    try:
-        return Result.ok(get_num_of_function_parameters(func))
-    except Exception:
-        return Result.fail(ErrorDetail(title="Function Parameter Detection Error",
-                                       message=f"Can not recognize the number of function ({func.__name__}) "
-                                               f"parameters. You can wrap your built-in function with a python "
-                                               f"function like `lambda`.", code=400))
-
-
 # The class `BreakRails` defines an exception that takes a `Result` object as input.
 class BreakRailsException(Exception):
     """
@@ -953,6 +915,9 @@ class BreakRailsException(Exception):
             raise ValueError("The result must be an instance of Result")
         self.result = result
 
+    def __reduce__(self):
+        return self.__class__, (self.result,)
+
 
 class BreakFunctionException(Exception):
     """
@@ -977,3 +942,17 @@ class BreakFunctionException(Exception):
         if not isinstance(result, Result):
             raise ValueError("The result must be an instance of Result")
         self.result = result
+
+    def __reduce__(self):
+        return self.__class__, (self.result,)
+
+
+# The modules below use the classes of this module, so they are imported after them. The other modules import their
+# functions (like try_func) from this module, so this module is always initialized first.
+from on_rails._retries import (  # pylint: disable=wrong-import-position,cyclic-import,unused-import
+    _call_func, _call_with_retries, _call_with_retries_async,
+    _get_condition_result, _get_constant_condition, _get_func_args,
+    _get_num_of_function_parameters, _get_num_of_valid_function_parameters,
+    _get_success_checker, _is_condition_pass, try_func, try_func_async)
+from on_rails._special_results import (  # pylint: disable=wrong-import-position,cyclic-import
+    _EMPTY_FAIL, _EMPTY_OK, _BrokenResult)
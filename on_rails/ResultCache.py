@@ -0,0 +1,148 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from on_rails.Result import Result
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+
+
+class ResultCacheInfo(NamedTuple):
+    """ Statistics of a result cache. """
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class ResultCache:
+    """ Stores the results of a function by its arguments (LRU with TTL).
+
+    It is used by `def_result(cache=...)` to memoize the results of idempotent functions. The successful results are
+    kept for `ttl` seconds and the failed results (negative caching) for `failure_ttl` seconds. When the cache is
+    full, the least recently used result is removed. The cache is thread-safe.
+
+    A copy of the result is cached and each caller receives its own copy of it (the result, its detail, the list
+    of `more_data` and the dictionary of `errors`), so the chaining methods that change a result (like `on_success_add_more_data`) do not change the
+    cached one. The values are not copied, so they must not be changed.
+
+    Example:
+        @def_result(cache=ResultCache(maxsize=1024, ttl=60, failure_ttl=5))
+        def get_user(user_id):
+            ...
+
+    Attributes:
+        maxsize (int): The maximum number of results. Defaults to 128.
+        ttl (float, optional): The time (in seconds) that a successful result is kept. Defaults to None (no expiry).
+        failure_ttl (float, optional): The time (in seconds) that a failed result is kept. Defaults to None (the failed
+        results are not cached).
+    """
+    maxsize: int
+    ttl: Optional[float]
+    failure_ttl: Optional[float]
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None, failure_ttl: Optional[float] = None):
+        """
+        Initializes a new instance of the ResultCache class.
+
+        :raises ValueError: If maxsize is less than 1 or a ttl is not positive.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be greater than 0")
+        if (ttl is not None and ttl <= 0) or (failure_ttl is not None and failure_ttl <= 0):
+            raise ValueError("ttl and failure_ttl must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Hashable, Tuple[Result, Optional[float]]]' = OrderedDict()
+        self._stats = _CacheStats()
+
+    @staticmethod
+    def make_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[Hashable]:
+        """
+        Makes the key of the arguments of a call.
+
+        :return: The key or None if the arguments are not hashable (the call is not cached).
+        """
+        key = args if not kwargs else args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key: Hashable) -> Optional[Result]:
+        """
+        Returns a copy of the cached result of the key or None if it is not cached or is expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires_at = entry
+                if expires_at is None or time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return _copy_result(result)
+                del self._entries[key]
+                self._stats.evictions += 1
+            self._stats.misses += 1
+            return None
+
+    def put(self, key: Hashable, result: Result) -> None:
+        """
+        Caches a copy of the result if it is successful or negative caching is enabled.
+        """
+        ttl = self.ttl if result.success else self.failure_ttl
+        if not result.success and ttl is None:
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (_copy_result(result), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def cache_info(self) -> ResultCacheInfo:
+        """
+        Returns the statistics of the cache. The expired results that are removed are counted as evictions.
+        """
+        with self._lock:
+            stats = self._stats
+            return ResultCacheInfo(stats.hits, stats.misses, stats.evictions, self.maxsize, len(self._entries))
+
+    def cache_clear(self) -> None:
+        """ Removes all the results and resets the statistics. """
+        with self._lock:
+            self._entries.clear()
+            self._stats = _CacheStats()
+
+
+class _CacheStats:
+    """ The counters of a result cache. """
+    __slots__ = ('hits', 'misses', 'evictions')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+def _copy_result(result: Result) -> Result:
+    if result._is_frozen:  # pylint: disable=protected-access
+        return result
+    detail = result.detail
+    if detail is not None:
+        detail = copy.copy(detail)
+        if detail.more_data is not None:
+            detail.more_data = list(detail.more_data)
+        if isinstance(detail, ErrorDetail) and detail.errors is not None:
+            detail.errors = dict(detail.errors)
+    return Result(result.success, detail, result.value)
+
+
+_KWARGS_MARK = object()
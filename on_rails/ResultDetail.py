@@ -1,4 +1,27 @@
-from typing import Any, List, Optional
+import copy
+import copyreg
+import inspect
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def to_serializable(value: Any, include_stack_trace: bool = False) -> Any:
+    """
+    Converts a value to the types that a JSON encoder supports. The results and the result details are converted
+    with their `to_dict` method, the lists, tuples and sets to lists and the dictionaries are converted recursively.
+    The other values are returned as is.
+    """
+    if isinstance(value, _SCALAR_TYPES):
+        return value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_serializable(item, include_stack_trace) for item in value]
+    if isinstance(value, dict):
+        return {key: to_serializable(item, include_stack_trace) for key, item in value.items()}
+    to_dict = getattr(value, 'to_dict', None)
+    if to_dict is not None and callable(to_dict):
+        return to_dict(include_stack_trace=True) if include_stack_trace else to_dict()
+    return value
 
 
 class ResultDetail:
@@ -9,11 +32,25 @@ class ResultDetail:
         message (str, optional): A message describing the result detail. Defaults to None.
         code (int, optional): A code associated with the result detail. Defaults to None.
         more_data (List[Any]): A list of additional data associated with the result detail. Defaults to an empty list.
+
+    The class and its subclasses in this package use `__slots__`, so instances have no `__dict__`.
+    To attach custom attributes, inherit from them without defining `__slots__`.
+
+    When a detail is pickled (for example, to send it to another process), the wire form of `_get_wire_state` is used.
+    When it is converted with `to_dict`, the fields of `_dict_fields` are used. Each class is registered by its name
+    (the `type` key of `to_dict`) when it is defined, so `from_dict` can create the same class. A class does not
+    replace a registered class with the same name (use `register_detail_type` for that).
     """
+    __slots__ = ('title', 'message', 'code', 'more_data')
+
+    # The (name, converter) pairs of the fields of `to_dict`. The values that are None are not converted.
+    _dict_fields: Tuple[Tuple[str, Optional[Callable[[Any], Any]]], ...] = (
+        ('title', None), ('message', None), ('code', None), ('more_data', to_serializable))
+
     title: str
     message: Optional[str]
     code: Optional[int]
-    more_data: List[Any] = []
+    more_data: List[Any]
 
     def __init__(self, title: str,
                  message: Optional[str] = None,
@@ -87,3 +124,177 @@ class ResultDetail:
             for data in self.more_data:
                 result += f"\t{data}\n"
         return result
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _register_detail_type(cls, cls.__name__, replace=False)
+
+    def to_dict(self, include_stack_trace: bool = False) -> Dict[str, Any]:  # pylint: disable=unused-argument
+        """
+        Converts the detail to a dictionary that can be encoded as JSON. The `type` key is the name of the class.
+
+        :param include_stack_trace: Whether the stack trace of an error detail is included. Defaults to False.
+        :return: The dictionary of the detail
+        """
+        type_name, fields = _get_dict_plan(self.__class__)
+        data = {'type': type_name}
+        for name, convert in fields:
+            value = getattr(self, name, None)
+            data[name] = convert(value) if convert is not None and value is not None else value
+        return data
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any], default_type: Optional[type] = None) -> 'ResultDetail':
+        """
+        Creates a detail from the dictionary of `to_dict`. The class is found by the `type` key, then by the code
+        (the first registered class with that default code) and then `default_type` is used. A found class that is
+        not a subclass of `default_type` is skipped. The `__init__` of the class is not called, so an error detail
+        does not capture a stack trace.
+
+        :param data: The dictionary of the detail
+        :param default_type: The base class of the detail. It is used when no registered class is found. Defaults to
+        ResultDetail.
+        :return: The detail
+        :raises ValueError: If data is not a valid detail dictionary.
+        """
+        error = get_detail_dict_error(data)
+        if error is not None:
+            raise ValueError(error)
+        return _create_detail(data, default_type if default_type is not None else ResultDetail)
+
+    @classmethod
+    def _from_dict_fields(cls, data: Dict[str, Any]) -> 'ResultDetail':
+        """
+        Creates an instance from the fields of `_dict_fields` without calling `__init__`. Subclasses can override it to
+        convert the values or to set the other slots.
+        """
+        new = cls.__new__(cls)
+        for name, _ in _get_dict_plan(cls)[1]:
+            object.__setattr__(new, name, data.get(name))
+        if new.more_data is None:
+            new.more_data = []
+        return new
+
+    def _get_wire_state(self) -> Dict[str, Any]:
+        """
+        Returns the values of the slots that are pickled. Subclasses can override it to drop or convert the values
+        that are large or can not be pickled.
+        """
+        return {name: getattr(self, name) for name in _get_slot_names(self.__class__) if hasattr(self, name)}
+
+    def __reduce__(self):
+        return copyreg.__newobj__, (self.__class__,), (getattr(self, '__dict__', None), self._get_wire_state())
+
+    def __copy__(self):
+        new = self.__class__.__new__(self.__class__)
+        for name in _get_slot_names(self.__class__):
+            if hasattr(self, name):
+                object.__setattr__(new, name, getattr(self, name))
+        if hasattr(self, '__dict__'):
+            new.__dict__.update(self.__dict__)
+        return new
+
+    def __deepcopy__(self, memo):
+        new = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new
+        for name in _get_slot_names(self.__class__):
+            if hasattr(self, name):
+                object.__setattr__(new, name, copy.deepcopy(getattr(self, name), memo))
+        if hasattr(self, '__dict__'):
+            new.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return new
+
+
+_slot_names: Dict[type, Tuple[str, ...]] = {}
+
+
+def _get_slot_names(cls: type) -> Tuple[str, ...]:
+    names = _slot_names.get(cls)
+    if names is None:
+        names = tuple(name for klass in reversed(cls.__mro__)
+                      for name in klass.__dict__.get('__slots__', ()) if name not in ('__dict__', '__weakref__'))
+        _slot_names[cls] = names
+    return names
+
+
+_dict_plans: Dict[type, Tuple[str, Tuple[Tuple[str, Optional[Callable[[Any], Any]]], ...]]] = {}
+
+
+def _get_dict_plan(cls: type) -> Tuple[str, Tuple[Tuple[str, Optional[Callable[[Any], Any]]], ...]]:
+    plan = _dict_plans.get(cls)
+    if plan is None:
+        plan = (cls.__name__, tuple(cls._dict_fields))  # pylint: disable=protected-access
+        _dict_plans[cls] = plan
+    return plan
+
+
+_detail_types: Dict[str, type] = {}
+_detail_types_by_code: Dict[Any, type] = {}
+
+
+def register_detail_type(cls: type, type_name: Optional[str] = None) -> None:
+    """
+    Registers a detail class by a type name, so `ResultDetail.from_dict` creates it for that `type` key.
+    The classes are registered by their name when they are defined, unless the name is already registered. So it is
+    only needed for other names (like the names of the classes of another service) or to replace the class of a name.
+    A newer registration of a name replaces the older one.
+
+    :raises ValueError: If cls is not a subclass of ResultDetail.
+    """
+    if not isinstance(cls, type) or not issubclass(cls, ResultDetail):
+        raise ValueError("cls must be a subclass of ResultDetail")
+    _register_detail_type(cls, type_name if type_name else cls.__name__, replace=True)
+
+
+def get_detail_type(type_name: str) -> Optional[type]:
+    """
+    Returns the detail class that is registered by the type name or None.
+    """
+    return _detail_types.get(type_name)
+
+
+def _register_detail_type(cls: type, type_name: str, replace: bool) -> None:
+    if replace:
+        _detail_types[type_name] = cls
+    else:
+        _detail_types.setdefault(type_name, cls)
+    try:
+        code = inspect.signature(cls.__init__).parameters['code'].default
+    except (KeyError, TypeError, ValueError):
+        return
+    if isinstance(code, int):
+        _detail_types_by_code.setdefault(code, cls)
+
+
+def get_detail_dict_error(data: Any) -> Optional[str]:  # pylint: disable=too-many-return-statements
+    """
+    Returns the error of a detail dictionary or None if it is valid. The `title` is required and the `type` must be
+    a string if it is given.
+    """
+    if not isinstance(data, dict):
+        return f"The detail must be a dictionary, not {type(data).__name__}."
+    title = data.get('title')
+    if not isinstance(title, str) or title == '':
+        return "The title of the detail is required."
+    if not isinstance(data.get('type', ''), str):
+        return "The type of the detail must be a string."
+    code = data.get('code')
+    if code is not None and (not isinstance(code, int) or isinstance(code, bool)):
+        return "The code of the detail must be an integer."
+    if not isinstance(data.get('more_data', []), (list, type(None))):
+        return "The more_data of the detail must be a list."
+    if not isinstance(data.get('errors'), (dict, type(None))):
+        return "The errors of the detail must be a dictionary."
+    return None
+
+
+def _create_detail(data: Dict[str, Any], default_type: type) -> ResultDetail:
+    cls = _detail_types.get(data.get('type'))
+    if cls is None or not issubclass(cls, default_type):
+        cls = _detail_types_by_code.get(data.get('code'))
+        if cls is None or not issubclass(cls, default_type):
+            cls = default_type
+    return cls._from_dict_fields(data)  # pylint: disable=protected-access
+
+
+_register_detail_type(ResultDetail, ResultDetail.__name__, replace=True)
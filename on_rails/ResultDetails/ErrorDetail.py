@@ -1,29 +1,236 @@
+import itertools
+import linecache
+import pickle
+import sys
 import traceback
-from typing import Any, Dict, List, Optional
+from enum import Enum
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional, Tuple
 
-from on_rails.ResultDetail import ResultDetail
+from on_rails.ResultDetail import ResultDetail, to_serializable
+
+
+class StackTraceMode(Enum):
+    """
+    Determines how the stack trace of an error detail is captured.
+
+    EAGER: The stack trace is extracted when the error detail is created (default).
+    LAZY: Only a reference to the frame is stored. The stack trace is extracted the first time it is accessed.
+    OFF: The stack trace is not captured.
+    """
+    EAGER = 'eager'
+    LAZY = 'lazy'
+    OFF = 'off'
+
+
+class StackTracePolicy:
+    """
+    Stores the policy of capturing the stack trace of error details.
+
+    Attributes:
+        mode (StackTraceMode): How the stack trace is captured. Defaults to `StackTraceMode.EAGER`.
+        limit (int, optional): The maximum number of frames to capture. Defaults to None (all frames).
+        sample_rate (int): Captures the stack trace of 1 in `sample_rate` error details. Defaults to 1 (all of them).
+    """
+    mode: StackTraceMode
+    limit: Optional[int]
+    sample_rate: int
+
+    def __init__(self, mode: StackTraceMode = StackTraceMode.EAGER, limit: Optional[int] = None,
+                 sample_rate: int = 1):
+        """
+        Initializes a new instance of the StackTracePolicy class.
+
+        :raises ValueError: If limit is not positive or sample_rate is less than 1.
+        """
+        if not isinstance(mode, StackTraceMode):
+            raise ValueError("mode must be an instance of StackTraceMode")
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be a positive number")
+        if sample_rate < 1:
+            raise ValueError("sample_rate must be greater than or equal to 1")
+        self.mode = mode
+        self.limit = limit
+        self.sample_rate = sample_rate
+
+
+_default_stack_trace_policy = StackTracePolicy()
+_sample_counter = itertools.count()
+_EMPTY_STACK_TRACE = traceback.StackSummary()
+
+
+def _get_stack_positions(frame: Optional[FrameType], limit: Optional[int]) -> Tuple[Tuple[CodeType, int], ...]:
+    positions = []
+    while frame is not None and (limit is None or len(positions) < limit):
+        positions.append((frame.f_code, frame.f_lineno))
+        frame = frame.f_back
+    positions.reverse()
+    return tuple(positions)
+
+
+def _to_stack_summary(positions: Tuple[Tuple[CodeType, int], ...]) -> traceback.StackSummary:
+    for filename in {code.co_filename for code, _ in positions}:
+        linecache.checkcache(filename)
+    return traceback.StackSummary.from_list(
+        [traceback.FrameSummary(code.co_filename, lineno, code.co_name) for code, lineno in positions])
+
+
+def set_default_stack_trace_policy(policy: StackTracePolicy) -> None:
+    """
+    Sets the policy that is used by error details which are created without a stack trace policy.
+
+    :param policy: The new default policy
+    :type policy: StackTracePolicy
+    """
+    global _default_stack_trace_policy  # pylint: disable=global-statement
+    if not isinstance(policy, StackTracePolicy):
+        raise ValueError("policy must be an instance of StackTracePolicy")
+    _default_stack_trace_policy = policy
+
+
+def get_default_stack_trace_policy() -> StackTracePolicy:
+    """
+    Returns the policy that is used by error details which are created without a stack trace policy.
+    """
+    return _default_stack_trace_policy
+
+
+class RemoteException(Exception):
+    """
+    Stores the type and the message of an exception that can not be pickled.
+    When an error detail is pickled, such exceptions are replaced with a RemoteException.
+
+    Attributes:
+        type_name (str): The full name of the type of the original exception.
+        message (str): The message of the original exception.
+    """
+    type_name: str
+    message: str
+
+    def __init__(self, type_name: str, message: str):
+        super().__init__(type_name, message)
+        self.type_name = type_name
+        self.message = message
+
+    def __str__(self):
+        return f"{self.type_name}: {self.message}"
+
+
+def to_portable_exception(exception: Optional[BaseException]) -> Optional[BaseException]:
+    """
+    Returns the exception if it can be pickled and unpickled, otherwise a `RemoteException` with its type and message.
+    """
+    if exception is None:
+        return None
+    try:
+        pickle.loads(pickle.dumps(exception))
+        return exception
+    except Exception:  # pylint: disable=broad-except
+        exception_type = type(exception)
+        return RemoteException(f"{exception_type.__module__}.{exception_type.__qualname__}", str(exception))
+
+
+def exception_to_dict(exception: BaseException) -> Dict[str, str]:
+    """
+    Converts an exception to a dictionary with the full name of its type and its message.
+    """
+    if isinstance(exception, RemoteException):
+        return {'type': exception.type_name, 'message': exception.message}
+    exception_type = type(exception)
+    return {'type': f"{exception_type.__module__}.{exception_type.__qualname__}", 'message': str(exception)}
 
 
 class ErrorDetail(ResultDetail):
     """
     Stores the error details of a result.
 
+    In the pickled form, the stack trace is dropped and the exception is converted with `to_portable_exception`.
+    In the dictionary form (`to_dict`), the exception is converted with `exception_to_dict`.
+
     Inherits from ResultDetail class.
     """
+    __slots__ = ('errors', 'exception', '_stack_trace', '_stack_positions', '_stack_limit')
+
+    _dict_fields = ResultDetail._dict_fields + (('errors', to_serializable), ('exception', exception_to_dict))
+
     errors: Optional[Dict[str, str]]
     exception: Optional[Exception]
-    stack_trace: traceback.StackSummary
+    _stack_trace: Optional[traceback.StackSummary]
+    _stack_positions: Optional[Tuple[Tuple[CodeType, int], ...]]
+    _stack_limit: Optional[int]
 
     def __init__(self, title: Optional[str] = "An error occurred",
                  message: Optional[str] = None,
                  code: Optional[int] = 500,
                  errors: Optional[Dict[str, str]] = None,
                  exception: Optional[Exception] = None,
-                 more_data: Optional[List[Any]] = None):
+                 more_data: Optional[List[Any]] = None,
+                 stack_trace_policy: Optional[StackTracePolicy] = None):
         super().__init__(title if title else "An error occurred", message, code, more_data)
         self.errors = errors
         self.exception = exception
-        self.stack_trace = traceback.extract_stack()
+        self._capture_stack_trace(stack_trace_policy if stack_trace_policy else _default_stack_trace_policy)
+
+    def _capture_stack_trace(self, policy: StackTracePolicy) -> None:
+        self._stack_trace = None
+        self._stack_positions = None
+        self._stack_limit = policy.limit
+
+        if policy.mode == StackTraceMode.OFF or \
+                (policy.sample_rate > 1 and next(_sample_counter) % policy.sample_rate != 0):
+            self._stack_trace = traceback.StackSummary()
+        elif policy.mode == StackTraceMode.LAZY:
+            # The code and the line number of the frames are captured now, but the source lines are read when the
+            # stack trace is accessed. The frames are not kept, so their local variables are not kept alive.
+            self._stack_positions = _get_stack_positions(sys._getframe(1),  # pylint: disable=protected-access
+                                                         self._stack_limit)
+        else:
+            self._stack_trace = traceback.extract_stack(sys._getframe(1),  # pylint: disable=protected-access
+                                                        limit=self._stack_limit)
+
+    @property
+    def stack_trace(self) -> traceback.StackSummary:
+        """
+        The stack trace of the place where the error detail was created.
+        Based on the stack trace policy, it may be extracted on the first access or be empty.
+        """
+        if self._stack_trace is None:
+            self._stack_trace = _to_stack_summary(self._stack_positions)
+            self._stack_positions = None
+        return self._stack_trace
+
+    @stack_trace.setter
+    def stack_trace(self, value: traceback.StackSummary) -> None:
+        self._stack_trace = value if value is not None else traceback.StackSummary()
+        self._stack_positions = None
+
+    def to_dict(self, include_stack_trace: bool = False) -> Dict[str, Any]:
+        data = super().to_dict()
+        if include_stack_trace:
+            data['stack_trace'] = self.stack_trace.format()
+        return data
+
+    @classmethod
+    def _from_dict_fields(cls, data: Dict[str, Any]) -> 'ErrorDetail':
+        new = super()._from_dict_fields(data)
+        exception = data.get('exception')
+        if isinstance(exception, dict):
+            exception = RemoteException(str(exception.get('type')), str(exception.get('message')))
+        elif exception is not None:
+            exception = RemoteException('builtins.Exception', str(exception))
+        object.__setattr__(new, 'exception', exception)
+        object.__setattr__(new, '_stack_trace', _EMPTY_STACK_TRACE)  # A remote error has no local stack trace.
+        object.__setattr__(new, '_stack_positions', None)
+        object.__setattr__(new, '_stack_limit', None)
+        return new
+
+    def _get_wire_state(self) -> Dict[str, Any]:
+        state = super()._get_wire_state()
+        state['exception'] = to_portable_exception(self.exception)
+        state['_stack_trace'] = _EMPTY_STACK_TRACE
+        state['_stack_positions'] = None
+        state['_stack_limit'] = None
+        return state
 
     def add_or_update_error(self, key: str, value: str):
         """
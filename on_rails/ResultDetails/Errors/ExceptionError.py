@@ -1,5 +1,6 @@
 from typing import Any, Dict, List, Optional
 
+from on_rails.ResultDetails.ErrorDetail import StackTracePolicy
 from on_rails.ResultDetails.Errors.InternalError import InternalError
 
 
@@ -9,14 +10,16 @@ class ExceptionError(InternalError):
 
     Inherits from InternalError class.
     """
+    __slots__ = ()
 
     def __init__(self, exception: Exception,
                  title: Optional[str] = "An exception occurred",
                  message: Optional[str] = None,
                  code: Optional[int] = 500,
                  errors: Optional[Dict[str, str]] = None,
-                 more_data: Optional[List[Any]] = None):
+                 more_data: Optional[List[Any]] = None,
+                 stack_trace_policy: Optional[StackTracePolicy] = None):
         if not exception:
             raise ValueError("Exception must be provided")
         super().__init__(title=title, message=message, code=code, errors=errors, exception=exception,
-                         more_data=more_data)
+                         more_data=more_data, stack_trace_policy=stack_trace_policy)
@@ -1,6 +1,6 @@
 from typing import Any, Dict, List, Optional
 
-from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail, StackTracePolicy
 
 
 class InternalError(ErrorDetail):
@@ -9,12 +9,14 @@ class InternalError(ErrorDetail):
 
     Inherits from ErrorDetail class.
     """
+    __slots__ = ()
 
     def __init__(self, title: Optional[str] = "Internal Error",
                  message: Optional[str] = None,
                  code: Optional[int] = 500,
                  errors: Optional[Dict[str, str]] = None,
                  exception: Optional[Exception] = None,
-                 more_data: Optional[List[Any]] = None):
+                 more_data: Optional[List[Any]] = None,
+                 stack_trace_policy: Optional[StackTracePolicy] = None):
         super().__init__(title=title, message=message, code=code, errors=errors, exception=exception,
-                         more_data=more_data)
+                         more_data=more_data, stack_trace_policy=stack_trace_policy)
@@ -1,6 +1,6 @@
 from typing import Any, Dict, List, Optional
 
-from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail, StackTracePolicy
 
 
 class NotFoundError(ErrorDetail):
@@ -9,13 +9,15 @@ class NotFoundError(ErrorDetail):
 
     Inherits from ErrorDetail class.
     """
+    __slots__ = ()
 
     def __init__(self, title: Optional[str] = "NotFound Error",
                  message: Optional[str] = None,
                  code: Optional[int] = 404,
                  errors: Optional[Dict[str, str]] = None,
                  exception: Optional[Exception] = None,
-                 more_data: Optional[List[Any]] = None):
+                 more_data: Optional[List[Any]] = None,
+                 stack_trace_policy: Optional[StackTracePolicy] = None):
         """
         Initializes a new instance of the NotFoundError class.
 
@@ -25,6 +27,7 @@ class NotFoundError(ErrorDetail):
         :param errors: The dictionary of errors associated with the error.
         :param exception: The exception associated with the error.
         :param more_data: Any additional data associated with the error.
+        :param stack_trace_policy: The policy of capturing the stack trace. Defaults to the global policy.
         """
         super().__init__(title=title, message=message, code=code, errors=errors, exception=exception,
-                         more_data=more_data)
+                         more_data=more_data, stack_trace_policy=stack_trace_policy)
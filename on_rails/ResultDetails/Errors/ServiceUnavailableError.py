@@ -0,0 +1,33 @@
+from typing import Any, Dict, List, Optional
+
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail, StackTracePolicy
+
+
+class ServiceUnavailableError(ErrorDetail):
+    """
+    Represent the error details of a service that is not available. Default code is 503.
+
+    Inherits from ErrorDetail class.
+    """
+    __slots__ = ()
+
+    def __init__(self, title: Optional[str] = "Service Unavailable",
+                 message: Optional[str] = None,
+                 code: Optional[int] = 503,
+                 errors: Optional[Dict[str, str]] = None,
+                 exception: Optional[Exception] = None,
+                 more_data: Optional[List[Any]] = None,
+                 stack_trace_policy: Optional[StackTracePolicy] = None):
+        """
+        Initializes a new instance of the ServiceUnavailableError class.
+
+        :param title: The title of the error.
+        :param message: The message associated with the error.
+        :param code: The HTTP status code associated with the error.
+        :param errors: The dictionary of errors associated with the error.
+        :param exception: The exception associated with the error.
+        :param more_data: Any additional data associated with the error.
+        :param stack_trace_policy: The policy of capturing the stack trace. Defaults to the global policy.
+        """
+        super().__init__(title=title, message=message, code=code, errors=errors, exception=exception,
+                         more_data=more_data, stack_trace_policy=stack_trace_policy)
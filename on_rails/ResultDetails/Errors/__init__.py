@@ -2,7 +2,9 @@ from on_rails.ResultDetails.Errors.BadRequestError import *
 from on_rails.ResultDetails.Errors.ConflictError import *
 from on_rails.ResultDetails.Errors.ExceptionError import *
 from on_rails.ResultDetails.Errors.ForbiddenError import *
+from on_rails.ResultDetails.Errors.GatewayTimeoutError import *
 from on_rails.ResultDetails.Errors.InternalError import *
 from on_rails.ResultDetails.Errors.NotFoundError import *
+from on_rails.ResultDetails.Errors.ServiceUnavailableError import *
 from on_rails.ResultDetails.Errors.UnauthorizedError import *
 from on_rails.ResultDetails.Errors.ValidationError import *
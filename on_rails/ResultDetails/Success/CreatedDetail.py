@@ -9,6 +9,7 @@ class CreatedDetail(SuccessDetail):
 
     Inherits from SuccessDetail class.
     """
+    __slots__ = ()
 
     def __init__(self, title: Optional[str] = "A new resource has been created",
                  message: Optional[str] = None,
@@ -9,6 +9,7 @@ class NotModifiedDetail(SuccessDetail):
 
     Inherits from SuccessDetail class.
     """
+    __slots__ = ()
 
     def __init__(self, title: Optional[str] = "The resource has not been modified since the last request",
                  message: Optional[str] = None,
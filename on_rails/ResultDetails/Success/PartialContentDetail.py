@@ -9,6 +9,7 @@ class PartialContentDetail(SuccessDetail):
 
     Inherits from SuccessDetail class.
     """
+    __slots__ = ()
 
     def __init__(self, title: Optional[str] = "Partial content",
                  message: Optional[str] = None,
@@ -7,6 +7,8 @@ class WarningDetail(SuccessDetail):
     """
     It shows the information of an operation that has been completed with a warning.
     """
+    __slots__ = ()
+
     def __init__(self,
                  message: str,
                  title: Optional[str] = "The operation was completed successfully, but there is a warning.",
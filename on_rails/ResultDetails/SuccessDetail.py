@@ -16,6 +16,7 @@ class SuccessDetail(ResultDetail):
         code (int, optional): The HTTP status code of the successful operation. Defaults to 200.
         more_data (List[Any], optional): Additional data related to the successful operation. Defaults to None.
     """
+    __slots__ = ()
 
     def __init__(self, title: Optional[str] = "Operation was successful",
                  message: Optional[str] = None,
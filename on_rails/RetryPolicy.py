@@ -0,0 +1,116 @@
+import random
+import time
+from enum import Enum
+from typing import Any, Callable, Optional, Tuple, Type, Union
+
+
+class JitterMode(Enum):
+    """
+    Determines how the random jitter is applied to the backoff delay.
+
+    NONE: The exponential delay is used as is.
+    FULL: A random delay between 0 and the exponential delay.
+    DECORRELATED: A random delay between the base delay and 3 times the previous delay.
+    """
+    NONE = 'none'
+    FULL = 'full'
+    DECORRELATED = 'decorrelated'
+
+
+class RetryPolicy:
+    """ Stores the policy of waiting between the attempts of an operation.
+
+    The number of attempts is still determined by `num_of_try`. The policy determines how long to wait before the
+    next attempt and whether the next attempt should be made at all.
+
+    Attributes:
+        base_delay (float): The delay (in seconds) before the second attempt. Defaults to 0.1.
+        max_delay (float): The maximum delay (in seconds) between two attempts. Defaults to 10.
+        multiplier (float): The delay is multiplied by this value after each attempt. Defaults to 2.
+        jitter (JitterMode): How the random jitter is applied to the delay. Defaults to `JitterMode.FULL`.
+        max_elapsed_time (float, optional): The maximum time (in seconds) from the first attempt. If the next attempt
+        can not start before this deadline, the operation is not retried. Defaults to None (no deadline).
+        retry_on (tuple of types or callable, optional): Only the errors that match this are retried. It can be an
+        exception (or ErrorDetail) type, a tuple of types or a function that takes the error and returns a boolean.
+        Defaults to None (all errors are retried).
+    """
+    base_delay: float
+    max_delay: float
+    multiplier: float
+    jitter: JitterMode
+    max_elapsed_time: Optional[float]
+    retry_on: Optional[Union[Tuple[Type, ...], Callable[[Any], bool]]]
+
+    def __init__(self, base_delay: float = 0.1, max_delay: float = 10, multiplier: float = 2,
+                 jitter: JitterMode = JitterMode.FULL, max_elapsed_time: Optional[float] = None,
+                 retry_on: Optional[Union[Type, Tuple[Type, ...], Callable[[Any], bool]]] = None):
+        """
+        Initializes a new instance of the RetryPolicy class.
+
+        :raises ValueError: If the delays are negative, multiplier is less than 1 or jitter is not a JitterMode.
+        """
+        if base_delay < 0 or max_delay < 0:
+            raise ValueError("The delays can not be negative")
+        if multiplier < 1:
+            raise ValueError("multiplier must be greater than or equal to 1")
+        if not isinstance(jitter, JitterMode):
+            raise ValueError("jitter must be an instance of JitterMode")
+        if isinstance(retry_on, type):
+            retry_on = (retry_on,)
+        if retry_on is not None and not isinstance(retry_on, tuple) and not callable(retry_on):
+            raise ValueError("retry_on must be a type, a tuple of types or a function")
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_elapsed_time = max_elapsed_time
+        self.retry_on = retry_on
+
+    def should_retry(self, error: Any) -> bool:
+        """
+        Checks whether the operation should be retried after the given error.
+
+        :param error: The exception or error detail of the failed attempt. It can be None.
+        :return: True if the error matches `retry_on`, otherwise False.
+        """
+        if self.retry_on is None:
+            return True
+        if isinstance(self.retry_on, tuple):
+            return isinstance(error, self.retry_on)
+        return bool(self.retry_on(error))
+
+    def get_delay(self, attempt: int, previous_delay: Optional[float] = None) -> float:
+        """
+        Calculates the delay before the next attempt.
+
+        :param attempt: The number of the attempt that failed (starts from 1)
+        :type attempt: int
+        :param previous_delay: The previous delay. It is used by the decorrelated jitter.
+        :type previous_delay: Optional[float]
+        :return: The delay in seconds.
+        """
+        if self.jitter == JitterMode.DECORRELATED:
+            previous_delay = previous_delay if previous_delay else self.base_delay
+            return min(self.max_delay, random.uniform(self.base_delay, previous_delay * 3))
+
+        delay = min(self.max_delay, self.base_delay * (self.multiplier ** (attempt - 1)))
+        if self.jitter == JitterMode.FULL:
+            return random.uniform(0, delay)
+        return delay
+
+    def get_next_delay(self, attempt: int, error: Any, started_at: float,
+                       previous_delay: Optional[float] = None) -> Optional[float]:
+        """
+        Returns the delay before the next attempt or None if the operation should not be retried.
+
+        :param attempt: The number of the attempt that failed (starts from 1)
+        :param error: The exception or error detail of the failed attempt
+        :param started_at: The `time.monotonic()` value of the start of the first attempt
+        :param previous_delay: The previous delay
+        """
+        if not self.should_retry(error):
+            return None
+        delay = self.get_delay(attempt, previous_delay)
+        if self.max_elapsed_time is not None and time.monotonic() - started_at + delay > self.max_elapsed_time:
+            return None
+        return delay
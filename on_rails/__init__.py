@@ -1,4 +1,14 @@
+from on_rails._utility import (ArityCacheInfo, arity_cache_clear,
+                               arity_cache_info)
+from on_rails.AsyncResult import *
+from on_rails.BreakRailsMode import *
+from on_rails.CircuitBreaker import *
 from on_rails.decorator import *
+from on_rails.gather import *
+from on_rails.MetricsRegistry import *
+from on_rails.Pipeline import *
 from on_rails.Result import *
+from on_rails.ResultCache import *
 from on_rails.ResultDetail import *
+from on_rails.RetryPolicy import *
 from on_rails.test_helpers import *
@@ -0,0 +1,243 @@
+import functools
+import itertools
+import os
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from typing import (Any, Callable, Deque, Iterable, Iterator, List, Optional,
+                    Tuple)
+
+from on_rails.ResultDetail import ResultDetail
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.RetryPolicy import RetryPolicy
+
+
+class _ResultBatchMixin:
+    """ The methods of `Result` that combine many results or produce them in parallel. """
+    __slots__ = ()
+
+    @classmethod
+    def all(cls, results: Iterable[Any]):
+        """
+        Checks that all the results are successful. It stops at the first failed result.
+
+        :param results: An iterable (like a generator) of results. The other values are converted with
+        `convert_to_result`.
+        :type results: Iterable[Any]
+        :return: The first failed result or an empty successful result if all of them are successful.
+        """
+        for result in results:
+            result = cls.convert_to_result(result)
+            if not result.success:
+                return result
+        return cls.ok()
+
+    @classmethod
+    def any(cls, results: Iterable[Any]):
+        """
+        Checks that at least one of the results is successful. It stops at the first successful result.
+
+        :param results: An iterable (like a generator) of results. The other values are converted with
+        `convert_to_result`.
+        :type results: Iterable[Any]
+        :return: An empty successful result if one of the results is successful, otherwise a failed result that
+        contains the details of all the failed results in the more_data field.
+        """
+        result = cls.first_success(results)
+        return cls.ok() if result.success else result
+
+    @classmethod
+    def first_success(cls, results: Iterable[Any]):
+        """
+        Returns the first successful result. It stops at the first successful result.
+
+        :param results: An iterable (like a generator) of results. The other values are converted with
+        `convert_to_result`.
+        :type results: Iterable[Any]
+        :return: The first successful result, otherwise a failed result that contains the details of all the failed
+        results in the more_data field.
+        """
+        errors = []
+        for result in results:
+            result = cls.convert_to_result(result)
+            if result.success:
+                return result
+            errors.append(result.detail)
+        return cls.fail(_aggregate_errors(errors, len(errors)))
+
+    @classmethod
+    def partition(cls, results: Iterable[Any]) -> Tuple[List[Any], List[Optional[ResultDetail]]]:
+        """
+        Splits the results into the values of the successful results and the details of the failed results.
+
+        :param results: An iterable (like a generator) of results. The other values are converted with
+        `convert_to_result`.
+        :type results: Iterable[Any]
+        :return: A tuple of the list of values and the list of error details. The order of the results is kept.
+        """
+        values = []
+        errors = []
+        for result in results:
+            result = cls.convert_to_result(result)
+            if result.success:
+                values.append(result.value)
+            else:
+                errors.append(result.detail)
+        return values, errors
+
+    @classmethod
+    def collect(cls, results: Iterable[Any], fail_fast: bool = False):
+        """
+        Collects the values of the results.
+
+        :param results: An iterable (like a generator) of results. The other values are converted with
+        `convert_to_result`.
+        :type results: Iterable[Any]
+        :param fail_fast: If it is True, it stops at the first failed result and returns it. Otherwise, all the
+        results are checked and the details of the failed results are aggregated. Defaults to False.
+        :type fail_fast: bool
+        :return: A successful result with the list of values if all of them are successful, otherwise a failed result.
+        """
+        values = []
+        errors = []
+        num_of_results = 0
+        for result in results:
+            result = cls.convert_to_result(result)
+            num_of_results += 1
+            if result.success:
+                if not errors:
+                    values.append(result.value)
+                continue
+            if fail_fast:
+                return result
+            if not errors:
+                values = None  # The values are not needed anymore
+            errors.append(result.detail)
+
+        if errors:
+            return cls.fail(_aggregate_errors(errors, num_of_results))
+        return cls.ok(values)
+
+    @staticmethod
+    def map_parallel(func: Callable, items: Iterable[Any], max_workers: Optional[int] = None,
+                     num_of_try: int = 1, try_only_on_exceptions: bool = True,
+                     retry_policy: Optional[RetryPolicy] = None, ordered: bool = True) -> Iterator['Result']:
+        """
+        Executes the function for each item in a thread pool and yields the results.
+        Each item is executed like `try_func(lambda: func(item), ...)`, so the retries and the break rails are
+        managed the same way. Like `on_success`, the function can take the item as an optional argument.
+
+        The items are read lazily and at most `2 * max_workers` items (chunks in `map_processes`) are submitted at the
+        same time, so it can be used for large iterables. When the iterator is closed, the items that are not started are cancelled.
+
+        :param func: The function that takes an item (optional)
+        :param items: The input items
+        :param max_workers: The maximum number of threads. Defaults to the default of `ThreadPoolExecutor`.
+        :param num_of_try: The number of attempts for each item. Defaults to 1.
+        :param try_only_on_exceptions: See `try_func`. Defaults to True.
+        :param retry_policy: See `try_func`. Defaults to None.
+        :param ordered: If it is True, the results are yielded in the order of the items, otherwise in the order of
+        completion. Defaults to True.
+        :return: An iterator of results.
+        :raises ValueError: If max_workers is less than 1.
+        """
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than 0")
+
+        call_chunk = functools.partial(_map_chunk, func, num_of_try=num_of_try,
+                                       try_only_on_exceptions=try_only_on_exceptions, retry_policy=retry_policy)
+        return _map_in_executor(ThreadPoolExecutor, max_workers, call_chunk, _split_to_chunks(items, 1), ordered)
+
+    @staticmethod
+    def map_processes(func: Callable, items: Iterable[Any], max_workers: Optional[int] = None, chunksize: int = 1,
+                      num_of_try: int = 1, try_only_on_exceptions: bool = True,
+                      retry_policy: Optional[RetryPolicy] = None, ordered: bool = True) -> Iterator['Result']:
+        """
+        Executes the function for each item in a process pool and yields the results. It is like `map_parallel` but
+        CPU-bound functions are not limited by the GIL.
+
+        The function, the items and the retry policy must be picklable (e.g. the function must be defined at the top
+        level of a module). The results are sent back in the pickled form of Result, so the stack traces of the
+        error details are dropped and the exceptions that can not be pickled are replaced with `RemoteException`.
+
+        :param func: The function that takes an item (optional)
+        :param items: The input items
+        :param max_workers: The maximum number of processes. Defaults to the number of CPUs.
+        :param chunksize: The number of items that are sent to a process together. Bigger chunks reduce the
+        overhead of the inter-process communication for small functions. Defaults to 1.
+        :param num_of_try: The number of attempts for each item. Defaults to 1.
+        :param try_only_on_exceptions: See `try_func`. Defaults to True.
+        :param retry_policy: See `try_func`. Defaults to None.
+        :param ordered: If it is True, the results are yielded in the order of the items, otherwise in the order of
+        completion. Defaults to True.
+        :return: An iterator of results.
+        :raises ValueError: If max_workers or chunksize is less than 1.
+        """
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than 0")
+        if chunksize < 1:
+            raise ValueError("chunksize must be greater than 0")
+
+        call_chunk = functools.partial(_map_chunk, func, num_of_try=num_of_try,
+                                       try_only_on_exceptions=try_only_on_exceptions, retry_policy=retry_policy)
+        return _map_in_executor(ProcessPoolExecutor, max_workers, call_chunk, _split_to_chunks(items, chunksize),
+                                ordered)
+
+
+def _map_chunk(func: Callable, chunk: List[Any], num_of_try: int, try_only_on_exceptions: bool,
+               retry_policy: Optional[RetryPolicy]) -> List[Any]:
+    from on_rails._retries import \
+        _call_func  # pylint: disable=import-outside-toplevel,cyclic-import
+
+    return [_call_func(func, [item], num_of_try, try_only_on_exceptions, retry_policy=retry_policy) for item in chunk]
+
+
+def _map_in_executor(executor_type: type, max_workers: int, call_chunk: Callable,
+                     chunks: Iterable[List[Any]], ordered: bool) -> Iterator['Result']:
+    executor = executor_type(max_workers=max_workers)
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(call_chunk, chunk))
+            if len(pending) >= max_workers * 2:
+                yield from _pop_completed(pending, ordered)
+        while pending:
+            yield from _pop_completed(pending, ordered)
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown()
+
+
+def _pop_completed(pending: Deque[Future], ordered: bool) -> Iterator['Result']:
+    if ordered:
+        yield from pending.popleft().result()
+        return
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+    for future in done:
+        yield from future.result()
+
+
+def _split_to_chunks(items: Iterable[Any], chunksize: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _aggregate_errors(errors: List[Optional[ResultDetail]], num_of_results: int) -> ErrorDetail:
+    message = f"{len(errors)} of {num_of_results} results failed. " \
+              f"The details of the failed results are stored in the more_data field. "
+    exception = next((error.exception for error in errors
+                      if isinstance(error, ErrorDetail) and error.exception is not None), None)
+    if exception is not None:
+        message += "At least one of the errors has an exception, the first exception being stored in the exception field."
+    return ErrorDetail(message=message, exception=exception, more_data=errors)
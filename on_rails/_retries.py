@@ -0,0 +1,322 @@
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from on_rails import instrument
+from on_rails._utility import (AttemptTimeoutError, await_with_timeout,
+                               call_with_timeout, generate_error,
+                               generate_timeout_error, get_attempt_timeout,
+                               get_num_of_function_parameters, is_func_valid)
+from on_rails.Result import BreakFunctionException, BreakRailsException, Result
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.Errors.ValidationError import ValidationError
+from on_rails.RetryPolicy import RetryPolicy
+
+
+def try_func(func: Callable, num_of_try: int = 1, try_only_on_exceptions: bool = True,
+             none_means_success: bool = True, retry_policy: Optional[RetryPolicy] = None,
+             timeout: Optional[float] = None, deadline: Optional[float] = None) -> Result:
+    """
+    The function `try_func` attempts to execute a given function with a specified number of tries and handles errors.
+
+    :param func: The input function that needs to be executed
+    :param num_of_try: The number of times the input function will be attempted to execute in case of failure. The default
+    value is 1, meaning the function will be executed only once by default, defaults to 1 (optional)
+    :return: a `Result` object. The `Result` object can either be a successful result or a failed result with an
+    `ValidationError` object containing information about the error.
+
+    :param try_only_on_exceptions: A boolean parameter that determines whether the function should only be retried if an
+    exception is raised. If set to True, the function will only be retried if an exception is raised. If set to False, the
+    function will be retried regardless of whether an exception is raised or Result is not success, defaults to True
+    :type try_only_on_exceptions: bool (optional)
+
+    :param none_means_success: A boolean parameter that determines whether a `None` output should be considered a
+        success or a failure. If `none_means_success` is `True`, then a `None` output will be considered a success and the
+        function will return a `Result.ok()` instance. If `none_means_success` is, defaults to True
+    :type none_means_success: bool (optional)
+
+    :param retry_policy: The policy of waiting between the attempts (backoff, jitter, deadline and the errors that
+    should be retried). Defaults to None (retry immediately).
+    :type retry_policy: Optional[RetryPolicy]
+
+    :param timeout: The maximum time (in seconds) of each attempt. If it is given, each attempt runs on a bounded
+    thread pool that is shared by the timed attempts and it is abandoned (not killed) when the time is over. The time
+    counts from the start of the attempt; if no worker becomes free in that time, the attempt fails with
+    `AttemptRejectedError` (see `call_with_timeout`). Defaults to None (no timeout).
+    :type timeout: Optional[float]
+
+    :param deadline: The maximum time (in seconds) of all the attempts, including the delays between them.
+    Defaults to None (no deadline).
+    :type deadline: Optional[float]
+
+    :return: a `Result` object. If the last attempt timed out, the detail is a `GatewayTimeoutError` (code 504).
+    """
+
+    result = _get_num_of_valid_function_parameters(func)
+    if not result.success:
+        return result
+    num_of_function_params = result.value
+
+    if num_of_function_params > 0:
+        return Result.fail(ValidationError(
+            message=f"{func.__name__}() takes {num_of_function_params} arguments. It cannot be executed."))
+
+    return _call_with_retries(func, (), {}, num_of_try, try_only_on_exceptions, none_means_success, retry_policy,
+                              timeout, deadline)
+
+
+class _Retries:
+    """ The state of the attempts of a retry loop: the number of the attempts, their errors and the deadline. """
+    __slots__ = ('num_of_try', 'errors', 'num_of_attempts', 'started_at', 'deadline_at', '_delay', '_error')
+
+    def __init__(self, num_of_try: int, deadline: Optional[float]):
+        self.num_of_try = num_of_try
+        self.errors: List[Any] = []
+        self.num_of_attempts = 0
+        self.started_at = time.monotonic()
+        self.deadline_at = self.started_at + deadline if deadline is not None else None
+        self._delay = None
+        self._error = None
+
+    def start_attempt(self) -> bool:
+        """ Starts the next attempt. Returns False if no attempt is left. """
+        if self.num_of_attempts >= self.num_of_try:
+            return False
+        self.num_of_attempts += 1
+        return True
+
+    def add_error(self, error: Any) -> None:
+        """ Records the error of the current attempt: the exception or the detail (if any) of the failed result. """
+        self._error = error
+        if error:
+            self.errors.append(error)
+
+    def get_next_delay(self, retry_policy: Optional[RetryPolicy]) -> Optional[float]:
+        """ Returns the delay before the next attempt or None if there is no next attempt. """
+        if self.num_of_attempts >= self.num_of_try:
+            return None
+        if self.deadline_at is not None and time.monotonic() >= self.deadline_at:
+            return None
+        if retry_policy is None:
+            return 0
+        delay = retry_policy.get_next_delay(self.num_of_attempts, self._error, self.started_at, self._delay)
+        if delay is None or (self.deadline_at is not None and time.monotonic() + delay >= self.deadline_at):
+            return None
+        self._delay = delay
+        return delay
+
+    def get_error_result(self) -> 'Result':
+        """ Returns the failed result of the operation. It is a timeout error if the last attempt timed out. """
+        if isinstance(self._error, AttemptTimeoutError):
+            return Result.fail(generate_timeout_error(self.errors, self.num_of_attempts, self._error))
+        return Result.fail(generate_error(self.errors, self.num_of_attempts))
+
+
+def _call_with_retries(func: Callable, args: Tuple[Any, ...], kwargs: Dict[str, Any], num_of_try: int,
+                       try_only_on_exceptions: bool, none_means_success: bool, retry_policy: Optional[RetryPolicy],
+                       timeout: Optional[float], deadline: Optional[float], step: str = 'try_func') -> Result:
+    """ The retry loop of `try_func`. The function is called with the arguments without any validation. """
+    observer = instrument._observer  # pylint: disable=protected-access
+    if observer is not None:
+        func = instrument.observe(observer, step, func, _get_success_checker(none_means_success))
+    retries = _Retries(num_of_try, deadline)
+    while retries.start_attempt():
+        try:
+            result = call_with_timeout(func, get_attempt_timeout(timeout, retries.deadline_at), args, kwargs)
+            result = Result.convert_to_result(result, none_means_success=none_means_success)
+            if result.success or try_only_on_exceptions:
+                return result._get_unbroken()  # pylint: disable=protected-access
+            retries.add_error(result.detail)
+        except BreakFunctionException:
+            raise  # Must be captured and managed in @def_result decorator.
+        except BreakRailsException as e:
+            return e.result
+        except Exception as e:
+            retries.add_error(e)
+
+        delay = retries.get_next_delay(retry_policy)
+        if delay is None:
+            break
+        if delay:
+            time.sleep(delay)
+    return retries.get_error_result()
+
+
+async def try_func_async(func_async: Callable, num_of_try: int = 1, try_only_on_exceptions: bool = True,
+                         none_means_success: bool = True, retry_policy: Optional[RetryPolicy] = None,
+                         timeout: Optional[float] = None, deadline: Optional[float] = None) -> Result:
+    """
+    The function `try_func` attempts to execute a given function with a specified number of tries and handles errors.
+
+    :param func_async: The input function that needs to be executed
+    :param num_of_try: The number of times the input function will be attempted to execute in case of failure. The default
+    value is 1, meaning the function will be executed only once by default, defaults to 1 (optional)
+    :return: a `Result` object. The `Result` object can either be a successful result or a failed result with an
+    `ValidationError` object containing information about the error.
+
+    :param try_only_on_exceptions: A boolean parameter that determines whether the function should only be retried if an
+    exception is raised. If set to True, the function will only be retried if an exception is raised. If set to False, the
+    function will be retried regardless of whether an exception is raised or Result is not success, defaults to True
+    :type try_only_on_exceptions: bool (optional)
+
+    :param none_means_success: A boolean parameter that determines whether a `None` output should be considered a
+        success or a failure. If `none_means_success` is `True`, then a `None` output will be considered a success and the
+        function will return a `Result.ok()` instance. If `none_means_success` is, defaults to True
+    :type none_means_success: bool (optional)
+
+    :param retry_policy: The policy of waiting between the attempts (backoff, jitter, deadline and the errors that
+    should be retried). Defaults to None (retry immediately).
+    :type retry_policy: Optional[RetryPolicy]
+
+    :param timeout: The maximum time (in seconds) of each attempt. The awaitable of each attempt is awaited with
+    `asyncio.wait_for`, so it is cancelled when the time is over. Defaults to None (no timeout).
+    :type timeout: Optional[float]
+
+    :param deadline: The maximum time (in seconds) of all the attempts, including the delays between them.
+    Defaults to None (no deadline).
+    :type deadline: Optional[float]
+
+    :return: a `Result` object. If the last attempt timed out, the detail is a `GatewayTimeoutError` (code 504).
+    """
+
+    result = _get_num_of_valid_function_parameters(func_async)
+    if not result.success:
+        return result
+    num_of_function_params = result.value
+
+    if num_of_function_params > 0:
+        return Result.fail(ValidationError(
+            message=f"{func_async.__name__}() takes {num_of_function_params} arguments. It cannot be executed."))
+
+    return await _call_with_retries_async(func_async, (), {}, num_of_try, try_only_on_exceptions, none_means_success,
+                                          retry_policy, timeout, deadline)
+
+
+async def _call_with_retries_async(func_async: Callable, args: Tuple[Any, ...], kwargs: Dict[str, Any],
+                                   num_of_try: int, try_only_on_exceptions: bool, none_means_success: bool,
+                                   retry_policy: Optional[RetryPolicy], timeout: Optional[float],
+                                   deadline: Optional[float], step: str = 'try_func_async') -> Result:
+    """ The retry loop of `try_func_async`. The function is called with the arguments without any validation. """
+    observer = instrument._observer  # pylint: disable=protected-access
+    if observer is not None:
+        func_async = instrument.observe_async(observer, step, func_async, _get_success_checker(none_means_success))
+    retries = _Retries(num_of_try, deadline)
+    while retries.start_attempt():
+        try:
+            result = func_async(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await await_with_timeout(result, get_attempt_timeout(timeout, retries.deadline_at))
+            result = Result.convert_to_result(result, none_means_success=none_means_success)
+            if result.success or try_only_on_exceptions:
+                return result._get_unbroken()  # pylint: disable=protected-access
+            retries.add_error(result.detail)
+        except BreakFunctionException:
+            raise  # Must be captured and managed in @def_result decorator.
+        except BreakRailsException as e:
+            return e.result
+        except Exception as e:
+            retries.add_error(e)
+
+        delay = retries.get_next_delay(retry_policy)
+        if delay is None:
+            break
+        if delay:
+            await asyncio.sleep(delay)
+    return retries.get_error_result()
+
+
+def _get_success_checker(none_means_success: bool) -> Callable[[Any], bool]:
+    return lambda output: Result.convert_to_result(output, none_means_success=none_means_success).success
+
+
+def _get_num_of_function_parameters(func: Callable):
+    try:
+        return Result.ok(get_num_of_function_parameters(func))
+    except Exception:
+        return Result.fail(ErrorDetail(title="Function Parameter Detection Error",
+                                       message=f"Can not recognize the number of function ({func.__name__}) "
+                                               f"parameters. You can wrap your built-in function with a python "
+                                               f"function like `lambda`.", code=400))
+
+
+def _get_num_of_valid_function_parameters(func: Callable) -> Result:
+    """
+    Returns the number of parameters of the function or a failed result if the function is not valid or its
+    parameters can not be detected.
+    """
+    if not is_func_valid(func):
+        return Result.fail(ValidationError(message="The input function is not valid."))
+    return _get_num_of_function_parameters(func)
+
+
+def _get_func_args(func: Callable, optional_args: Optional[List[Any]]) -> Union[Tuple[Any, ...], Result]:
+    """
+    Returns the arguments of the function (the first items of optional_args that it takes) or a failed result if the
+    function can not be called with them.
+    """
+    result = _get_num_of_valid_function_parameters(func)
+    if not result.success:
+        return result
+    num_of_function_params = result.value
+
+    optional_args = optional_args if optional_args else []
+
+    if num_of_function_params > len(optional_args):
+        return Result.fail(ValidationError(
+            message=f"{func.__name__}() takes {num_of_function_params} arguments. It cannot be executed. "
+                    f"maximum of {len(optional_args)} parameters is acceptable."))
+    return tuple(optional_args[:num_of_function_params])
+
+
+def _get_constant_condition(condition_or_func: Union[Callable, bool]) -> Optional[Result]:
+    """
+    Returns the result of a boolean (or an invalid) condition or None if the condition is a function.
+    """
+    if isinstance(condition_or_func, bool):
+        return Result.ok(condition_or_func)
+    if not callable(condition_or_func):
+        return Result.fail(ValidationError(message=f"The condition only can be a function or a boolean. "
+                                                   f"{type(condition_or_func).__name__} is not acceptable."))
+    return None
+
+
+def _get_condition_result(result: Result) -> Result:
+    """
+    Returns the result of a condition from the result of its function. The condition is true unless the function
+    fails or returns False.
+    """
+    if not result.success:
+        return result
+    if result.value is not None and isinstance(result.value, bool):
+        return Result.ok(result.value)
+    return Result.ok(True)
+
+
+def _call_func(func: Callable, optional_args: Optional[List[Any]] = None, num_of_try: int = 1,
+               try_only_on_exceptions: bool = False, none_means_success: bool = True,
+               retry_policy: Optional[RetryPolicy] = None, step: str = 'try_func') -> Result:
+    """
+    Calls the function with the first items of optional_args that it takes in the retry loop of `try_func`.
+    """
+    args = _get_func_args(func, optional_args)
+    if isinstance(args, Result):
+        return args  # The function can not be called
+    return _call_with_retries(func, args, {}, num_of_try,
+                              try_only_on_exceptions, none_means_success, retry_policy, None, None, step)
+
+
+def _is_condition_pass(condition_or_func: Union[Callable, bool], optional_args: Optional[List[Any]] = None,
+                       num_of_try: int = 1, try_only_on_exceptions: bool = True, step: str = 'try_func') -> Result:
+    """
+    This function checks if a given condition or function is true or false and returns a result accordingly.
+    If `condition_or_func` is a boolean value, it returns condition.
+    If `condition_or_func` is a callable function, it calls the function, then if function fails, returns error result,
+    otherwise checks the value of result function. if it exists and be boolean value, it returns value,
+    otherwise returns True.
+    """
+    result = _get_constant_condition(condition_or_func)
+    if result is not None:
+        return result
+    return _get_condition_result(
+        _call_func(condition_or_func, optional_args, num_of_try, try_only_on_exceptions, step=step))
@@ -0,0 +1,48 @@
+from on_rails.Result import Result
+
+
+class _FrozenResult(Result):
+    """
+    A result that can not be changed. It is used for the shared empty results.
+    """
+    __slots__ = ()
+
+    _is_frozen = True
+
+    def __init__(self, success: bool):  # pylint: disable=super-init-not-called
+        object.__setattr__(self, 'success', success)
+        object.__setattr__(self, 'detail', None)
+        object.__setattr__(self, 'value', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"The shared empty result can not be changed. "
+                             f"Use Result({self.success}) to create a new one.")
+
+    def __delattr__(self, name):
+        raise AttributeError("The shared empty result can not be changed.")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return _get_empty_result, (self.success,)
+
+
+class _BrokenResult(Result):
+    """
+    A result whose rails are broken in `BreakRailsMode.SENTINEL` mode.
+    """
+    __slots__ = ()
+
+    _is_broken = True
+
+
+_EMPTY_OK = _FrozenResult(True)
+_EMPTY_FAIL = _FrozenResult(False)
+
+
+def _get_empty_result(success: bool) -> Result:
+    return _EMPTY_OK if success else _EMPTY_FAIL
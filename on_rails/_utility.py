@@ -1,23 +1,157 @@
 import asyncio
 import inspect
+import threading
+import time
+import types
+import weakref
 from asyncio import AbstractEventLoop
-from typing import Any, Callable, Coroutine, List
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import (Any, Callable, Coroutine, Dict, List, NamedTuple, Optional,
+                    Tuple)
 
 from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.Errors.GatewayTimeoutError import \
+    GatewayTimeoutError
+
+
+class ArityCacheInfo(NamedTuple):
+    """ Statistics of the function arity cache. """
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _ArityCache:
+    """
+    A bounded, weak-keyed cache for the number of function parameters.
+
+    Plain python functions and lambdas are keyed on their code object, so a lambda that is created on every call
+    still hits the cache. Bound methods are keyed on the code (or object) of the underlying function.
+    Other callables (`functools.partial`, builtins, callable objects) are keyed on the object itself.
+    It is thread safe: the entries and the statistics are changed under a lock.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._functions = weakref.WeakKeyDictionary()
+        self._bound_methods = weakref.WeakKeyDictionary()
+        self._others = weakref.WeakKeyDictionary()
+
+    def get(self, func: Callable) -> Optional[int]:
+        """
+        Returns the cached number of parameters of the function or None if it is not cached.
+        """
+        store, key = self._get_store_and_key(func)
+        with self._lock:
+            try:
+                value = store.get(key)
+            except TypeError:  # The key is not hashable or not weak referencable
+                value = None
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, func: Callable, value: int) -> None:
+        """
+        Stores the number of parameters of the function. The maxsize bounds the entries of all the kinds of callables
+        together. If the cache is full, the oldest entry of the same kind (or of another kind if there is none) will
+        be removed.
+        """
+        store, key = self._get_store_and_key(func)
+        with self._lock:
+            try:
+                if key not in store and self._get_size() >= self.maxsize:
+                    victim = store if len(store) > 0 else next(item for item in self._get_stores() if len(item) > 0)
+                    del victim[next(iter(victim.keys()))]
+                store[key] = value
+            except (TypeError, StopIteration):
+                pass  # The key can not be cached
+
+    def info(self) -> ArityCacheInfo:
+        """
+        Returns the statistics of the cache. The currsize is never greater than the maxsize.
+        """
+        with self._lock:
+            return ArityCacheInfo(self.hits, self.misses, self.maxsize, self._get_size())
+
+    def clear(self) -> None:
+        """
+        Removes all the entries and resets the statistics.
+        """
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            for store in self._get_stores():
+                store.clear()
+
+    def _get_stores(self) -> Tuple[weakref.WeakKeyDictionary, ...]:
+        return self._functions, self._bound_methods, self._others
+
+    def _get_size(self) -> int:
+        return len(self._functions) + len(self._bound_methods) + len(self._others)
+
+    def _get_store_and_key(self, func: Callable):
+        if isinstance(func, types.FunctionType):
+            if _is_plain_function(func):
+                return self._functions, func.__code__
+            return self._others, func
+        if isinstance(func, types.MethodType):
+            inner = func.__func__
+            if isinstance(inner, types.FunctionType) and _is_plain_function(inner):
+                return self._bound_methods, inner.__code__
+            return self._bound_methods, inner
+        return self._others, func
+
+
+def _is_plain_function(func: types.FunctionType) -> bool:
+    # The signature of wrapped functions (like functools.wraps) is not only related to the code object.
+    return '__wrapped__' not in func.__dict__ and '__signature__' not in func.__dict__
+
+
+_ARITY_CACHE = _ArityCache()
 
 
 def get_num_of_function_parameters(func: Callable) -> int:
     """
     Returns the number of parameters of a given function.
+    The result is cached, so the function signature is only inspected once for each function.
 
     :param func: The `func` is a function object for which we want to determine the number of parameters it
     takes
     :return: Returns the number of parameters that the function takes.
     """
+    num_of_params = _ARITY_CACHE.get(func)
+    if num_of_params is not None:
+        return num_of_params
+
     try:
-        return len(inspect.signature(func).parameters)
+        num_of_params = len(inspect.signature(func).parameters)
     except ValueError:
-        return func.__code__.co_argcount
+        num_of_params = func.__code__.co_argcount
+    _ARITY_CACHE.set(func, num_of_params)
+    return num_of_params
+
+
+def arity_cache_info() -> ArityCacheInfo:
+    """
+    Returns the statistics of the function arity cache that is used by `get_num_of_function_parameters`.
+
+    :return: An `ArityCacheInfo` with hits, misses, maxsize and currsize fields.
+    """
+    return _ARITY_CACHE.info()
+
+
+def arity_cache_clear() -> None:
+    """
+    Clears the function arity cache and its statistics.
+    """
+    _ARITY_CACHE.clear()
 
 
 def is_async(func: Callable):
@@ -31,18 +165,20 @@ def is_async(func: Callable):
     return asyncio.iscoroutinefunction(func) if func else False
 
 
-def await_func(func: callable):
+def await_func(func: callable, /, *args, **kwargs):
     """
     Checks if the result of a function is a coroutine and runs it using asyncio if it is.
 
     :param func: The parameter `func` is a function that will be called and its result will be checked if it is a coroutine
     or not. If it is a coroutine, it will be run using the asyncio event loop until it completes and its result will be
     returned. If it is not a coroutine, its result will be returned as is.
+    :param args: The positional arguments of the function
+    :param kwargs: The keyword arguments of the function. `func` is positional-only, so they can contain a `func` key.
     :return: Returns the result of the input function `func`. If the result is an instance of
     `Coroutine`, it will be run using the `asyncio` event loop until it completes, and the final result will be returned.
     Otherwise, the original result will be returned.
     """
-    result = func()
+    result = func(*args, **kwargs)
     if isinstance(result, Coroutine):
         return get_loop().run_until_complete(result)
     return result
@@ -75,6 +211,92 @@ def generate_error(errors: List[Any], num_of_try: int) -> ErrorDetail:
     return ErrorDetail(message=message)
 
 
+def generate_timeout_error(errors: List[Any], num_of_try: int, timeout_error: TimeoutError) -> GatewayTimeoutError:
+    """
+    Generates the error detail of an operation whose last attempt timed out.
+
+    :param errors: The list of errors that occurred during the operation.
+    :param num_of_try: The number of attempts made to perform the operation
+    :param timeout_error: The timeout exception of the last attempt. It is stored in the exception field.
+    """
+    message = f"Operation timed out with {num_of_try} attempts. " \
+              f"The details of the {len(errors)} errors are stored in the more_data field."
+    return GatewayTimeoutError(message=message, exception=timeout_error, more_data=errors)
+
+
+class AttemptTimeoutError(TimeoutError):
+    """ Raised when an attempt of an operation does not complete in the given time. """
+
+
+class AttemptRejectedError(RuntimeError):
+    """ Raised when no worker of the timed attempts becomes free in the given time to run an attempt. """
+
+
+_timeout_executor: Optional[ThreadPoolExecutor] = None
+_timeout_executor_lock = threading.Lock()
+
+
+def _get_timeout_executor() -> ThreadPoolExecutor:
+    global _timeout_executor  # pylint: disable=global-statement
+    with _timeout_executor_lock:
+        if _timeout_executor is None:
+            # The default number of workers of ThreadPoolExecutor (min(32, cpu_count + 4)) bounds the threads.
+            _timeout_executor = ThreadPoolExecutor(thread_name_prefix='on_rails_timeout')
+        return _timeout_executor
+
+
+def call_with_timeout(func: Callable, timeout: Optional[float], args: Tuple[Any, ...] = (),
+                      kwargs: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Calls the function with `await_func`. If a timeout is given, the function runs on a bounded thread pool that is
+    shared by all the timed attempts and `AttemptTimeoutError` is raised if it does not complete in time. Python
+    threads can not be killed, so the function keeps its worker busy until it returns and its output is ignored.
+    The time counts from the start of the function. When all the workers are busy (for example, with abandoned
+    attempts of a hung function), the attempt waits for a worker up to the same time and then `AttemptRejectedError`
+    is raised. The workers reuse their event loops (see `get_loop`) to run the coroutine functions.
+    """
+    kwargs = kwargs if kwargs is not None else {}
+    if timeout is None:
+        return await_func(func, *args, **kwargs)
+
+    started = threading.Event()
+
+    def run():
+        started.set()
+        return await_func(func, *args, **kwargs)
+
+    future = _get_timeout_executor().submit(run)
+    if not started.wait(timeout) and future.cancel():
+        raise AttemptRejectedError(f"No worker was free to run the attempt in {timeout:g} seconds. "
+                                   f"All the workers of the timed attempts are busy.")
+    done, _ = wait((future,), timeout)
+    if not done:
+        raise AttemptTimeoutError(f"The attempt did not complete in {timeout:g} seconds.")
+    return future.result()
+
+
+async def await_with_timeout(awaitable: Any, timeout: Optional[float]) -> Any:
+    """
+    Awaits the awaitable with `asyncio.wait_for`. `AttemptTimeoutError` is raised if it does not complete in time.
+    """
+    if timeout is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        raise AttemptTimeoutError(f"The attempt did not complete in {timeout:g} seconds.") from None
+
+
+def get_attempt_timeout(timeout: Optional[float], deadline_at: Optional[float]) -> Optional[float]:
+    """
+    Returns the timeout of the next attempt based on the timeout of each attempt and the `time.monotonic()` deadline.
+    """
+    if deadline_at is None:
+        return timeout
+    remaining = max(0.0, deadline_at - time.monotonic())
+    return remaining if timeout is None else min(timeout, remaining)
+
+
 def is_func_valid(func):
     """
     Checks if a given input is a valid callable function or not.
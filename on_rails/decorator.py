@@ -1,7 +1,24 @@
-from on_rails.Result import BreakFunctionException, try_func, try_func_async
+import asyncio
+import functools
+import inspect
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
 
+from on_rails import _utility, instrument
+from on_rails.CircuitBreaker import CircuitBreaker
+from on_rails.MetricsRegistry import MetricsRegistry
+from on_rails.Result import (BreakFunctionException, BreakRailsException,
+                             Result, _call_with_retries,
+                             _call_with_retries_async, _get_success_checker)
+from on_rails.ResultCache import ResultCache, _copy_result
+from on_rails.RetryPolicy import RetryPolicy
 
-def def_result(is_async: bool = False, num_of_try: int = 1, try_only_on_exceptions: bool = True):
+
+def def_result(is_async: Optional[bool] = None, num_of_try: int = 1, try_only_on_exceptions: bool = True,
+               retry_policy: Optional[RetryPolicy] = None, timeout: Optional[float] = None,
+               deadline: Optional[float] = None, circuit_breaker: Optional[CircuitBreaker] = None,
+               cache: Optional[ResultCache] = None, single_flight: bool = False,
+               metrics: Optional[MetricsRegistry] = None):
     """
     A decorator that converts the output of a function into a Result type, and can handle both
     synchronous and asynchronous functions.
@@ -9,8 +26,9 @@ def def_result(is_async: bool = False, num_of_try: int = 1, try_only_on_exceptio
     Also, can be used to retry a function a specified number of times if it raises an exception or failed.
 
     :param is_async: A boolean flag indicating whether the decorated function is an asynchronous function or not. If set to
-    True, the decorator will return an asynchronous wrapper function, defaults to False
-    :type is_async: bool (optional)
+    True, the decorator will return an asynchronous wrapper function. Defaults to None, which means it is detected from
+    the function (coroutine functions get the asynchronous wrapper).
+    :type is_async: Optional[bool]
 
     :param num_of_try: The number of times the decorated function should be retried if it fails, defaults to 1
     :type num_of_try: int (optional)
@@ -19,23 +37,196 @@ def def_result(is_async: bool = False, num_of_try: int = 1, try_only_on_exceptio
     raised or for any error that occurs during operation. If set to True, the function will only be retried if an exception
     is raised. If set to False, the function will be retried for any error that occurs. defaults to True
     :type try_only_on_exceptions: bool (optional)
+
+    :param retry_policy: The policy of waiting between the attempts (backoff, jitter, deadline and the errors that
+    should be retried). Defaults to None (retry immediately).
+    :type retry_policy: Optional[RetryPolicy]
+
+    :param timeout: The maximum time (in seconds) of each attempt. See `try_func` and `try_func_async`.
+    Defaults to None (no timeout).
+    :type timeout: Optional[float]
+
+    :param deadline: The maximum time (in seconds) of all the attempts of a call. Defaults to None (no deadline).
+    :type deadline: Optional[float]
+
+    :param circuit_breaker: The circuit breaker that records the results of the calls. While it is open, the function
+    is not called and a failed result with `ServiceUnavailableError` is returned. Defaults to None.
+    :type circuit_breaker: Optional[CircuitBreaker]
+
+    :param cache: The cache that memoizes the results by the arguments of the function. The calls whose arguments
+    are not hashable are not cached. Defaults to None.
+    :type cache: Optional[ResultCache]
+
+    :param single_flight: If it is True, the concurrent calls of an async function with equal (hashable) arguments
+    share one execution and each of them receives its own copy of its result. Cancelling one of the callers does
+    not cancel the shared execution. Defaults to False.
+    :type single_flight: bool
+
+    :param metrics: The registry that records the number, the results and the latency of the calls and the attempts
+    of each call. Defaults to None.
+    :type metrics: Optional[MetricsRegistry]
+
+    :raises ValueError: If single_flight is True for a function that is not async.
     """
 
     def inner_decorator(func: callable):
-        def wrapper(*args, **kwargs):
+        use_async = _utility.is_async(func) if is_async is None else is_async
+        if single_flight and not use_async:
+            raise ValueError("single_flight is only supported for async functions")
+        if num_of_try == 1 and try_only_on_exceptions and not single_flight and \
+                all(option is None for option in (retry_policy, timeout, deadline, circuit_breaker, cache, metrics)):
+            return _make_fast_wrapper_async(func) if use_async else _make_fast_wrapper(func)
+        in_flight = {}
+        func_name = instrument.get_func_name(func)
+
+        def release_trial(permit):
+            # A cancelled (or interrupted) call has no result, so its trial is released.
+            if permit is not None:
+                circuit_breaker.release_trial(permit)
+
+        def store(result, key, permit):
+            if permit is not None:
+                circuit_breaker.record_result(result, permit)
+            if key is not None:
+                cache.put(key, result)
+            return result
+
+        def call(args, kwargs, key):
+            permit = circuit_breaker.allow_request() if circuit_breaker is not None else None
+            if circuit_breaker is not None and permit is None:
+                return circuit_breaker.get_open_result()
             try:
-                return try_func(lambda: func(*args, **kwargs),
-                                num_of_try=num_of_try, try_only_on_exceptions=try_only_on_exceptions)
+                result = _call_with_retries(_observe_attempts(func, metrics, False), args, kwargs, num_of_try,
+                                            try_only_on_exceptions, True, retry_policy, timeout, deadline,
+                                            'def_result')
             except BreakFunctionException as e:
-                return e.result
+                result = e.result
+            except BaseException:
+                release_trial(permit)
+                raise
+            return store(result, key, permit)
 
-        async def wrapper_async(*args, **kwargs):
+        async def call_async(args, kwargs, key):
+            permit = circuit_breaker.allow_request() if circuit_breaker is not None else None
+            if circuit_breaker is not None and permit is None:
+                return circuit_breaker.get_open_result()
             try:
-                return await try_func_async(lambda: func(*args, **kwargs),
-                                            num_of_try=num_of_try, try_only_on_exceptions=try_only_on_exceptions)
+                result = await _call_with_retries_async(_observe_attempts(func, metrics, True), args, kwargs,
+                                                        num_of_try, try_only_on_exceptions, True, retry_policy,
+                                                        timeout, deadline, 'def_result')
             except BreakFunctionException as e:
-                return e.result
+                result = e.result
+            except BaseException:
+                release_trial(permit)
+                raise
+            return store(result, key, permit)
+
+        def get_result(args, kwargs):
+            key = cache.make_key(args, kwargs) if cache is not None else None
+            if key is not None:
+                cached_result = cache.get(key)
+                if cached_result is not None:
+                    return cached_result
+            return call(args, kwargs, key)
+
+        async def get_result_async(args, kwargs):
+            key = cache.make_key(args, kwargs) if cache is not None else None
+            if key is not None:
+                cached_result = cache.get(key)
+                if cached_result is not None:
+                    return cached_result
+            if single_flight:
+                return await _call_single_flight(in_flight, call_async, args, kwargs, key)
+            return await call_async(args, kwargs, key)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if metrics is None:
+                return get_result(args, kwargs)
+            started_at = time.perf_counter_ns()
+            result = get_result(args, kwargs)
+            metrics.record_call(func_name, result, time.perf_counter_ns() - started_at)
+            return result
 
-        return wrapper_async if is_async else wrapper
+        @functools.wraps(func)
+        async def wrapper_async(*args, **kwargs):
+            if metrics is None:
+                return await get_result_async(args, kwargs)
+            started_at = time.perf_counter_ns()
+            result = await get_result_async(args, kwargs)
+            metrics.record_call(func_name, result, time.perf_counter_ns() - started_at)
+            return result
+
+        return wrapper_async if use_async else wrapper
 
     return inner_decorator
+
+
+def _observe_attempts(func: Callable, metrics: Optional[MetricsRegistry], use_async: bool) -> Callable:
+    """
+    Returns the function that sends its attempts to the registry, so the registry records them even when another
+    observer is installed. When the registry is the installed observer, the retry loop already sends them to it.
+    """
+    if metrics is None or instrument._observer is metrics:  # pylint: disable=protected-access
+        return func
+    observe = instrument.observe_async if use_async else instrument.observe
+    return observe(metrics, 'def_result', func, _IS_SUCCESS)
+
+
+def _make_fast_wrapper(func: Callable) -> Callable:
+    """ The wrapper of a function that is called once without any option. It is equal to `try_func` in this case. """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        observer = instrument._observer  # pylint: disable=protected-access
+        called = func if observer is None else instrument.observe(observer, 'def_result', func, _IS_SUCCESS)
+        try:
+            result = called(*args, **kwargs)
+            if inspect.iscoroutine(result):
+                result = _utility.get_loop().run_until_complete(result)
+            return Result.convert_to_result(result)._get_unbroken()  # pylint: disable=protected-access
+        except (BreakFunctionException, BreakRailsException) as e:
+            return e.result
+        except Exception as e:
+            return Result.fail(_utility.generate_error([e], 1))
+
+    return wrapper
+
+
+def _make_fast_wrapper_async(func: Callable) -> Callable:
+    """ The async version of `_make_fast_wrapper`. """
+
+    @functools.wraps(func)
+    async def wrapper_async(*args, **kwargs):
+        observer = instrument._observer  # pylint: disable=protected-access
+        called = func if observer is None else instrument.observe_async(observer, 'def_result', func, _IS_SUCCESS)
+        try:
+            result = called(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return Result.convert_to_result(result)._get_unbroken()  # pylint: disable=protected-access
+        except (BreakFunctionException, BreakRailsException) as e:
+            return e.result
+        except Exception as e:
+            return Result.fail(_utility.generate_error([e], 1))
+
+    return wrapper_async
+
+
+async def _call_single_flight(in_flight: Dict[Hashable, asyncio.Future], call_async: Callable,
+                              args: Tuple[Any, ...], kwargs: Dict[str, Any], cache_key: Optional[Hashable]):
+    key = cache_key if cache_key is not None else ResultCache.make_key(args, kwargs)
+    if key is None:
+        return await call_async(args, kwargs, cache_key)
+    key = (asyncio.get_running_loop(), key)  # A task can only be awaited in its own event loop.
+    task = in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(call_async(args, kwargs, cache_key))
+        in_flight[key] = task
+        task.add_done_callback(lambda _: in_flight.pop(key, None))
+    # The shared task is not cancelled when one of the callers is cancelled.
+    # Each caller gets its own copy, so changing one result (like `on_success_add_more_data`) does not change others.
+    return _copy_result(await asyncio.shield(task))
+
+
+_IS_SUCCESS = _get_success_checker(none_means_success=True)
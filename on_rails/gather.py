@@ -0,0 +1,85 @@
+import asyncio
+import inspect
+from enum import Enum
+from typing import Any, Iterable, List, Optional
+
+from on_rails.Result import Result, try_func_async
+from on_rails.RetryPolicy import RetryPolicy
+
+
+class ReturnWhen(Enum):
+    """
+    Determines when `gather_results` returns.
+
+    ALL: When all the functions are completed (default).
+    FIRST_FAILURE: When the first function fails. The other functions are cancelled.
+    """
+    ALL = 'all'
+    FIRST_FAILURE = 'first_failure'
+
+
+async def gather_results(coros_or_funcs: Iterable[Any], limit: Optional[int] = None,
+                         return_when: ReturnWhen = ReturnWhen.ALL, num_of_try: int = 1,
+                         try_only_on_exceptions: bool = True, retry_policy: Optional[RetryPolicy] = None) -> Result:
+    """
+    Runs the coroutines or functions concurrently with `try_func_async` and combines their results.
+
+    :param coros_or_funcs: The awaitables (like coroutines) or the functions (sync or async) without parameters.
+    An awaitable can be awaited only once, so it is not retried. Use a function to retry it.
+    :param limit: The maximum number of functions that run at the same time. Defaults to None (no limit).
+    :param return_when: When the combined result is returned. Defaults to `ReturnWhen.ALL`.
+    :param num_of_try: See `try_func_async`. Defaults to 1.
+    :param try_only_on_exceptions: See `try_func_async`. Defaults to True.
+    :param retry_policy: See `try_func_async`. Defaults to None.
+    :return: A successful result with the list of values (in the order of the inputs) if all of them are successful.
+    Otherwise, in `ReturnWhen.FIRST_FAILURE` mode the first failed result and in `ReturnWhen.ALL` mode a failed
+    result that contains the details of all the failed results in the more_data field.
+    :raises ValueError: If limit is less than 1 or return_when is not a ReturnWhen.
+    """
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be greater than 0")
+    if not isinstance(return_when, ReturnWhen):
+        raise ValueError("return_when must be an instance of ReturnWhen")
+
+    items = list(coros_or_funcs)
+    semaphore = asyncio.Semaphore(limit) if limit is not None else None
+
+    async def run(coro_or_func) -> Result:
+        if inspect.isawaitable(coro_or_func):
+            # The awaitable can be awaited only once, so it is tried once and without the retry policy.
+            args = (lambda: coro_or_func, 1, try_only_on_exceptions)
+            kwargs = {}
+        else:
+            args = (coro_or_func, num_of_try, try_only_on_exceptions)
+            kwargs = {'retry_policy': retry_policy}
+        if semaphore is None:
+            return await try_func_async(*args, **kwargs)
+        async with semaphore:
+            return await try_func_async(*args, **kwargs)
+
+    tasks = [asyncio.ensure_future(run(item)) for item in items]
+    try:
+        pending = set(tasks)
+        while pending:
+            if return_when == ReturnWhen.ALL:
+                await asyncio.wait(pending)
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.result().success:
+                    return task.result()
+    finally:
+        await _cancel_tasks(tasks)
+        for item in items:
+            if inspect.iscoroutine(item):
+                item.close()  # The coroutines that are not started must be closed.
+
+    return Result.collect(task.result() for task in tasks)
+
+
+async def _cancel_tasks(tasks: List[asyncio.Future]) -> None:
+    pending = [task for task in tasks if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.wait(pending)
@@ -0,0 +1,132 @@
+import inspect
+import time
+from typing import Any, Callable, NamedTuple, Optional
+
+
+class StepEvent(NamedTuple):
+    """ An event of an attempt of a step (like `on_success` or `try_func`).
+
+    Attributes:
+        step (str): The name of the step. For example `on_success`, `on_fail_tee`, `try_func` or `def_result`.
+        func_name (str): The qualified name of the function of the step.
+        attempt (int): The number of the attempt (starts from 1).
+        duration_ns (int, optional): The duration of the attempt in nanoseconds. It is None in the start events and when the
+        attempt is cancelled (like by a timeout).
+        success (bool, optional): Whether the attempt was successful. It is None in the start events and when the
+        attempt is cancelled (like by a timeout).
+    """
+    step: str
+    func_name: str
+    attempt: int
+    duration_ns: Optional[int] = None
+    success: Optional[bool] = None
+
+
+class Observer:
+    """ Receives the events of the steps. Inherit from it and override the methods you need.
+
+    The methods are called in the thread (or the event loop) that runs the step, so they should be fast and must not
+    raise exceptions.
+    """
+
+    def on_step_start(self, event: StepEvent) -> None:
+        """ It is called before each attempt of a step. """
+
+    def on_step_end(self, event: StepEvent) -> None:
+        """ It is called after each attempt of a step. """
+
+
+_observer: Optional[Observer] = None
+
+
+def set_observer(observer: Optional[Observer]) -> None:
+    """
+    Sets the observer that receives the events of the steps. When no observer is set (default), the steps are not
+    observed and there is no overhead.
+
+    :param observer: An object with `on_step_start` and `on_step_end` methods (like an `Observer`) or None to
+    remove the observer.
+    :raises ValueError: If the observer does not have the methods.
+    """
+    global _observer  # pylint: disable=global-statement
+    if observer is not None and not (callable(getattr(observer, 'on_step_start', None)) and
+                                     callable(getattr(observer, 'on_step_end', None))):
+        raise ValueError("observer must have on_step_start and on_step_end methods")
+    _observer = observer
+
+
+def get_observer() -> Optional[Observer]:
+    """
+    Returns the observer that receives the events of the steps.
+    """
+    return _observer
+
+
+def get_func_name(func: Any) -> str:
+    """
+    Returns the qualified name of the function.
+    """
+    name = getattr(func, '__qualname__', None)
+    return name if isinstance(name, str) else type(func).__qualname__
+
+
+def observe(observer: Observer, step: str, func: Callable, is_success: Callable[[Any], bool]) -> Callable:
+    """
+    Returns a function that calls the function and sends the start and end events of each call to the observer.
+    The success of an output is determined by `is_success`. An exception is a failure, unless it carries a result
+    (like `BreakRailsException`).
+    """
+    func_name = get_func_name(func)
+    attempts = [0]
+
+    def observed(*args, **kwargs):
+        attempts[0] += 1
+        attempt = attempts[0]
+        observer.on_step_start(StepEvent(step, func_name, attempt))
+        started_at = time.perf_counter_ns()
+        success = None
+        try:
+            output = func(*args, **kwargs)
+            success = is_success(output)
+            return output
+        except Exception as e:
+            success = _is_exception_success(e)
+            raise
+        finally:
+            observer.on_step_end(StepEvent(step, func_name, attempt, time.perf_counter_ns() - started_at, success))
+
+    return observed
+
+
+def observe_async(observer: Observer, step: str, func: Callable, is_success: Callable[[Any], bool]) -> Callable:
+    """
+    The async version of `observe`. The duration includes awaiting the output of the function.
+    """
+    func_name = get_func_name(func)
+    attempts = [0]
+
+    async def observed(*args, **kwargs):
+        attempts[0] += 1
+        attempt = attempts[0]
+        observer.on_step_start(StepEvent(step, func_name, attempt))
+        started_at = time.perf_counter_ns()
+        success = None
+        try:
+            output = func(*args, **kwargs)
+            if inspect.isawaitable(output):
+                output = await output
+            success = is_success(output)
+            return output
+        except Exception as e:
+            success = _is_exception_success(e)
+            raise
+        finally:
+            observer.on_step_end(StepEvent(step, func_name, attempt, time.perf_counter_ns() - started_at, success))
+
+    return observed
+
+
+def _is_exception_success(exception: Exception) -> bool:
+    result = getattr(exception, 'result', None)  # BreakRailsException and BreakFunctionException
+    success = getattr(result, 'success', False)
+    return success if isinstance(success, bool) else False
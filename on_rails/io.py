@@ -0,0 +1,70 @@
+import io
+from typing import IO, Any, Callable, Iterable, Iterator, List, Optional
+
+from on_rails.Result import Result
+from on_rails.ResultDetail import to_serializable
+from on_rails.serialization import Encoder, get_default_encoder
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+
+def write_ndjson(results: Iterable[Result], fileobj: IO, include_stack_trace: bool = False,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, encoder: Optional[Encoder] = None) -> int:
+    """
+    Writes the results as newline-delimited JSON (one result per line) to a text or binary file. The results are
+    consumed one by one (so it can be a generator) and the lines are joined and written in chunks of about
+    `chunk_size` characters, so the memory does not depend on the number of the results.
+
+    :param results: The results to write
+    :param fileobj: A text or binary file-like object with a `write` method (binary files get UTF-8 bytes).
+    :param include_stack_trace: Whether the stack traces of the error details are included. Defaults to False.
+    :param chunk_size: The approximate size of each write. Defaults to 256 KiB.
+    :param encoder: The encoder of each result (see `set_default_encoder`). It must not write line breaks.
+    :return: The number of the written results.
+    :raises ValueError: If chunk_size is not positive.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be greater than zero")
+    encode = encoder if encoder is not None else get_default_encoder()
+    is_binary = not isinstance(fileobj, io.TextIOBase)
+    newline, empty = (b'\n', b'') if is_binary else ('\n', '')
+
+    lines: List[Any] = []
+    size = count = 0
+    for result in results:
+        line = encode(to_serializable(result, include_stack_trace))
+        if is_binary != isinstance(line, bytes):
+            line = line.encode() if is_binary else line.decode()
+        lines.append(line)
+        lines.append(newline)
+        size += len(line) + 1
+        count += 1
+        if size >= chunk_size:
+            fileobj.write(empty.join(lines))
+            lines.clear()
+            size = 0
+    if lines:
+        fileobj.write(empty.join(lines))
+    return count
+
+
+def read_ndjson(fileobj: IO, decoder: Optional[Callable[[Any], Any]] = None) -> Iterator[Result]:
+    """
+    Reads the results of `write_ndjson` from a text or binary file. It is a generator: each line is decoded and its
+    result (and the subclass of its detail, see `Result.from_dict`) is created only when it is requested. The blank
+    lines are skipped.
+
+    :param fileobj: A text or binary file-like object that can be iterated line by line.
+    :param decoder: The decoder of each line (like `orjson.loads`). Defaults to `json.loads`.
+    :raises ValueError: If a line is not a valid result. The message contains the number of the line.
+    """
+    for line_number, line in enumerate(fileobj, start=1):
+        if not line.strip():
+            continue
+        try:
+            result = Result.from_json(line, decoder)
+        except ValueError as error:
+            raise ValueError(f"Line {line_number} is not a valid result: {error}") from error
+        if not isinstance(result, Result):
+            raise ValueError(f"Line {line_number} is not a valid result: it is a list.")
+        yield result
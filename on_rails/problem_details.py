@@ -0,0 +1,119 @@
+import functools
+import json
+import re
+from json.encoder import encode_basestring
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+
+PROBLEM_JSON_CONTENT_TYPE = 'application/problem+json'
+
+_problem_type_base: Optional[str] = None
+_problem_types: Dict[type, str] = {}
+_prefixes: Dict[Tuple[type, int], bytes] = {}
+_encode_json = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str).encode
+
+
+def set_problem_type_base(base: Optional[str]) -> None:
+    """
+    Sets the base URI of the `type` member of the problem details. The type of an error class is the base URI
+    followed by the kebab-case name of the class without the `Error` suffix (for example,
+    `https://example.com/problems/not-found` for `NotFoundError`).
+
+    :param base: The base URI (like `https://example.com/problems/`) or None to use `about:blank` (default).
+    """
+    global _problem_type_base  # pylint: disable=global-statement
+    _problem_type_base = base
+    _prefixes.clear()
+
+
+def get_problem_type_base() -> Optional[str]:
+    """
+    Returns the base URI of the `type` member of the problem details.
+    """
+    return _problem_type_base
+
+
+def register_problem_type(cls: type, type_uri: str) -> None:
+    """
+    Sets the `type` member of the problem details of an error class (and the subclasses that are not registered).
+
+    :raises ValueError: If cls is not a subclass of ErrorDetail or type_uri is empty.
+    """
+    if not isinstance(cls, type) or not issubclass(cls, ErrorDetail):
+        raise ValueError("cls must be a subclass of ErrorDetail")
+    if not type_uri:
+        raise ValueError("type_uri is required")
+    _problem_types[cls] = type_uri
+    _prefixes.clear()
+
+
+def get_problem_type(cls: type) -> str:
+    """
+    Returns the `type` member of the problem details of an error class.
+    """
+    for klass in cls.__mro__:
+        type_uri = _problem_types.get(klass)
+        if type_uri is not None:
+            return type_uri
+    if _problem_type_base is None:
+        return 'about:blank'
+    name = re.sub(r'Error$', '', cls.__name__) or cls.__name__
+    return _problem_type_base + re.sub(r'(?<!^)(?=[A-Z])', '-', name).lower()
+
+
+def write_problem(detail: ErrorDetail, buffer: Union[bytearray, BinaryIO], instance: Optional[str] = None) -> int:
+    """
+    Writes the error detail as an RFC 7807 problem details JSON object (`application/problem+json`) to the buffer.
+
+    The members are `type`, `status` (the code of the detail or 500), `title`, `detail` (the message) and `errors`.
+    The encoded `type` and `status` members are cached per class and code, so a detail is not converted to a
+    dictionary first.
+
+    :param detail: The error detail
+    :param buffer: A bytearray or a binary file-like object (with a `write` method) that the bytes are written to.
+    :param instance: The optional `instance` member (a URI of the occurrence of the problem).
+    :return: The number of the written bytes.
+    :raises ValueError: If detail is not an ErrorDetail.
+    """
+    if not isinstance(detail, ErrorDetail):
+        raise ValueError("detail must be an instance of ErrorDetail")
+    write = buffer.extend if isinstance(buffer, bytearray) else buffer.write
+    parts = (_get_prefix(detail.__class__, detail.code if detail.code else 500),
+             b'"title":', _encode_string(detail.title),
+             *((b',"detail":', _encode_text(detail.message)) if detail.message else ()),
+             *((b',"errors":', _encode_json(detail.errors).encode()) if detail.errors else ()),
+             *((b',"instance":', _encode_text(instance)) if instance else ()),
+             b'}')
+    size = 0
+    for part in parts:
+        write(part)
+        size += len(part)
+    return size
+
+
+def to_problem_json(detail: ErrorDetail, instance: Optional[str] = None) -> bytes:
+    """
+    Returns the error detail as an RFC 7807 problem details JSON object. See `write_problem`.
+    """
+    buffer = bytearray()
+    write_problem(detail, buffer, instance)
+    return bytes(buffer)
+
+
+def _get_prefix(cls: type, status: int) -> bytes:
+    prefix = _prefixes.get((cls, status))
+    if prefix is None:
+        prefix = b'{"type":' + _encode_string(get_problem_type(cls)) + b',"status":' + str(status).encode() + b','
+        _prefixes[(cls, status)] = prefix
+    return prefix
+
+
+def _encode_text(value: Any) -> bytes:
+    return encode_basestring(value if isinstance(value, str) else str(value)).encode()
+
+
+@functools.lru_cache(maxsize=1024)
+def _encode_string(value: Any) -> bytes:
+    # The titles and the types are repeated, so their encoded forms are cached.
+    return _encode_text(value)
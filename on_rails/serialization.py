@@ -0,0 +1,139 @@
+import functools
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from on_rails.ResultDetail import (_create_detail, get_detail_dict_error,
+                                   to_serializable)
+# The built-in details are imported to register them for `from_dict`.
+from on_rails.ResultDetails import \
+    Errors as _errors  # pylint: disable=unused-import
+from on_rails.ResultDetails import \
+    Success as _success  # pylint: disable=unused-import
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.SuccessDetail import SuccessDetail
+
+Encoder = Callable[[Any], Union[str, bytes]]
+
+_default_encoder: Encoder = functools.partial(json.dumps, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def set_default_encoder(encoder: Optional[Encoder]) -> None:
+    """
+    Sets the encoder that is used by `dumps` when no encoder is given. An encoder is a function that takes the
+    dictionaries, lists and scalars of `to_dict` and returns the encoded text or bytes (like `json.dumps` or
+    `orjson.dumps`).
+
+    :param encoder: The new default encoder or None to use the stdlib `json` module.
+    :raises ValueError: If the encoder is not callable.
+    """
+    global _default_encoder  # pylint: disable=global-statement
+    if encoder is not None and not callable(encoder):
+        raise ValueError("encoder must be a function")
+    _default_encoder = encoder if encoder is not None else _STDLIB_JSON_ENCODER
+
+
+def get_default_encoder() -> Encoder:
+    """
+    Returns the encoder that is used by `dumps` when no encoder is given.
+    """
+    return _default_encoder
+
+
+def dumps(obj: Any, include_stack_trace: bool = False, encoder: Optional[Encoder] = None) -> Union[str, bytes]:
+    """
+    Encodes a result, a result detail or a collection of them (for example, a list of results) as JSON.
+
+    :param obj: The object to encode. It is converted with `to_dict` (see `to_serializable`).
+    :param include_stack_trace: Whether the stack traces of the error details are included. Defaults to False.
+    :param encoder: The encoder of the converted object. Defaults to the default encoder, which uses the stdlib
+    `json` module and encodes the unsupported values with `str`.
+    :return: The output of the encoder (a `str` for the stdlib `json` module).
+    """
+    data = to_serializable(obj, include_stack_trace)
+    return (encoder if encoder is not None else _default_encoder)(data)
+
+
+_STDLIB_JSON_ENCODER = _default_encoder
+
+
+class _ResultDictMixin:
+    """ The methods of `Result` that convert it to and from dictionaries (and JSON). """
+    __slots__ = ()
+
+    def to_dict(self, include_stack_trace: bool = False) -> Dict[str, Any]:
+        """
+        Converts the result to a dictionary that can be encoded as JSON. The value is converted with
+        `to_serializable` and the detail with its `to_dict` method.
+
+        :param include_stack_trace: Whether the stack trace of the error detail is included. Defaults to False.
+        :return: A dictionary with `success`, `value` and `detail` keys.
+        """
+        return {
+            'success': self.success,
+            'value': to_serializable(self.value),
+            'detail': self.detail.to_dict(include_stack_trace) if self.detail is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Result':
+        """
+        Creates a result from the dictionary of `to_dict` (for example, a result that is received from another
+        service). The class of the detail is found by its `type` or `code` (see `ResultDetail.from_dict`). The error
+        details do not capture a stack trace and their exceptions are `RemoteException` instances. The value is not
+        converted.
+
+        :param data: The dictionary of the result
+        :return: The result
+        :raises ValueError: If data is not a valid result dictionary.
+        """
+        error = _get_result_dict_error(data)
+        if error is not None:
+            raise ValueError(error)
+        return cls._from_valid_dict(data)
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[Dict[str, Any]]) -> List['Result']:
+        """
+        Creates the results of a list of dictionaries. All the dictionaries are validated before any result is
+        created, so an invalid list does not create any result.
+
+        :raises ValueError: If one or more dictionaries are not valid. The message contains the indexes and the errors
+        of the first ones.
+        """
+        items = items if isinstance(items, list) else list(items)
+        errors = [(index, error) for index, error in enumerate(map(_get_result_dict_error, items)) if error is not None]
+        if errors:
+            first_errors = ' '.join(f"[{index}] {error}" for index, error in errors[:5])
+            raise ValueError(f"{len(errors)} of {len(items)} results are not valid. {first_errors}")
+        return [cls._from_valid_dict(data) for data in items]
+
+    @classmethod
+    def from_json(cls, text: Union[str, bytes], decoder: Optional[Callable[[Union[str, bytes]], Any]] = None) \
+            -> Union['Result', List['Result']]:
+        """
+        Creates a result (or a list of results if the JSON is an array) from the JSON of `to_dict` or `dumps`.
+
+        :param text: The JSON text
+        :param decoder: The decoder of the text (like `orjson.loads`). Defaults to `json.loads`.
+        :raises ValueError: If the text is not a valid JSON of a result or a list of results.
+        """
+        data = (decoder if decoder is not None else json.loads)(text)
+        return cls.from_dicts(data) if isinstance(data, list) else cls.from_dict(data)
+
+    @classmethod
+    def _from_valid_dict(cls, data: Dict[str, Any]) -> 'Result':
+        success = data['success']
+        detail = data.get('detail')
+        if detail is not None:
+            # The detail is validated with the result, so it is created directly.
+            detail = _create_detail(detail, SuccessDetail if success else ErrorDetail)
+        return cls.ok(data.get('value'), detail) if success else cls.fail(detail)
+
+
+def _get_result_dict_error(data: Any) -> Optional[str]:
+    if not isinstance(data, dict):
+        return f"The result must be a dictionary, not {type(data).__name__}."
+    if not isinstance(data.get('success'), bool):
+        return "The success of the result must be a boolean."
+    detail = data.get('detail')
+    return get_detail_dict_error(detail) if detail is not None else None
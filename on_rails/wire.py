@@ -0,0 +1,318 @@
+import struct
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from on_rails.Result import Result
+from on_rails.ResultDetail import (ResultDetail, _create_detail,
+                                   _get_dict_plan, get_detail_dict_error,
+                                   to_serializable)
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.SuccessDetail import SuccessDetail
+
+WIRE_FORMAT_VERSION = 1
+
+_MAGIC = b'ORW'
+
+# The tags of the encoded values.
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _BYTES, _LIST, _DICT, _INTERNED, _OK, _FAIL, _DETAIL, _SIZED_LIST = range(14)
+
+_FLOAT_STRUCT = struct.Struct('<d')
+
+
+def encode(obj: Any) -> bytes:
+    """
+    Encodes a result, a result detail or a list of them in the compact binary wire format of `decode`.
+
+    The encoding starts with a header (`ORW` and the version) and a table of the interned strings (the titles and the
+    class tags of the details, which are their class names and the names of their fields), so each of them is stored
+    once. The integers (like the codes) are varints, the floats are 8-byte IEEE 754 numbers and the strings and the
+    `more_data` lists are length prefixed. The details are stored by the fields of their `_dict_fields`, like
+    `to_dict`, but the values of `more_data` and `errors` keep their results and details. The values of the other
+    types are converted with `to_serializable` and the unsupported ones with `str`.
+
+    :param obj: The result, detail or list to encode
+    :return: The encoded bytes
+    """
+    encoder = _Encoder()
+    encoder.encode(obj)
+    header = bytearray(_MAGIC)
+    header.append(WIRE_FORMAT_VERSION)
+    _write_varint(header, len(encoder.table))
+    for text in encoder.table:
+        data = text.encode()
+        _write_varint(header, len(data))
+        header += data
+    return bytes(header + encoder.buffer)
+
+
+def decode(data: Union[bytes, bytearray, memoryview]) -> Any:
+    """
+    Decodes the output of `encode`. The strings are decoded directly from the buffer (without copying the slices to
+    bytes first) and the details are created like `ResultDetail.from_dict`, so they are found by their class name or
+    code, the error details do not capture a stack trace and their exceptions are `RemoteException` instances.
+
+    :param data: The encoded bytes (or a memoryview of them, for example, of a larger receive buffer)
+    :return: The decoded result, detail or list
+    :raises ValueError: If data is not valid, truncated or encoded with an unsupported version.
+    """
+    view = memoryview(data).cast('B')
+    if bytes(view[:len(_MAGIC)]) != _MAGIC or len(view) <= len(_MAGIC):
+        raise ValueError("The data is not in the wire format of on_rails.")
+    version = view[len(_MAGIC)]
+    if version != WIRE_FORMAT_VERSION:
+        raise ValueError(f"The version {version} of the wire format is not supported.")
+    decoder = _Decoder(view, len(_MAGIC) + 1)
+    try:
+        decoder.read_table()
+        obj = decoder.decode()
+    except (IndexError, TypeError, struct.error, UnicodeDecodeError) as error:
+        raise ValueError(f"The data is not valid: {error}") from error
+    if decoder.pos != len(view):
+        raise ValueError("The data has extra bytes after the encoded value.")
+    return obj
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+class _Encoder:
+    __slots__ = ('buffer', 'table', '_indexes')
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.table: List[str] = []
+        self._indexes: Dict[str, int] = {}
+
+    def encode(self, value: Any) -> None:  # pylint: disable=too-many-branches
+        """ Appends the tag and the data of the value to the buffer. """
+        buffer = self.buffer
+        if value is None:
+            buffer.append(_NONE)
+        elif value is True or value is False:
+            buffer.append(_TRUE if value else _FALSE)
+        elif isinstance(value, int):
+            buffer.append(_INT)
+            _write_varint(buffer, (value << 1) if value >= 0 else ((-value << 1) - 1))  # zigzag
+        elif isinstance(value, str):
+            data = value.encode()
+            buffer.append(_STR)
+            _write_varint(buffer, len(data))
+            buffer += data
+        elif isinstance(value, float):
+            buffer.append(_FLOAT)
+            buffer += _FLOAT_STRUCT.pack(value)
+        elif isinstance(value, Result):
+            buffer.append(_OK if value.success else _FAIL)
+            self.encode(value.value)
+            self.encode(value.detail)
+        elif isinstance(value, ResultDetail):
+            self.encode_detail(value)
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            buffer.append(_LIST)
+            _write_varint(buffer, len(value))
+            for item in value:
+                self.encode(item)
+        elif isinstance(value, dict):
+            buffer.append(_DICT)
+            _write_varint(buffer, len(value))
+            for key, item in value.items():
+                self.encode(key)
+                self.encode(item)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            data = bytes(value)
+            buffer.append(_BYTES)
+            _write_varint(buffer, len(data))
+            buffer += data
+        else:
+            converted = to_serializable(value)
+            self.encode(converted if converted is not value else str(value))
+
+    def encode_detail(self, detail: ResultDetail) -> None:
+        """ Appends the detail: its interned shape and then the values of its fields in the order of the shape. """
+        shape, fields = _get_shape(detail.__class__)
+        self.buffer.append(_DETAIL)
+        self.intern(shape, tagged=False)
+        for name, convert in fields:
+            value = getattr(detail, name, None)
+            if name == 'title':
+                self.intern(value)
+            elif name == 'more_data' and value is not None:
+                self.encode_sized_list(value)
+            else:
+                # The results and the details in the values are encoded as is, so only the other converters are used.
+                self.encode(convert(value) if convert not in (None, to_serializable) and value is not None else value)
+
+    def encode_sized_list(self, items: List[Any]) -> None:
+        """ Appends the list with its byte size and its number of items. """
+        # The byte size lets a reader skip the list without decoding it.
+        outer, self.buffer = self.buffer, bytearray()
+        try:
+            for item in items:
+                self.encode(item)
+        finally:
+            inner, self.buffer = self.buffer, outer
+        outer.append(_SIZED_LIST)
+        _write_varint(outer, len(inner))
+        _write_varint(outer, len(items))
+        outer += inner
+
+    def intern(self, text: Any, tagged: bool = True) -> None:
+        """
+        Appends the index of the text in the table (and adds it to the table if it is new). The values that are not
+        strings are encoded as is.
+        """
+        if not isinstance(text, str):
+            self.encode(text)
+            return
+        index = self._indexes.get(text)
+        if index is None:
+            index = self._indexes[text] = len(self.table)
+            self.table.append(text)
+        if tagged:
+            self.buffer.append(_INTERNED)
+        _write_varint(self.buffer, index)
+
+
+_SHAPE_SEPARATOR = '\n'
+_shapes: Dict[type, Tuple[str, Tuple[Tuple[str, Optional[Callable[[Any], Any]]], ...]]] = {}
+
+
+def _get_shape(cls: type) -> Tuple[str, Tuple[Tuple[str, Optional[Callable[[Any], Any]]], ...]]:
+    # The shape of a class is its name and the names of its fields. It is interned, so the names are stored once.
+    shape = _shapes.get(cls)
+    if shape is None:
+        type_name, fields = _get_dict_plan(cls)
+        shape = (_SHAPE_SEPARATOR.join((type_name, *(name for name, _ in fields))), fields)
+        _shapes[cls] = shape
+    return shape
+
+
+class _Decoder:
+    __slots__ = ('view', 'pos', 'table', '_shapes', '_readers')
+
+    def __init__(self, view: memoryview, pos: int):
+        self.view = view
+        self.pos = pos
+        self.table: List[str] = []
+        self._shapes: Dict[int, Tuple[str, Tuple[str, ...]]] = {}
+        self._readers: Tuple[Callable[[int], Any], ...] = (
+            self._read_none, self._read_bool, self._read_bool, self._read_int, self._read_float, self._read_str,
+            self._read_bytes, self._read_list, self._read_dict, self._read_interned, self._read_result,
+            self._read_result, self._read_detail, self._read_sized_list)
+
+    def read_varint(self) -> int:
+        """ Reads an unsigned varint. """
+        view = self.view
+        byte = view[self.pos]
+        self.pos += 1
+        if byte < 0x80:
+            return byte
+        result, shift = byte & 0x7F, 7
+        while True:
+            byte = view[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def read_slice(self) -> memoryview:
+        """ Reads a length-prefixed slice of the data without copying it. """
+        size = self.read_varint()
+        start = self.pos
+        self.pos += size
+        if self.pos > len(self.view):
+            raise IndexError("The length is out of the data.")
+        return self.view[start:self.pos]
+
+    def read_table(self) -> None:
+        """ Reads the table of the interned strings. """
+        self.table = [str(self.read_slice(), 'utf-8') for _ in range(self.read_varint())]
+
+    def decode(self, default_type: type = ResultDetail) -> Any:
+        """
+        Reads the next value.
+
+        :param default_type: The type of the detail if it can not be found by its class name or code.
+        """
+        view = self.view
+        tag = view[self.pos]
+        self.pos += 1
+        # The most common values are read inline.
+        if tag == _NONE:
+            return None
+        if tag == _STR:
+            return str(self.read_slice(), 'utf-8')
+        if tag == _INTERNED and view[self.pos] < 0x80:
+            self.pos += 1
+            return self.table[view[self.pos - 1]]
+        if tag == _DETAIL:
+            return self._read_detail(tag, default_type)
+        if tag >= len(self._readers):
+            raise ValueError(f"The tag {tag} is not valid.")
+        return self._readers[tag](tag)
+
+    def _read_none(self, _: int) -> None:
+        return None
+
+    def _read_bool(self, tag: int) -> bool:
+        return tag == _TRUE
+
+    def _read_int(self, _: int) -> int:
+        value = self.read_varint()
+        return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+    def _read_float(self, _: int) -> float:
+        value = _FLOAT_STRUCT.unpack_from(self.view, self.pos)[0]
+        self.pos += _FLOAT_STRUCT.size
+        return value
+
+    def _read_str(self, _: int) -> str:
+        return str(self.read_slice(), 'utf-8')
+
+    def _read_bytes(self, _: int) -> bytes:
+        return bytes(self.read_slice())
+
+    def _read_interned(self, _: int) -> str:
+        return self.table[self.read_varint()]
+
+    def _read_list(self, _: int) -> List[Any]:
+        read = self.decode
+        return [read() for _ in range(self.read_varint())]
+
+    def _read_sized_list(self, _: int) -> List[Any]:
+        size, count = self.read_varint(), self.read_varint()
+        end = self.pos + size
+        read = self.decode
+        items = [read() for _ in range(count)]
+        if self.pos != end:
+            raise ValueError("The size of the list is not valid.")
+        return items
+
+    def _read_dict(self, _: int) -> Dict[Any, Any]:
+        read = self.decode
+        return {read(): read() for _ in range(self.read_varint())}
+
+    def _read_result(self, tag: int) -> Result:
+        value = self.decode()
+        detail = self.decode(SuccessDetail if tag == _OK else ErrorDetail)
+        if detail is not None and not isinstance(detail, ResultDetail):
+            raise ValueError("The detail of the result is not valid.")
+        return Result(tag == _OK, detail, value)
+
+    def _read_detail(self, _: int, default_type: type = ResultDetail) -> ResultDetail:
+        index = self.read_varint()
+        shape = self._shapes.get(index)
+        if shape is None:
+            type_name, *names = self.table[index].split(_SHAPE_SEPARATOR)
+            shape = self._shapes[index] = (type_name, tuple(names))
+        read = self.decode
+        data = {name: read() for name in shape[1]}
+        data['type'] = shape[0]
+        error = get_detail_dict_error(data)
+        if error is not None:
+            raise ValueError(error)
+        return _create_detail(data, default_type)
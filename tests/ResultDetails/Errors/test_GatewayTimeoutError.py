@@ -0,0 +1,26 @@
+import unittest
+
+from on_rails.ResultDetails.Errors.GatewayTimeoutError import \
+    GatewayTimeoutError
+from tests.helpers import assert_error_detail
+
+
+class TestGatewayTimeoutError(unittest.TestCase):
+    def test_init_without_args(self):
+        detail = GatewayTimeoutError()
+
+        assert_error_detail(test_class=self, target_error_detail=detail, expected_title="Timeout Error",
+                            expected_code=504)
+
+    def test_init_with_args(self):
+        exception = Exception("fake")
+        detail = GatewayTimeoutError(title="title", message="message", code=100, more_data=["message"],
+                               errors={"key": "message"}, exception=exception)
+
+        assert_error_detail(test_class=self, target_error_detail=detail, expected_title="title",
+                            expected_code=100, expected_message="message", expected_more_data=["message"],
+                            expected_errors={"key": "message"}, expected_exception=exception)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+
+from on_rails.ResultDetails.Errors.ServiceUnavailableError import \
+    ServiceUnavailableError
+from tests.helpers import assert_error_detail
+
+
+class TestServiceUnavailableError(unittest.TestCase):
+    def test_init_without_args(self):
+        detail = ServiceUnavailableError()
+
+        assert_error_detail(test_class=self, target_error_detail=detail, expected_title="Service Unavailable",
+                            expected_code=503)
+
+    def test_init_with_args(self):
+        exception = Exception("fake")
+        detail = ServiceUnavailableError(title="title", message="message", code=100, more_data=["message"],
+                               errors={"key": "message"}, exception=exception)
+
+        assert_error_detail(test_class=self, target_error_detail=detail, expected_title="title",
+                            expected_code=100, expected_message="message", expected_more_data=["message"],
+                            expected_errors={"key": "message"}, expected_exception=exception)
+
+
+if __name__ == '__main__':
+    unittest.main()
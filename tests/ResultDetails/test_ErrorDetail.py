@@ -1,8 +1,22 @@
+import copy
+import pickle
+import threading
+import traceback
 import unittest
+import weakref
 
-from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.ErrorDetail import (ErrorDetail, RemoteException,
+                                                StackTraceMode,
+                                                StackTracePolicy,
+                                                exception_to_dict,
+                                                get_default_stack_trace_policy,
+                                                set_default_stack_trace_policy,
+                                                to_portable_exception)
+from on_rails.ResultDetails.Errors.ValidationError import ValidationError
 from tests.helpers import assert_error_detail
 
+FAKE_EXCEPTION = Exception("fake")
+
 
 class TestErrorDetail(unittest.TestCase):
     def test_init_without_args(self):
@@ -58,6 +72,155 @@ class TestErrorDetail(unittest.TestCase):
             "Title: title\nMessage: message\nCode: 100\nStack trace:" in repr(
                 error_detail))
 
+    def test_stack_trace_eager(self):
+        error_detail = ErrorDetail()
+        self.assertTrue(isinstance(error_detail.stack_trace, traceback.StackSummary))
+        self.assertEqual("test_stack_trace_eager", error_detail.stack_trace[-2].name)
+
+        error_detail = ErrorDetail(stack_trace_policy=StackTracePolicy(limit=2))
+        self.assertEqual(2, len(error_detail.stack_trace))
+
+    def test_stack_trace_lazy(self):
+        error_detail = ValidationError(stack_trace_policy=StackTracePolicy(StackTraceMode.LAZY))
+        self.assertIsNone(error_detail._stack_trace)
+        self.assertEqual("test_stack_trace_lazy", error_detail.stack_trace[-3].name)
+        self.assertIsNone(error_detail._stack_positions)
+        self.assertTrue("Stack trace:" in repr(error_detail))
+
+        error_detail = ErrorDetail(stack_trace_policy=StackTracePolicy(StackTraceMode.LAZY, limit=2))
+        self.assertEqual(2, len(error_detail.stack_trace))
+
+    def test_stack_trace_lazy_line_numbers(self):
+        def caller():
+            eager = ErrorDetail()
+            lazy = ErrorDetail(stack_trace_policy=StackTracePolicy(StackTraceMode.LAZY))
+            lines = [eager.stack_trace[-2].lineno]  # The stack trace of lazy is accessed on a later line.
+            lines.append(lazy.stack_trace[-2].lineno)
+            return eager, lazy, lines
+
+        eager, lazy, lines = caller()
+        self.assertEqual(lines[0] + 1, lines[1])
+        self.assertEqual([(frame.name, frame.lineno) for frame in eager.stack_trace[:-2]],
+                         [(frame.name, frame.lineno) for frame in lazy.stack_trace[:-2]])
+        self.assertEqual("lazy = ErrorDetail(stack_trace_policy=StackTracePolicy(StackTraceMode.LAZY))",
+                         lazy.stack_trace[-2].line)
+
+    def test_stack_trace_lazy_does_not_keep_frames(self):
+        def caller():
+            local = UnpicklableException()
+            return ErrorDetail(stack_trace_policy=StackTracePolicy(StackTraceMode.LAZY)), weakref.ref(local)
+
+        error_detail, local = caller()
+        self.assertIsNone(local())
+        self.assertEqual("caller", error_detail.stack_trace[-2].name)
+
+    def test_stack_trace_off(self):
+        error_detail = ErrorDetail(stack_trace_policy=StackTracePolicy(StackTraceMode.OFF))
+        self.assertEqual(0, len(error_detail.stack_trace))
+        self.assertTrue("Stack trace: \n" in repr(error_detail))
+
+        error_detail.stack_trace = None
+        self.assertEqual(0, len(error_detail.stack_trace))
+
+    def test_stack_trace_sample_rate(self):
+        policy = StackTracePolicy(sample_rate=4)
+        captured = [len(ErrorDetail(stack_trace_policy=policy).stack_trace) > 0 for _ in range(8)]
+        self.assertEqual(2, captured.count(True))
+
+    def test_default_stack_trace_policy(self):
+        default_policy = get_default_stack_trace_policy()
+        try:
+            set_default_stack_trace_policy(StackTracePolicy(StackTraceMode.OFF))
+            self.assertEqual(0, len(ErrorDetail().stack_trace))
+        finally:
+            set_default_stack_trace_policy(default_policy)
+        self.assertTrue(ErrorDetail().stack_trace)
+
+        self.assertRaises(ValueError, set_default_stack_trace_policy, None)
+
+    def test_pickle(self):
+        exception = ValueError("invalid")
+        error_detail = ValidationError(message="message", errors={"key": "value"}, exception=exception,
+                                       more_data=[1])
+        new = pickle.loads(pickle.dumps(error_detail))
+        self.assertEqual((error_detail.title, "message", 400, [1], {"key": "value"}),
+                         (new.title, new.message, new.code, new.more_data, new.errors))
+        self.assertIs(ValidationError, type(new))
+        self.assertIsInstance(new.exception, ValueError)
+        self.assertEqual(exception.args, new.exception.args)
+        self.assertEqual(0, len(new.stack_trace))
+
+        error_detail = ErrorDetail(exception=UnpicklableException(),
+                                   stack_trace_policy=StackTracePolicy(StackTraceMode.LAZY))
+        new = pickle.loads(pickle.dumps(error_detail))
+        self.assertIsInstance(new.exception, RemoteException)
+        self.assertEqual(f"{__name__}.UnpicklableException: fake", str(new.exception))
+        self.assertEqual(0, len(new.stack_trace))
+
+    def test_copy(self):
+        error_detail = ErrorDetail(exception=UnpicklableException(),
+                                   stack_trace_policy=StackTracePolicy(StackTraceMode.LAZY))
+        new = copy.copy(error_detail)
+        self.assertIs(error_detail.exception, new.exception)
+        self.assertEqual("test_copy", new.stack_trace[-2].name)
+
+        error_detail = ErrorDetail(exception=FAKE_EXCEPTION, stack_trace_policy=StackTracePolicy(StackTraceMode.LAZY))
+        new = copy.deepcopy(error_detail)
+        self.assertEqual(FAKE_EXCEPTION.args, new.exception.args)
+        self.assertEqual("test_copy", new.stack_trace[-2].name)
+
+    def test_to_portable_exception(self):
+        self.assertIsNone(to_portable_exception(None))
+        exception = ValueError("invalid")
+        self.assertIs(exception, to_portable_exception(exception))
+
+        exception = to_portable_exception(UnpicklableException())
+        self.assertEqual(f"{__name__}.UnpicklableException", exception.type_name)
+        self.assertEqual("fake", exception.message)
+        self.assertEqual(exception.type_name, pickle.loads(pickle.dumps(exception)).type_name)
+
+    def test_to_dict(self):
+        error_detail = ValidationError(message="message", errors={"key": "value"}, exception=ValueError("invalid"),
+                                       more_data=[1])
+        self.assertEqual({'type': 'ValidationError', 'title': error_detail.title, 'message': 'message', 'code': 400,
+                          'more_data': [1], 'errors': {'key': 'value'},
+                          'exception': {'type': 'builtins.ValueError', 'message': 'invalid'}},
+                         error_detail.to_dict())
+
+        data = ErrorDetail().to_dict(include_stack_trace=True)
+        self.assertEqual((None, None), (data['errors'], data['exception']))
+        self.assertIn('test_to_dict', ''.join(data['stack_trace']))
+
+    def test_from_dict(self):
+        error_detail = ValidationError(message="message", errors={"key": "value"}, exception=ValueError("invalid"))
+        new = ErrorDetail.from_dict(error_detail.to_dict(include_stack_trace=True))
+        self.assertIs(ValidationError, new.__class__)
+        self.assertEqual(error_detail.to_dict(), new.to_dict())
+        self.assertIsInstance(new.exception, RemoteException)
+        self.assertEqual(('builtins.ValueError', 'invalid'), (new.exception.type_name, new.exception.message))
+        self.assertEqual([], new.stack_trace)
+
+        new = ErrorDetail.from_dict({'type': 'ErrorDetail', 'title': 'title', 'exception': 'failed'})
+        self.assertEqual(('builtins.Exception', 'failed'), (new.exception.type_name, new.exception.message))
+        self.assertIsNone(ErrorDetail.from_dict({'type': 'ErrorDetail', 'title': 'title'}).exception)
+
+    def test_exception_to_dict(self):
+        self.assertEqual({'type': f'{__name__}.UnpicklableException', 'message': 'fake'},
+                         exception_to_dict(UnpicklableException()))
+        self.assertEqual({'type': 'module.Error', 'message': 'fake'},
+                         exception_to_dict(RemoteException('module.Error', 'fake')))
+
+    def test_stack_trace_policy_invalid_args(self):
+        self.assertRaises(ValueError, StackTracePolicy, 'off')
+        self.assertRaises(ValueError, StackTracePolicy, limit=0)
+        self.assertRaises(ValueError, StackTracePolicy, sample_rate=0)
+
+
+class UnpicklableException(Exception):
+    def __init__(self):
+        super().__init__("fake")
+        self.lock = threading.Lock()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,205 @@
+# pylint: disable=all
+
+import asyncio
+import unittest
+
+from on_rails.AsyncResult import AsyncResult
+from on_rails.BreakRailsMode import (BreakRailsMode,
+                                     set_default_break_rails_mode)
+from on_rails.Result import BreakFunctionException, BreakRailsException, Result
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.Errors.ExceptionError import ExceptionError
+from on_rails.ResultDetails.Errors.ValidationError import ValidationError
+from on_rails.test_helpers import assert_result, assert_result_with_type
+from tests.helpers import assert_invalid_func
+
+FAKE_EXCEPTION = Exception("fake")
+FAKE_ERROR = ErrorDetail("fake")
+
+
+async def add_one_async(value):
+    await asyncio.sleep(0)
+    return value + 1
+
+
+async def fail_async():
+    await asyncio.sleep(0)
+    return Result.fail(FAKE_ERROR)
+
+
+class TestAsyncResult(unittest.IsolatedAsyncioTestCase):
+    async def test_source(self):
+        assert_result(self, await AsyncResult(add_one_async(1)), expected_success=True, expected_value=2)
+        assert_result(self, await AsyncResult(Result.ok(5)), expected_success=True, expected_value=5)
+        assert_result(self, await AsyncResult(5), expected_success=True, expected_value=5)
+        assert_result(self, await AsyncResult(), expected_success=True)
+        assert_result(self, await Result.ok(5).to_async(), expected_success=True, expected_value=5)
+
+    async def test_source_raises_exception(self):
+        async def boom():
+            raise FAKE_EXCEPTION
+
+        result = await AsyncResult(boom())
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=ExceptionError)
+        self.assertIs(FAKE_EXCEPTION, result.detail.exception)
+        assert_result(self, await AsyncResult(boom()).on_fail(lambda prev: 1), expected_success=True, expected_value=1)
+
+        async def break_rails():
+            Result.fail(FAKE_ERROR).break_rails()
+
+        assert_result(self, await AsyncResult(break_rails()), expected_success=False, expected_detail=FAKE_ERROR)
+
+        async def break_function():
+            Result.fail(FAKE_ERROR).break_function()
+
+        with self.assertRaises(BreakFunctionException):
+            await AsyncResult(break_function())
+
+    async def test_on_success(self):
+        result = await Result.ok(1).to_async() \
+            .on_success(add_one_async) \
+            .on_success(lambda value: value + 1) \
+            .on_success(lambda value, prev: prev.value * 10)
+        assert_result(self, result, expected_success=True, expected_value=30)
+
+    async def test_on_success_when_previous_failed(self):
+        result = await AsyncResult(fail_async()).on_success(add_one_async)
+        assert_result(self, result, expected_success=False, expected_detail=FAKE_ERROR)
+
+    async def test_on_success_give_invalid_func(self):
+        assert_invalid_func(self, await Result.ok(1).to_async().on_success(None))
+
+        result = await Result.ok(1).to_async().on_success(lambda a, b, c: a)
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=ValidationError)
+
+    async def test_on_success_retry(self):
+        attempts = []
+
+        async def func():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise FAKE_EXCEPTION
+            return len(attempts)
+
+        result = await Result.ok().to_async().on_success(func, num_of_try=3)
+        assert_result(self, result, expected_success=True, expected_value=3)
+
+    async def test_on_success_tee(self):
+        result = await Result.ok(1).to_async().on_success_tee(add_one_async)
+        assert_result(self, result, expected_success=True, expected_value=1)
+
+        result = await Result.ok(1).to_async().on_success_tee(fail_async)
+        assert_result(self, result, expected_success=False, expected_detail=FAKE_ERROR)
+
+        result = await Result.ok(1).to_async().on_success_tee(fail_async, ignore_errors=True)
+        assert_result(self, result, expected_success=True, expected_value=1)
+
+        result = await Result.fail(FAKE_ERROR).to_async().on_success_tee(add_one_async)
+        assert_result(self, result, expected_success=False, expected_detail=FAKE_ERROR)
+
+    async def test_on_success_operate_when(self):
+        result = await Result.ok(1).to_async().on_success_operate_when(lambda value: value == 1, add_one_async)
+        assert_result(self, result, expected_success=True, expected_value=2)
+
+        result = await Result.ok(1).to_async().on_success_operate_when(False, add_one_async)
+        assert_result(self, result, expected_success=True, expected_value=1)
+
+        result = await Result.fail(FAKE_ERROR).to_async().on_success_operate_when(True, add_one_async)
+        assert_result(self, result, expected_success=False, expected_detail=FAKE_ERROR)
+
+        result = await Result.ok(1).to_async().on_success_operate_when("invalid", add_one_async)
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=ValidationError)
+
+        result = await Result.ok(1).to_async().on_success_operate_when(fail_async, add_one_async)
+        assert_result(self, result, expected_success=False, expected_detail=FAKE_ERROR)
+
+    async def test_on_success_operate_when_break_rails(self):
+        with self.assertRaises(BreakRailsException) as context:
+            await Result.ok(1).to_async() \
+                .on_success_operate_when(True, add_one_async, break_rails=True) \
+                .on_success(add_one_async)
+        assert_result(self, context.exception.result, expected_success=True, expected_value=2)
+
+    async def test_break_rails_sentinel_mode(self):
+        try:
+            set_default_break_rails_mode(BreakRailsMode.SENTINEL)
+            result = await Result.ok(1).to_async() \
+                .on_success_operate_when(True, add_one_async, break_rails=True) \
+                .on_success(add_one_async)
+        finally:
+            set_default_break_rails_mode(BreakRailsMode.EXCEPTION)
+        assert_result(self, result, expected_success=True, expected_value=2)
+        self.assertTrue(result.is_broken)
+
+    async def test_on_fail(self):
+        result = await Result.fail(FAKE_ERROR).to_async().on_fail(lambda prev: prev.detail.title)
+        assert_result(self, result, expected_success=True, expected_value="fake")
+
+        result = await Result.fail(FAKE_ERROR).to_async().on_fail(lambda: None)
+        assert_result(self, result, expected_success=False)
+
+        result = await Result.ok(1).to_async().on_fail(add_one_async)
+        assert_result(self, result, expected_success=True, expected_value=1)
+
+        assert_invalid_func(self, await Result.ok(1).to_async().on_fail(None))
+
+    async def test_on_fail_tee(self):
+        calls = []
+
+        async def log(prev):
+            calls.append(prev.detail)
+
+        result = await Result.fail(FAKE_ERROR).to_async().on_fail_tee(log)
+        assert_result(self, result, expected_success=False, expected_detail=FAKE_ERROR)
+        self.assertEqual([FAKE_ERROR], calls)
+
+        result = await Result.fail(FAKE_ERROR).to_async().on_fail_tee(lambda: Result.ok(1))
+        assert_result(self, result, expected_success=False, expected_detail=FAKE_ERROR)
+
+        error = ErrorDetail()
+        result = await Result.fail(FAKE_ERROR).to_async().on_fail_tee(lambda: Result.fail(error))
+        assert_result(self, result, expected_success=False, expected_detail=error)
+
+        result = await Result.fail(FAKE_ERROR).to_async().on_fail_tee(lambda: Result.fail(error), ignore_errors=True)
+        assert_result(self, result, expected_success=False, expected_detail=FAKE_ERROR)
+
+        result = await Result.ok(1).to_async().on_fail_tee(log)
+        assert_result(self, result, expected_success=True, expected_value=1)
+        self.assertEqual(1, len(calls))
+
+    async def test_on_fail_operate_when(self):
+        result = await Result.fail(FAKE_ERROR).to_async().on_fail_operate_when(True, lambda: 5)
+        assert_result(self, result, expected_success=True, expected_value=5)
+
+        result = await Result.ok(1).to_async().on_fail_operate_when(True, lambda: 5)
+        assert_result(self, result, expected_success=True, expected_value=1)
+
+    async def test_operate_when(self):
+        result = await Result.ok(1).to_async().operate_when(lambda prev: prev.success, lambda: 5)
+        assert_result(self, result, expected_success=True, expected_value=5)
+
+        result = await Result.ok(1).to_async().operate_when(lambda prev: 'not bool', lambda: 5)
+        assert_result(self, result, expected_success=True, expected_value=5)
+
+    async def test_finally_tee(self):
+        calls = []
+        result = await Result.ok(1).to_async().finally_tee(lambda prev: calls.append(prev.value))
+        assert_result(self, result, expected_success=True, expected_value=1)
+        self.assertEqual([1], calls)
+
+        result = await Result.ok(1).to_async().finally_tee(fail_async)
+        assert_result(self, result, expected_success=False, expected_detail=FAKE_ERROR)
+
+    async def test_does_not_use_nested_event_loop(self):
+        loop = asyncio.get_running_loop()
+
+        async def func():
+            self.assertIs(loop, asyncio.get_running_loop())
+            return 1
+
+        result = await AsyncResult(func()).on_success(lambda value: func()).on_success(func)
+        assert_result(self, result, expected_success=True, expected_value=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+# pylint: disable=all
+
+import threading
+import time
+import unittest
+
+from on_rails.CircuitBreaker import CircuitBreaker, CircuitState
+from on_rails.Result import Result
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.Errors.ServiceUnavailableError import \
+    ServiceUnavailableError
+from on_rails.test_helpers import assert_result_with_type
+
+OK = Result.ok(1)
+FAIL = Result.fail(ErrorDetail())
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_init_give_invalid_args(self):
+        self.assertRaises(ValueError, CircuitBreaker, failure_threshold=0)
+        self.assertRaises(ValueError, CircuitBreaker, failure_threshold=1.5)
+        self.assertRaises(ValueError, CircuitBreaker, window_size=0)
+        self.assertRaises(ValueError, CircuitBreaker, half_open_max_calls=0)
+        self.assertRaises(ValueError, CircuitBreaker, window_size=5, min_calls=6)
+        self.assertRaises(ValueError, CircuitBreaker, recovery_timeout=-1)
+        self.assertRaises(ValueError, CircuitBreaker, is_failure="not callable")
+
+    def test_open_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=0.5, window_size=4, min_calls=4)
+        for result in [FAIL, FAIL, FAIL]:  # Not enough calls
+            self.assertTrue(breaker.allow_request())
+            breaker.record_result(result)
+        self.assertEqual(CircuitState.CLOSED, breaker.state)
+
+        breaker.record_result(OK)
+        self.assertEqual(CircuitState.OPEN, breaker.state)
+        self.assertFalse(breaker.allow_request())
+
+        result = breaker.get_open_result()
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=ServiceUnavailableError)
+        self.assertEqual(503, result.code())
+        self.assertEqual(0, len(result.detail.stack_trace))
+
+    def test_rolling_window(self):
+        breaker = CircuitBreaker(failure_threshold=0.75, window_size=4, min_calls=4)
+        for result in [FAIL, FAIL, OK, OK, FAIL, FAIL]:  # The first failures leave the window
+            breaker.record_result(result)
+        self.assertEqual(CircuitState.CLOSED, breaker.state)
+
+        breaker.record_result(FAIL)
+        self.assertEqual(CircuitState.OPEN, breaker.state)
+
+    def test_half_open(self):
+        breaker = CircuitBreaker(window_size=1, min_calls=1, recovery_timeout=0.01, half_open_max_calls=2)
+        breaker.record_result(FAIL)
+        self.assertFalse(breaker.allow_request())
+
+        time.sleep(0.02)
+        self.assertEqual(CircuitState.HALF_OPEN, breaker.state)
+        first_trial = breaker.allow_request()
+        second_trial = breaker.allow_request()
+        self.assertIsNotNone(first_trial)
+        self.assertIsNotNone(second_trial)
+        self.assertIsNone(breaker.allow_request())
+        breaker.record_result(OK, first_trial)
+        self.assertEqual(CircuitState.HALF_OPEN, breaker.state)
+        breaker.record_result(OK, second_trial)
+        self.assertEqual(CircuitState.CLOSED, breaker.state)
+
+        breaker.record_result(FAIL)
+        time.sleep(0.02)
+        trial = breaker.allow_request()
+        self.assertIsNotNone(trial)
+        breaker.record_result(FAIL, trial)
+        self.assertEqual(CircuitState.OPEN, breaker.state)
+
+    def test_half_open_ignores_stale_results(self):
+        breaker = CircuitBreaker(window_size=1, min_calls=1, recovery_timeout=0.01)
+        closed_call = breaker.allow_request()
+        breaker.record_result(FAIL)
+        time.sleep(0.02)
+        old_trial = breaker.allow_request()
+        self.assertEqual(CircuitState.HALF_OPEN, breaker.state)
+
+        breaker.record_result(OK, closed_call)  # Allowed while closed
+        breaker.record_result(OK)
+        self.assertEqual(CircuitState.HALF_OPEN, breaker.state)
+
+        breaker.record_result(FAIL, old_trial)
+        time.sleep(0.02)
+        trial = breaker.allow_request()
+        breaker.record_result(FAIL, old_trial)  # A trial of the previous half-open period
+        breaker.release_trial(old_trial)
+        self.assertEqual(CircuitState.HALF_OPEN, breaker.state)
+        self.assertIsNone(breaker.allow_request())
+        breaker.record_result(OK, trial)
+        self.assertEqual(CircuitState.CLOSED, breaker.state)
+
+        breaker.record_result(FAIL, trial)  # A trial result is not recorded while closed
+        self.assertEqual(CircuitState.CLOSED, breaker.state)
+
+    def test_release_trial(self):
+        breaker = CircuitBreaker(window_size=1, min_calls=1, recovery_timeout=0.01)
+        breaker.record_result(FAIL)
+        breaker.release_trial()  # Nothing to release while open
+        self.assertFalse(breaker.allow_request())
+
+        time.sleep(0.02)
+        breaker.release_trial()
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        breaker.release_trial()
+        trial = breaker.allow_request()
+        self.assertIsNotNone(trial)
+        breaker.record_result(OK, trial)
+        self.assertEqual(CircuitState.CLOSED, breaker.state)
+
+    def test_ignore_results_while_open(self):
+        breaker = CircuitBreaker(window_size=1, min_calls=1)
+        breaker.record_result(FAIL)
+        breaker.record_result(OK)
+        self.assertEqual(CircuitState.OPEN, breaker.state)
+
+        breaker.reset()
+        self.assertEqual(CircuitState.CLOSED, breaker.state)
+        self.assertTrue(breaker.allow_request())
+
+    def test_is_failure(self):
+        breaker = CircuitBreaker(window_size=1, min_calls=1, is_failure=lambda result: result.code() >= 500)
+        breaker.record_result(Result.fail(ErrorDetail(code=400)))
+        self.assertEqual(CircuitState.CLOSED, breaker.state)
+        breaker.record_result(FAIL)
+        self.assertEqual(CircuitState.OPEN, breaker.state)
+
+    def test_thread_safety(self):
+        breaker = CircuitBreaker(failure_threshold=1, window_size=1000, min_calls=1000)
+
+        def record():
+            for _ in range(250):
+                breaker.record_result(FAIL)
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(CircuitState.OPEN, breaker.state)
+
+
+if __name__ == '__main__':
+    unittest.main()
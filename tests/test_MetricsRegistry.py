@@ -0,0 +1,169 @@
+# pylint: disable=all
+
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from on_rails import instrument
+from on_rails.decorator import def_result
+from on_rails.MetricsRegistry import (FunctionMetrics, LatencyHistogram,
+                                      MetricsRegistry, StepMetrics)
+from on_rails.Result import Result
+from on_rails.ResultDetails.Errors.NotFoundError import NotFoundError
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_empty(self):
+        snapshot = LatencyHistogram().snapshot()
+        self.assertEqual((0, 0, 0, 0, ()), snapshot)
+        self.assertEqual(0, snapshot.percentile(99))
+
+    def test_record(self):
+        histogram = LatencyHistogram()
+        for value in (5, 16, 17, 1000, -1):
+            histogram.record(value)
+        snapshot = histogram.snapshot()
+        self.assertEqual(5, snapshot.count)
+        self.assertEqual(1038, snapshot.sum_ns)
+        self.assertEqual(0, snapshot.min_ns)
+        self.assertEqual(1000, snapshot.max_ns)
+        self.assertEqual(((0, 1), (5, 1), (17, 2), (1023, 1)), snapshot.buckets)
+
+    def test_percentile(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(value * 1000)
+        snapshot = histogram.snapshot()
+        for percent in (1, 50, 90, 99):
+            expected = percent * 10 * 1000
+            self.assertLessEqual(expected, snapshot.percentile(percent))
+            self.assertLessEqual(snapshot.percentile(percent), expected * 1.125)
+        self.assertEqual(1023, snapshot.percentile(0))
+        self.assertEqual(1_000_000, snapshot.percentile(100))
+        self.assertRaises(ValueError, snapshot.percentile, 101)
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def tearDown(self):
+        instrument.set_observer(None)
+
+    def test_record_call(self):
+        self.registry.record_call('func', Result.ok(1), 1000)
+        self.registry.record_call('func', Result.fail(NotFoundError()), 3000)
+        self.registry.record_call('func', Result.fail(), 2000)
+
+        metrics = self.registry.snapshot().functions['func']
+        self.assertIsInstance(metrics, FunctionMetrics)
+        self.assertEqual((3, 1, 2), metrics[:3])
+        self.assertEqual({(True, ''): 1, (False, 'NotFoundError'): 1, (False, ''): 1}, metrics.results)
+        self.assertEqual(3, metrics.latency.count)
+        self.assertEqual(6000, metrics.latency.sum_ns)
+
+    def test_def_result(self):
+        attempts = []
+
+        @def_result(num_of_try=3, metrics=self.registry)
+        def func(fail_times):
+            attempts.append(1)
+            if len(attempts) <= fail_times:
+                raise Exception("fake")
+            return Result.fail(NotFoundError()) if fail_times < 0 else len(attempts)
+
+        instrument.set_observer(self.registry)
+        self.assertEqual(3, func(2).value)
+        attempts.clear()
+        self.assertFalse(func(-1).success)
+
+        snapshot = self.registry.snapshot()
+        metrics = snapshot.functions[func.__qualname__]
+        self.assertEqual((2, 1, 1), metrics[:3])
+        self.assertEqual({(True, ''): 1, (False, 'NotFoundError'): 1}, metrics.results)
+        self.assertEqual(StepMetrics(attempts=4, retries=2, failures=3),
+                         snapshot.steps[('def_result', func.__qualname__)])
+
+    def test_def_result_with_another_observer(self):
+        observer = mock.Mock(spec=instrument.Observer)
+        instrument.set_observer(observer)
+        attempts = []
+
+        @def_result(num_of_try=3, metrics=self.registry)
+        def func():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise Exception("fake")
+            return len(attempts)
+
+        @def_result(num_of_try=2, metrics=self.registry)
+        async def func_async():
+            raise Exception("fake")
+
+        self.assertEqual(3, func().value)
+        self.assertFalse(asyncio.run(func_async()).success)
+
+        steps = self.registry.snapshot().steps
+        self.assertEqual(StepMetrics(attempts=3, retries=2, failures=2), steps[('def_result', func.__qualname__)])
+        self.assertEqual(StepMetrics(attempts=2, retries=1, failures=2),
+                         steps[('def_result', func_async.__qualname__)])
+        self.assertEqual(5, observer.on_step_end.call_count)
+
+    def test_def_result_async(self):
+        @def_result(metrics=self.registry)
+        async def func():
+            return 1
+
+        self.assertEqual(1, asyncio.run(func()).value)
+        self.assertEqual(1, self.registry.snapshot().functions[func.__qualname__].calls)
+
+    def test_reset(self):
+        self.registry.record_call('func', Result.ok(), 1)
+        self.registry.reset()
+        self.assertEqual(({}, {}), self.registry.snapshot())
+
+    def test_to_prometheus(self):
+        self.registry.record_call('func', Result.ok(), 2_000_000)
+        self.registry.record_call('func', Result.fail(NotFoundError()), 20_000_000)
+        self.registry.record_call('a "quoted"\nname', Result.ok(), 1)
+        instrument.set_observer(self.registry)
+        Result.ok().on_success(lambda: None)
+
+        text = self.registry.to_prometheus(buckets=[0.001, 0.01, 0.1])
+        lines = text.splitlines()
+        self.assertIn('# TYPE on_rails_calls_total counter', lines)
+        self.assertIn('on_rails_calls_total{function="func"} 2', lines)
+        self.assertIn('on_rails_calls_total{function="a \\"quoted\\"\\nname"} 1', lines)
+        self.assertIn('on_rails_results_total{function="func",success="false",detail="NotFoundError"} 1', lines)
+        self.assertIn('on_rails_results_total{function="func",success="true",detail=""} 1', lines)
+        self.assertIn('# TYPE on_rails_call_duration_seconds histogram', lines)
+        self.assertIn('on_rails_call_duration_seconds_bucket{function="func",le="0.001"} 0', lines)
+        self.assertIn('on_rails_call_duration_seconds_bucket{function="func",le="0.01"} 1', lines)
+        self.assertIn('on_rails_call_duration_seconds_bucket{function="func",le="0.1"} 2', lines)
+        self.assertIn('on_rails_call_duration_seconds_bucket{function="func",le="+Inf"} 2', lines)
+        self.assertIn('on_rails_call_duration_seconds_sum{function="func"} 0.022', lines)
+        self.assertIn('on_rails_call_duration_seconds_count{function="func"} 2', lines)
+        self.assertIn('on_rails_step_attempts_total{step="on_success",'
+                      'function="TestMetricsRegistry.test_to_prometheus.<locals>.<lambda>"} 1', lines)
+        self.assertTrue(text.endswith('\n'))
+
+        self.assertTrue(self.registry.to_prometheus(prefix='app').startswith('# HELP app_calls_total'))
+
+    def test_write_prometheus(self):
+        self.registry.record_call('func', Result.ok(), 1)
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'metrics.prom')
+            self.registry.write_prometheus(file_path)
+            with open(file_path, encoding='utf-8') as file:
+                self.assertEqual(self.registry.to_prometheus(), file.read())
+            self.assertEqual(['metrics.prom'], os.listdir(directory))
+
+            with mock.patch('on_rails.MetricsRegistry.os.replace', side_effect=OSError):
+                self.assertRaises(OSError, self.registry.write_prometheus, file_path)
+            self.assertEqual(['metrics.prom'], os.listdir(directory))
+
+
+if __name__ == '__main__':
+    unittest.main()
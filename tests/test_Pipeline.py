@@ -0,0 +1,325 @@
+# pylint: disable=all
+
+import asyncio
+import unittest
+
+from on_rails.BreakRailsMode import BreakRailsMode
+from on_rails.Pipeline import Pipeline
+from on_rails.Result import BreakFunctionException, BreakRailsException, Result
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.Errors.ValidationError import ValidationError
+from on_rails.test_helpers import (assert_error_detail, assert_result,
+                                   assert_result_with_type)
+
+FAKE_EXCEPTION = Exception("fake")
+FAKE_ERROR = ErrorDetail("fake")
+
+
+async def add_one_async(value):
+    await asyncio.sleep(0)
+    return value + 1
+
+
+def raise_exception():
+    raise FAKE_EXCEPTION
+
+
+def assert_copy_of_error(test_class, result, error):
+    assert_result_with_type(test_class, result, expected_success=False, expected_detail_type=type(error))
+    test_class.assertIsNot(error, result.detail)
+    test_class.assertEqual((error.title, error.stack_trace), (result.detail.title, result.detail.stack_trace))
+
+
+class TestPipeline(unittest.TestCase):
+    def test_run_without_steps(self):
+        pipeline = Pipeline()
+        self.assertEqual(0, len(pipeline))
+        assert_result(self, pipeline.run(), expected_success=True)
+        assert_result(self, pipeline.run(5), expected_success=True, expected_value=5)
+        assert_result(self, pipeline.run(Result.fail(FAKE_ERROR)), expected_success=False, expected_detail=FAKE_ERROR)
+
+    def test_run_many_times(self):
+        pipeline = Pipeline() \
+            .on_success(lambda value: value + 1) \
+            .on_success(lambda value, prev: prev.value * 2) \
+            .on_success(lambda: Result.ok("done"))
+        self.assertEqual(3, len(pipeline))
+        for i in range(3):
+            assert_result(self, pipeline.run(i), expected_success=True, expected_value="done")
+
+        pipeline = Pipeline().on_success(lambda value: value * 2)
+        self.assertEqual([0, 2, 4], [pipeline.run(i).value for i in range(3)])
+
+    def test_on_success(self):
+        pipeline = Pipeline().on_success(lambda value: Result.fail(FAKE_ERROR)).on_success(lambda: 1)
+        assert_result(self, pipeline.run(1), expected_success=False, expected_detail=FAKE_ERROR)
+
+        result = Pipeline().on_success(raise_exception).run()
+        assert_error_detail(self, result.detail, expected_title="An error occurred",
+                            expected_message='Operation failed with 1 attempts. The details of the 1 errors are stored in the '
+                                             'more_data field. At least one of the errors was an exception type, the first '
+                                             'exception being stored in the exception field.',
+                            expected_code=500, expected_exception=FAKE_EXCEPTION, expected_more_data=[FAKE_EXCEPTION])
+
+        result = Pipeline().on_success(lambda: Result.fail(FAKE_ERROR), try_only_on_exceptions=False).run()
+        self.assertEqual([FAKE_ERROR], result.detail.more_data)
+
+        result = Pipeline().on_success(lambda: Result.fail(), try_only_on_exceptions=False).run()
+        self.assertEqual([], result.detail.more_data)
+
+    def test_on_success_with_retry(self):
+        attempts = []
+
+        def func():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise FAKE_EXCEPTION
+            return len(attempts)
+
+        assert_result(self, Pipeline().on_success(func, num_of_try=3).run(), expected_success=True, expected_value=3)
+
+    def test_invalid_functions(self):
+        self.assertRaises(ValueError, Pipeline().on_success, None)
+        self.assertRaises(ValueError, Pipeline().on_success, lambda a, b, c: a)
+        self.assertRaises(ValueError, Pipeline().on_fail, lambda a, b: a)
+        self.assertRaises(ValueError, Pipeline().operate_when, "invalid", lambda: 1)
+
+        def unknown_signature():
+            pass
+
+        unknown_signature.__signature__ = "invalid"
+        self.assertRaises(ValueError, Pipeline().on_success, unknown_signature)
+
+    def test_on_success_tee(self):
+        pipeline = Pipeline().on_success_tee(lambda value: value + 1)
+        assert_result(self, pipeline.run(1), expected_success=True, expected_value=1)
+
+        pipeline = Pipeline().on_success_tee(lambda: Result.fail(FAKE_ERROR))
+        assert_result(self, pipeline.run(1), expected_success=False, expected_detail=FAKE_ERROR)
+
+        pipeline = Pipeline().on_success_tee(lambda: Result.fail(FAKE_ERROR), ignore_errors=True)
+        assert_result(self, pipeline.run(1), expected_success=True, expected_value=1)
+
+    def test_on_success_operate_when(self):
+        pipeline = Pipeline().on_success_operate_when(lambda value: value > 1, lambda value: value * 10)
+        assert_result(self, pipeline.run(1), expected_success=True, expected_value=1)
+        assert_result(self, pipeline.run(2), expected_success=True, expected_value=20)
+        assert_result(self, pipeline.run(Result.fail(FAKE_ERROR)), expected_success=False, expected_detail=FAKE_ERROR)
+
+        pipeline = Pipeline().on_success_operate_when(lambda: Result.fail(FAKE_ERROR), lambda: 1)
+        assert_result(self, pipeline.run(1), expected_success=False, expected_detail=FAKE_ERROR)
+
+        pipeline = Pipeline().on_success_operate_when(True, lambda: 1, break_rails=True).on_success(lambda: 2)
+        assert_result(self, pipeline.run(), expected_success=True, expected_value=1)
+
+    def test_on_success_fail_when(self):
+        pipeline = Pipeline().on_success_fail_when(lambda value: value < 0, FAKE_ERROR)
+        assert_result(self, pipeline.run(1), expected_success=True, expected_value=1)
+        assert_copy_of_error(self, pipeline.run(-1), FAKE_ERROR)
+        assert_result(self, pipeline.run(Result.fail(FAKE_ERROR)), expected_success=False, expected_detail=FAKE_ERROR)
+
+        result = Pipeline().on_success_fail_when(True).run()
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=ErrorDetail)
+
+    def test_on_success_break_rails(self):
+        pipeline = Pipeline().on_success_break_rails(lambda value: value == 1).on_success(lambda: 2)
+        assert_result(self, pipeline.run(1), expected_success=True, expected_value=1)
+        assert_result(self, pipeline.run(3), expected_success=True, expected_value=2)
+
+        pipeline = Pipeline().on_success_break_rails(lambda: Result.fail(FAKE_ERROR))
+        assert_result(self, pipeline.run(1), expected_success=False, expected_detail=FAKE_ERROR)
+
+        pipeline = Pipeline().on_success_break_rails().on_fail(lambda: 2)
+        assert_result(self, pipeline.run(Result.fail(FAKE_ERROR)), expected_success=True, expected_value=2)
+
+    def test_on_fail(self):
+        pipeline = Pipeline().on_fail(lambda prev: prev.detail.title)
+        assert_result(self, pipeline.run(Result.fail(FAKE_ERROR)), expected_success=True, expected_value="fake")
+        assert_result(self, pipeline.run(1), expected_success=True, expected_value=1)
+
+        pipeline = Pipeline().on_fail(lambda: None)
+        assert_result(self, pipeline.run(Result.fail(FAKE_ERROR)), expected_success=False)
+
+    def test_on_fail_tee(self):
+        calls = []
+        pipeline = Pipeline().on_fail_tee(lambda prev: calls.append(prev.detail))
+        assert_result(self, pipeline.run(Result.fail(FAKE_ERROR)), expected_success=False, expected_detail=FAKE_ERROR)
+        assert_result(self, pipeline.run(1), expected_success=True, expected_value=1)
+        self.assertEqual([FAKE_ERROR], calls)
+
+    def test_on_fail_operate_when(self):
+        pipeline = Pipeline().on_fail_operate_when(lambda prev: prev.detail is FAKE_ERROR, lambda: 5)
+        assert_result(self, pipeline.run(Result.fail(FAKE_ERROR)), expected_success=True, expected_value=5)
+        assert_result(self, pipeline.run(1), expected_success=True, expected_value=1)
+
+        pipeline = Pipeline().on_fail_operate_when(True, lambda: None)
+        assert_result(self, pipeline.run(Result.fail(FAKE_ERROR)), expected_success=False)
+
+    def test_on_fail_break_rails(self):
+        pipeline = Pipeline().on_fail_break_rails().on_fail(lambda: 1)
+        assert_result(self, pipeline.run(Result.fail(FAKE_ERROR)), expected_success=False, expected_detail=FAKE_ERROR)
+        assert_result(self, pipeline.run(2), expected_success=True, expected_value=2)
+
+    def test_operate_when(self):
+        pipeline = Pipeline().operate_when(lambda prev: 'not bool', lambda prev: prev.success)
+        assert_result(self, pipeline.run(Result.fail(FAKE_ERROR)), expected_success=True, expected_value=False)
+
+        pipeline = Pipeline().operate_when(False, lambda: 1)
+        assert_result(self, pipeline.run(2), expected_success=True, expected_value=2)
+
+    def test_fail_when(self):
+        error = ErrorDetail()
+        pipeline = Pipeline().fail_when(lambda prev: prev.value == 1, error, add_prev_detail=True)
+        for _ in range(2):
+            prev = Result.ok(1, detail=ErrorDetail("prev"))
+            result = pipeline.run(prev)
+            self.assertFalse(result.success)
+            self.assertEqual([{"prev_detail": prev.detail}], result.detail.more_data)
+        self.assertEqual([], error.more_data)
+
+        assert_copy_of_error(self, Pipeline().fail_when(True, error).run(), error)
+
+    def test_fail_when_copies_error_detail(self):
+        error = ValidationError(errors={'key': 'value'})
+        for pipeline in (Pipeline().fail_when(True, error), Pipeline().on_success_fail_when(True, error)):
+            for n in range(3):
+                result = pipeline.run(None).on_fail_add_more_data(f"req{n}")
+                result.detail.add_or_update_error('run', str(n))
+                self.assertIsNot(error, result.detail)
+                self.assertEqual([f"req{n}"], result.detail.more_data)
+                self.assertEqual({'key': 'value', 'run': str(n)}, result.detail.errors)
+        self.assertEqual(([], {'key': 'value'}), (error.more_data, error.errors))
+
+        result = Pipeline().fail_when(True, ErrorDetail(more_data=[1])).run()
+        self.assertEqual(([1], None), (result.detail.more_data, result.detail.errors))
+
+    def test_break_rails(self):
+        pipeline = Pipeline().break_rails(lambda prev: not prev.success).on_fail(lambda: 1)
+        assert_result(self, pipeline.run(Result.fail(FAKE_ERROR)), expected_success=False, expected_detail=FAKE_ERROR)
+
+        pipeline = Pipeline().on_success(lambda: Result.ok(1).break_rails()).on_success(lambda: 2)
+        assert_result(self, pipeline.run(), expected_success=True, expected_value=2)
+
+    def test_break_rails_sentinel_mode_in_function(self):
+        pipeline = Pipeline() \
+            .on_success(lambda value: Result.ok(value).break_rails(mode=BreakRailsMode.SENTINEL)) \
+            .on_success(lambda value: value + 1)
+        result = pipeline.run(1)
+        assert_result(self, result, expected_success=True, expected_value=2)
+        self.assertFalse(result.is_broken)
+
+    def test_break_function(self):
+        pipeline = Pipeline().on_success(lambda value, prev: prev.break_function())
+        self.assertRaises(BreakFunctionException, pipeline.run)
+
+    def test_finally_tee(self):
+        calls = []
+        pipeline = Pipeline().finally_tee(lambda prev: calls.append(prev.success))
+        assert_result(self, pipeline.run(1), expected_success=True, expected_value=1)
+        assert_result(self, pipeline.run(Result.fail(FAKE_ERROR)), expected_success=False, expected_detail=FAKE_ERROR)
+        self.assertEqual([True, False], calls)
+
+        pipeline = Pipeline().finally_tee(lambda: Result.fail(FAKE_ERROR))
+        assert_result(self, pipeline.run(1), expected_success=False, expected_detail=FAKE_ERROR)
+
+    def test_same_result_as_chain(self):
+        def chain(value):
+            return Result.ok(value) \
+                .on_success(lambda v: v * 2) \
+                .on_success_tee(lambda v: None) \
+                .fail_when(lambda prev: prev.value > 10, ValidationError()) \
+                .on_fail(lambda prev: prev.detail.title)
+
+        pipeline = Pipeline() \
+            .on_success(lambda v: v * 2) \
+            .on_success_tee(lambda v: None) \
+            .fail_when(lambda prev: prev.value > 10, ValidationError()) \
+            .on_fail(lambda prev: prev.detail.title)
+
+        for value in [1, 4, 6, 100]:
+            expected = chain(value)
+            result = pipeline.run(value)
+            self.assertEqual(expected.success, result.success)
+            self.assertEqual(expected.value, result.value)
+
+    def test_async_function_in_sync_run(self):
+        assert_result(self, Pipeline().on_success(add_one_async).run(1), expected_success=True, expected_value=2)
+
+
+class TestPipelineAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_run_async(self):
+        pipeline = Pipeline() \
+            .on_success(add_one_async) \
+            .on_success_tee(add_one_async) \
+            .on_success_operate_when(lambda value: value > 1, add_one_async) \
+            .on_success_fail_when(lambda value: value > 100, FAKE_ERROR) \
+            .on_success_break_rails(lambda value: value == 3) \
+            .finally_tee(lambda: None)
+        assert_result(self, await pipeline.run_async(1), expected_success=True, expected_value=3)
+        assert_result(self, await pipeline.run_async(add_one_async(0)), expected_success=True, expected_value=3)
+        assert_copy_of_error(self, await pipeline.run_async(99), FAKE_ERROR)
+
+    async def test_run_async_on_fail(self):
+        async def fail_async():
+            return Result.fail(FAKE_ERROR)
+
+        pipeline = Pipeline() \
+            .on_fail_tee(fail_async, ignore_errors=True) \
+            .on_fail_operate_when(lambda: False, lambda: 1) \
+            .on_fail_break_rails(lambda prev: prev.detail is FAKE_ERROR) \
+            .on_fail(lambda: 2)
+        assert_result(self, await pipeline.run_async(Result.fail(FAKE_ERROR)),
+                      expected_success=False, expected_detail=FAKE_ERROR)
+        assert_result(self, await pipeline.run_async(Result.fail(ErrorDetail())), expected_success=True,
+                      expected_value=2)
+
+        pipeline = Pipeline().operate_when(True, fail_async).break_rails(True).fail_when(True)
+        assert_result(self, await pipeline.run_async(), expected_success=False, expected_detail=FAKE_ERROR)
+
+        pipeline = Pipeline().on_fail_operate_when(fail_async, lambda: 1)
+        assert_result(self, await pipeline.run_async(Result.fail()), expected_success=False, expected_detail=FAKE_ERROR)
+
+    async def test_run_async_exceptions_and_retry(self):
+        attempts = []
+
+        async def func():
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise FAKE_EXCEPTION
+            return Result.ok(1).break_rails()
+
+        assert_result(self, await Pipeline().on_success(func, num_of_try=2).run_async(),
+                      expected_success=True, expected_value=1)
+
+        result = await Pipeline().on_success(raise_exception).run_async()
+        self.assertEqual([FAKE_EXCEPTION], result.detail.more_data)
+
+        with self.assertRaises(BreakFunctionException):
+            await Pipeline().on_success(lambda value, prev: prev.break_function()).run_async()
+
+        async def break_rails_async():
+            raise BreakRailsException(Result.ok(2))
+
+        assert_result(self, await Pipeline().on_success(break_rails_async).on_success(lambda: 3).run_async(),
+                      expected_success=True, expected_value=3)
+
+    async def test_run_async_skipped_steps(self):
+        pipeline = Pipeline() \
+            .on_fail(lambda: 1) \
+            .on_fail_operate_when(True, lambda: 1) \
+            .on_fail_break_rails() \
+            .on_success_fail_when(lambda: Result.fail(FAKE_ERROR))
+        assert_result(self, await pipeline.run_async(1), expected_success=False, expected_detail=FAKE_ERROR)
+
+        pipeline = Pipeline() \
+            .on_success(lambda: 1) \
+            .on_success_operate_when(True, lambda: 1) \
+            .on_success_break_rails() \
+            .on_success_fail_when(True) \
+            .break_rails(lambda: Result.fail(FAKE_ERROR))
+        assert_result(self, await pipeline.run_async(Result.fail()), expected_success=False,
+                      expected_detail=FAKE_ERROR)
+
+
+if __name__ == '__main__':
+    unittest.main()
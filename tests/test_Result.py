@@ -1,17 +1,28 @@
 # pylint: disable=all
 
 import asyncio
+import copy
+import pickle
+import threading
+import time
 import unittest
 from typing import Optional
 
+from on_rails.BreakRailsMode import (BreakRailsMode,
+                                     get_default_break_rails_mode,
+                                     set_default_break_rails_mode)
 from on_rails.Result import (BreakFunctionException, BreakRailsException,
                              Result, _get_num_of_function_parameters, try_func,
                              try_func_async)
 from on_rails.ResultDetail import ResultDetail
 from on_rails.ResultDetails.ErrorDetail import ErrorDetail
 from on_rails.ResultDetails.Errors.BadRequestError import BadRequestError
+from on_rails.ResultDetails.Errors.GatewayTimeoutError import \
+    GatewayTimeoutError
 from on_rails.ResultDetails.Errors.ValidationError import ValidationError
 from on_rails.ResultDetails.SuccessDetail import SuccessDetail
+from on_rails.RetryPolicy import JitterMode, RetryPolicy
+from on_rails.serialization import dumps
 from on_rails.test_helpers import assert_result, assert_result_detail
 from tests.helpers import (assert_error_detail, assert_exception,
                            assert_invalid_func, assert_result_with_type)
@@ -43,6 +54,16 @@ async def async_function_with_parameter(number: int):
     return number + 1
 
 
+def square_or_fail(value):
+    if value < 0:
+        raise ValueError("negative value")
+    return value * value
+
+
+def break_function(value):
+    return Result.ok(value).break_function()
+
+
 class TestResult(unittest.TestCase):
     # region Generic
 
@@ -59,6 +80,20 @@ class TestResult(unittest.TestCase):
 
     # region __init__
 
+    def test_slots(self):
+        result = Result.ok(1)
+        self.assertFalse(hasattr(result, '__dict__'))
+        with self.assertRaises(AttributeError):
+            result.custom = 1
+
+        # Subclasses without __slots__ can have custom attributes
+        class CustomResult(Result):
+            pass
+
+        result = CustomResult(True, value=1)
+        result.custom = 1
+        self.assertEqual(1, result.custom)
+
     def test_init_without_optional_args(self):
         result = Result(True)
 
@@ -73,6 +108,50 @@ class TestResult(unittest.TestCase):
 
     # endregion
 
+    # region shared empty results
+
+    def test_empty_results_are_shared(self):
+        self.assertIs(Result.ok(), Result.ok())
+        self.assertIs(Result.fail(), Result.fail())
+        self.assertIs(Result.ok(), Result.convert_to_result(None))
+        self.assertIs(Result.fail(), Result.convert_to_result(None, none_means_success=False))
+        self.assertIsNot(Result.ok(), Result.ok(0))
+        self.assertIsNot(Result.fail(), Result.fail(FAKE_ERROR))
+
+    def test_empty_results_are_frozen(self):
+        with self.assertRaises(AttributeError):
+            Result.ok().value = 1
+        with self.assertRaises(AttributeError):
+            Result.fail().detail = FAKE_ERROR
+        with self.assertRaises(AttributeError):
+            del Result.ok().success
+
+        self.assertIs(Result.ok(), copy.copy(Result.ok()))
+        self.assertIs(Result.fail(), copy.deepcopy(Result.fail()))
+        self.assertIs(Result.fail(), pickle.loads(pickle.dumps(Result.fail())))
+
+    def test_empty_results_copy_on_write(self):
+        result = Result.ok().on_success_add_more_data("data")
+        self.assertIsNot(Result.ok(), result)
+        assert_result_detail(self, result.detail, expected_title="Operation was successful", expected_code=200,
+                             expected_more_data=["data"])
+
+        detail = SuccessDetail()
+        result = Result.ok().on_success_new_detail(detail)
+        assert_result(self, result, expected_success=True, expected_detail=detail)
+
+        result = Result.fail().on_fail_add_more_data("data")
+        self.assertIsNot(Result.fail(), result)
+        self.assertEqual(["data"], result.detail.more_data)
+
+        result = Result.fail().on_fail_new_detail(FAKE_ERROR)
+        assert_result(self, result, expected_success=False, expected_detail=FAKE_ERROR)
+
+        assert_result(self, Result.ok(), expected_success=True)
+        assert_result(self, Result.fail(), expected_success=False)
+
+    # endregion
+
     # region ok
 
     def test_ok_without_optional_args(self):
@@ -87,6 +166,68 @@ class TestResult(unittest.TestCase):
 
         assert_result(self, target_result=result, expected_success=True, expected_detail=detail, expected_value=value)
 
+    def test_pickle(self):
+        for result in [Result.ok(1, SuccessDetail()), Result.fail(ValidationError(exception=FAKE_EXCEPTION)),
+                       Result.ok(1).break_rails(mode=BreakRailsMode.SENTINEL)]:
+            new = pickle.loads(pickle.dumps(result))
+            self.assertIs(type(result), type(new))
+            self.assertEqual((result.success, result.value), (new.success, new.value))
+            self.assertIs(type(result.detail), type(new.detail))
+
+        exception = pickle.loads(pickle.dumps(BreakRailsException(Result.ok(1))))
+        assert_result(self, exception.result, expected_success=True, expected_value=1)
+        exception = pickle.loads(pickle.dumps(BreakFunctionException(Result.ok(1))))
+        assert_result(self, exception.result, expected_success=True, expected_value=1)
+
+    def test_to_dict(self):
+        self.assertEqual({'success': True, 'value': [1, {'a': 2}], 'detail': None},
+                         Result.ok((1, {'a': 2})).to_dict())
+
+        data = Result.fail(ValidationError(exception=FAKE_EXCEPTION)).to_dict()
+        self.assertEqual((False, None, 'ValidationError'), (data['success'], data['value'], data['detail']['type']))
+        self.assertNotIn('stack_trace', data['detail'])
+        self.assertIn('stack_trace', Result.fail(ErrorDetail()).to_dict(include_stack_trace=True)['detail'])
+
+        data = Result.ok(Result.ok(1, SuccessDetail())).to_dict()
+        self.assertEqual('SuccessDetail', data['value']['detail']['type'])
+
+    def test_from_dict(self):
+        result = Result.from_dict(Result.fail(ValidationError(errors={'a': 'b'})).to_dict())
+        self.assertFalse(result.success)
+        self.assertIsInstance(result.detail, ValidationError)
+        self.assertEqual({'a': 'b'}, result.detail.errors)
+
+        result = Result.from_dict({'success': True, 'value': 1})
+        self.assertEqual((True, 1, None), (result.success, result.value, result.detail))
+
+        # The unknown details of failed results are errors.
+        self.assertIs(ErrorDetail, Result.from_dict({'success': False, 'detail': {'title': 't'}}).detail.__class__)
+        self.assertIs(SuccessDetail, Result.from_dict({'success': True, 'detail': {'title': 't', 'code': 500}})
+                      .detail.__class__)
+
+        for data in (None, {}, {'success': 1}, {'success': True, 'detail': {}}):
+            self.assertRaises(ValueError, Result.from_dict, data)
+
+    def test_from_dicts(self):
+        results = Result.from_dicts(iter([{'success': True, 'value': 1}, {'success': False}]))
+        self.assertEqual([(True, 1), (False, None)], [(result.success, result.value) for result in results])
+
+        with self.assertRaises(ValueError) as context:
+            Result.from_dicts([{'success': 1}, {'success': True}, {'success': False, 'detail': []}])
+        self.assertTrue(str(context.exception).startswith("2 of 3 results are not valid. [0] "))
+        self.assertIn("[2] The detail must be a dictionary, not list.", str(context.exception))
+
+    def test_from_json(self):
+        result = Result.from_json(dumps(Result.fail(ValidationError(message='ü'))))
+        self.assertEqual((ValidationError, 'ü'), (result.detail.__class__, result.detail.message))
+
+        results = Result.from_json(dumps([Result.ok(1), Result.fail()]).encode())
+        self.assertEqual([True, False], [result.success for result in results])
+
+        self.assertTrue(Result.from_json('ok', decoder=lambda text: {'success': True}).success)
+        self.assertRaises(ValueError, Result.from_json, '{"success": "true"}')
+        self.assertRaises(ValueError, Result.from_json, 'not json')
+
     # endregion
 
     # region fail
@@ -104,6 +245,146 @@ class TestResult(unittest.TestCase):
 
     # endregion
 
+    # region batch methods
+
+    def test_all(self):
+        assert_result(self, Result.all([Result.ok(1), 2, None]), expected_success=True)
+        assert_result(self, Result.all([]), expected_success=True)
+
+        consumed = []
+
+        def results():
+            for result in [Result.ok(1), Result.fail(FAKE_ERROR), Result.ok(3)]:
+                consumed.append(result)
+                yield result
+
+        assert_result(self, Result.all(results()), expected_success=False, expected_detail=FAKE_ERROR)
+        self.assertEqual(2, len(consumed))
+
+    def test_any(self):
+        error = ErrorDetail()
+        assert_result(self, Result.any(iter([Result.fail(error), Result.ok(2)])), expected_success=True)
+
+        result = Result.any([Result.fail(error), Result.fail(FAKE_ERROR)])
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=ErrorDetail)
+        self.assertEqual([error, FAKE_ERROR], result.detail.more_data)
+
+        self.assertFalse(Result.any([]).success)
+
+    def test_first_success(self):
+        consumed = []
+
+        def results():
+            for result in [Result.fail(FAKE_ERROR), Result.ok(2), Result.ok(3)]:
+                consumed.append(result)
+                yield result
+
+        assert_result(self, Result.first_success(results()), expected_success=True, expected_value=2)
+        self.assertEqual(2, len(consumed))
+
+        result = Result.first_success([Result.fail(ErrorDetail(exception=FAKE_EXCEPTION)), Result.fail()])
+        self.assertFalse(result.success)
+        self.assertEqual(2, len(result.detail.more_data))
+        self.assertIs(FAKE_EXCEPTION, result.detail.exception)
+
+    def test_partition(self):
+        values, errors = Result.partition(x if x % 2 else Result.fail(FAKE_ERROR) for x in range(5))
+        self.assertEqual([1, 3], values)
+        self.assertEqual([FAKE_ERROR] * 3, errors)
+
+        self.assertEqual(([], []), Result.partition([]))
+
+    def test_collect(self):
+        assert_result(self, Result.collect(Result.ok(x) for x in range(3)), expected_success=True,
+                      expected_value=[0, 1, 2])
+        assert_result(self, Result.collect([]), expected_success=True, expected_value=[])
+
+        error = ErrorDetail()
+        result = Result.collect([Result.ok(1), Result.fail(FAKE_ERROR), Result.ok(3), Result.fail(error)])
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=ErrorDetail)
+        self.assertEqual([FAKE_ERROR, error], result.detail.more_data)
+        self.assertIn("2 of 4", result.detail.message)
+
+    def test_collect_fail_fast(self):
+        consumed = []
+
+        def results():
+            for result in [Result.ok(1), Result.fail(FAKE_ERROR), Result.ok(3)]:
+                consumed.append(result)
+                yield result
+
+        result = Result.collect(results(), fail_fast=True)
+        assert_result(self, result, expected_success=False, expected_detail=FAKE_ERROR)
+        self.assertEqual(2, len(consumed))
+
+    def test_map_parallel(self):
+        results = Result.map_parallel(lambda x: x * 2, range(10), max_workers=3)
+        self.assertEqual([x * 2 for x in range(10)], [result.value for result in results])
+
+        results = list(Result.map_parallel(lambda x: x * 2, iter(range(10)), ordered=False))
+        self.assertEqual({x * 2 for x in range(10)}, {result.value for result in results})
+
+        self.assertEqual([], list(Result.map_parallel(lambda x: x, [])))
+
+    def test_map_parallel_runs_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        results = list(Result.map_parallel(lambda x: barrier.wait() is not None, [1, 2], max_workers=2))
+        self.assertTrue(all(result.success and result.value for result in results))
+
+    def test_map_parallel_like_try_func(self):
+        attempts = []
+
+        def func(item):
+            attempts.append(item)
+            if attempts.count(item) < 2:
+                raise FAKE_EXCEPTION
+            return item
+
+        results = list(Result.map_parallel(func, [1, 2], num_of_try=2))
+        self.assertEqual([1, 2], [result.value for result in results])
+
+        result = next(Result.map_parallel(function_raise_exception, [1], max_workers=1))
+        self.assertIs(FAKE_EXCEPTION, result.detail.exception)
+
+        result = next(Result.map_parallel(lambda a, b: a, [1]))
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=ValidationError)
+
+        result = next(Result.map_parallel(lambda x: Result.ok(x).break_rails(), [1]))
+        assert_result(self, result, expected_success=True, expected_value=1)
+
+        with self.assertRaises(BreakFunctionException):
+            list(Result.map_parallel(lambda x: Result.ok(x).break_function(), [1]))
+
+        assert_invalid_func(self, next(Result.map_parallel(None, [1])))
+
+        self.assertRaises(ValueError, Result.map_parallel, lambda x: x, [1], max_workers=0)
+
+    def test_map_processes(self):
+        results = list(Result.map_processes(square_or_fail, range(-2, 5), max_workers=2, chunksize=3))
+        self.assertEqual([None, None, 0, 1, 4, 9, 16], [result.value for result in results])
+        self.assertEqual([False, False], [result.success for result in results[:2]])
+        self.assertIsInstance(results[0].detail.exception, ValueError)
+        self.assertEqual(0, len(results[0].detail.stack_trace))
+
+        results = list(Result.map_processes(square_or_fail, range(5), max_workers=2, ordered=False))
+        self.assertEqual({0, 1, 4, 9, 16}, {result.value for result in results})
+
+        with self.assertRaises(BreakFunctionException) as context:
+            list(Result.map_processes(break_function, [1], max_workers=1))
+        assert_result(self, context.exception.result, expected_success=True, expected_value=1)
+
+        self.assertRaises(ValueError, Result.map_processes, square_or_fail, [1], max_workers=0)
+        self.assertRaises(ValueError, Result.map_processes, square_or_fail, [1], chunksize=0)
+
+    def test_map_parallel_close_cancels_pending_items(self):
+        calls = []
+        results = Result.map_parallel(calls.append, range(100), max_workers=1)
+        next(results)
+        results.close()
+        self.assertLess(len(calls), 100)
+
+    # endregion
+
     # region code
 
     def test_code_without_detail_and_without_args(self):
@@ -1121,6 +1402,105 @@ class TestResult(unittest.TestCase):
                                              'The details of the 2 errors are stored in the more_data field. ',
                             expected_code=500, expected_more_data=[FAKE_ERROR, FAKE_ERROR])
 
+    def test_try_func_with_retry_policy(self):
+        attempts = []
+
+        def func():
+            attempts.append(time.monotonic())
+            if len(attempts) < 3:
+                raise ValueError()
+            return len(attempts)
+
+        policy = RetryPolicy(base_delay=0.01, jitter=JitterMode.NONE)
+        result = try_func(func, num_of_try=3, retry_policy=policy)
+        assert_result(self, result, expected_success=True, expected_value=3)
+        self.assertTrue(attempts[1] - attempts[0] >= 0.01)
+        self.assertTrue(attempts[2] - attempts[1] >= 0.02)
+
+    def test_try_func_with_retry_policy_stops_retrying(self):
+        # The error is not retryable
+        policy = RetryPolicy(base_delay=0, retry_on=(TypeError,))
+        result = try_func(function_raise_exception, num_of_try=3, retry_policy=policy)
+        assert_error_detail(self, target_error_detail=result.detail, expected_title="An error occurred",
+                            expected_message='Operation failed with 1 attempts. The details of the 1 errors are stored in the '
+                                             'more_data field. At least one of the errors was an exception type, the first '
+                                             'exception being stored in the exception field.',
+                            expected_code=500, expected_exception=FAKE_EXCEPTION, expected_more_data=[FAKE_EXCEPTION])
+
+        # The deadline is exceeded
+        policy = RetryPolicy(base_delay=1, jitter=JitterMode.NONE, max_elapsed_time=0.5)
+        result = try_func(lambda: Result.fail(FAKE_ERROR), num_of_try=3, try_only_on_exceptions=False,
+                          retry_policy=policy)
+        assert_error_detail(self, target_error_detail=result.detail, expected_title="An error occurred",
+                            expected_message='Operation failed with 1 attempts. '
+                                             'The details of the 1 errors are stored in the more_data field. ',
+                            expected_code=500, expected_more_data=[FAKE_ERROR])
+
+    def test_try_func_with_timeout(self):
+        result = try_func(lambda: time.sleep(0.5), timeout=0.01)
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=GatewayTimeoutError)
+        self.assertEqual(504, result.code())
+        self.assertIsInstance(result.detail.exception, TimeoutError)
+
+        assert_result(self, try_func(lambda: 5, timeout=1), expected_success=True, expected_value=5)
+        assert_result(self, try_func(async_function, timeout=1), expected_success=True, expected_value=5)
+        assert_result(self, try_func(lambda: Result.ok(1).break_rails(), timeout=1), expected_success=True,
+                      expected_value=1)
+        self.assertIs(FAKE_EXCEPTION, try_func(function_raise_exception, timeout=1).detail.exception)
+
+        attempts = []
+
+        def func():
+            attempts.append(1)
+            time.sleep(0.5 if len(attempts) == 1 else 0)
+            return len(attempts)
+
+        assert_result(self, try_func(func, num_of_try=2, timeout=0.01), expected_success=True, expected_value=2)
+
+    def test_try_func_without_attempts(self):
+        for result in (try_func(lambda: 1, num_of_try=0), asyncio.run(try_func_async(async_function, num_of_try=0))):
+            self.assertFalse(result.success)
+            self.assertTrue(result.detail.message.startswith("Operation failed with 0 attempts."))
+
+    def test_try_func_with_deadline(self):
+        attempts = []
+
+        def func():
+            attempts.append(1)
+            time.sleep(0.02)
+            raise FAKE_EXCEPTION
+
+        started_at = time.monotonic()
+        result = try_func(func, num_of_try=100, deadline=0.1)
+        self.assertLess(time.monotonic() - started_at, 0.5)
+        self.assertLess(len(attempts), 100)
+        self.assertFalse(result.success)
+
+        result = try_func(lambda: time.sleep(0.5), num_of_try=3, timeout=1, deadline=0.05)
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=GatewayTimeoutError)
+        self.assertEqual(1, len(result.detail.more_data))
+
+        attempts.clear()
+        policy = RetryPolicy(base_delay=1, jitter=JitterMode.NONE)
+        result = try_func(func, num_of_try=3, retry_policy=policy, deadline=0.5)
+        self.assertFalse(result.success)
+        self.assertEqual(1, len(attempts))
+
+    def test_on_success_and_on_fail_with_retry_policy(self):
+        policy = RetryPolicy(base_delay=0, retry_on=(ValueError,))
+        attempts = []
+
+        def func():
+            attempts.append(1)
+            raise ValueError()
+
+        self.assertFalse(Result.ok().on_success(func, num_of_try=3, retry_policy=policy).success)
+        self.assertEqual(3, len(attempts))
+        self.assertFalse(Result.fail().on_fail(func, num_of_try=2, retry_policy=policy).success)
+        self.assertEqual(5, len(attempts))
+        self.assertFalse(Result.ok().try_func(lambda prev: func(), num_of_try=2, retry_policy=policy).success)
+        self.assertEqual(7, len(attempts))
+
     def test_try_func_give_builtin_functions(self):
         # The sum is supported builtin function
         result = try_func(sum)
@@ -1500,6 +1880,59 @@ class TestResult(unittest.TestCase):
         self.assertRaises(BreakRailsException,
                           lambda: Result.ok(1).break_rails(lambda prev_result: prev_result.value == 1))
 
+    def test_break_rails_sentinel_mode(self):
+        calls = []
+        result = Result.ok(1) \
+            .on_success_break_rails(mode=BreakRailsMode.SENTINEL) \
+            .on_success(lambda: calls.append(1)) \
+            .on_success_tee(lambda: calls.append(1)) \
+            .fail_when(True) \
+            .on_success_fail_when(True) \
+            .operate_when(True, lambda: calls.append(1)) \
+            .finally_tee(lambda: calls.append(1)) \
+            .try_func(lambda: calls.append(1)) \
+            .break_rails() \
+            .break_function()
+        assert_result(self, result, expected_success=True, expected_value=1)
+        self.assertTrue(result.is_broken)
+        self.assertEqual([], calls)
+
+        result = Result.fail(FAKE_ERROR) \
+            .on_fail_break_rails(mode=BreakRailsMode.SENTINEL) \
+            .on_fail(lambda: calls.append(1)) \
+            .on_fail_tee(lambda: calls.append(1)) \
+            .on_fail_add_more_data(1) \
+            .on_fail_new_detail(ErrorDetail()) \
+            .on_fail_operate_when(True, lambda: calls.append(1)) \
+            .on_fail_raise_exception()
+        assert_result(self, result, expected_success=False, expected_detail=FAKE_ERROR)
+        self.assertTrue(result.is_broken)
+        self.assertEqual([], calls)
+        self.assertEqual([], FAKE_ERROR.more_data)
+
+        # The shared empty result is not changed
+        self.assertTrue(Result.ok().break_rails(mode=BreakRailsMode.SENTINEL).is_broken)
+        self.assertFalse(Result.ok().is_broken)
+
+    def test_break_rails_sentinel_mode_stops_at_try_func(self):
+        result = Result.ok(1) \
+            .on_success(lambda value: Result.ok(value + 1).break_rails(mode=BreakRailsMode.SENTINEL)) \
+            .on_success(lambda value: value * 10)
+        assert_result(self, result, expected_success=True, expected_value=20)
+        self.assertFalse(result.is_broken)
+
+    def test_default_break_rails_mode(self):
+        self.assertEqual(BreakRailsMode.EXCEPTION, get_default_break_rails_mode())
+        try:
+            set_default_break_rails_mode(BreakRailsMode.SENTINEL)
+            result = Result.ok(1).on_success_operate_when(True, lambda: 2, break_rails=True).on_success(lambda: 3)
+            assert_result(self, result, expected_success=True, expected_value=2)
+            self.assertTrue(result.is_broken)
+        finally:
+            set_default_break_rails_mode(BreakRailsMode.EXCEPTION)
+
+        self.assertRaises(ValueError, set_default_break_rails_mode, 'sentinel')
+
     # endregion
 
     # region break_function
@@ -1635,6 +2068,44 @@ class TestResultAsync(unittest.IsolatedAsyncioTestCase):
                                              'The details of the 2 errors are stored in the more_data field. ',
                             expected_code=500, expected_more_data=[FAKE_ERROR, FAKE_ERROR])
 
+    async def test_try_func_async_with_retry_policy(self):
+        attempts = []
+
+        async def func():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ValueError()
+            return len(attempts)
+
+        policy = RetryPolicy(base_delay=0.001, retry_on=(ValueError,))
+        result = await try_func_async(func, num_of_try=3, retry_policy=policy)
+        assert_result(self, result, expected_success=True, expected_value=3)
+
+        result = await try_func_async(function_raise_exception_async, num_of_try=3, retry_policy=policy)
+        self.assertEqual([FAKE_EXCEPTION], result.detail.more_data)
+
+    async def test_try_func_async_with_timeout(self):
+        result = await try_func_async(lambda: asyncio.sleep(0.5), timeout=0.01)
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=GatewayTimeoutError)
+        self.assertIsInstance(result.detail.exception, TimeoutError)
+
+        assert_result(self, await try_func_async(async_function, timeout=1), expected_success=True, expected_value=5)
+        assert_result(self, await try_func_async(lambda: 5, timeout=0), expected_success=True, expected_value=5)
+
+        attempts = []
+
+        async def func():
+            attempts.append(1)
+            await asyncio.sleep(0.5 if len(attempts) == 1 else 0)
+            return len(attempts)
+
+        result = await try_func_async(func, num_of_try=2, timeout=0.01)
+        assert_result(self, result, expected_success=True, expected_value=2)
+
+        result = await try_func_async(lambda: asyncio.sleep(0.5), num_of_try=3, timeout=1, deadline=0.05)
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=GatewayTimeoutError)
+        self.assertEqual(1, len(result.detail.more_data))
+
     async def test_try_func_async_give_builtin_functions(self):
         # The sum is supported builtin function
         result = await try_func_async(sum)
@@ -0,0 +1,118 @@
+# pylint: disable=all
+
+import threading
+import time
+import unittest
+
+from on_rails.Result import Result
+from on_rails.ResultCache import ResultCache, ResultCacheInfo
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.SuccessDetail import SuccessDetail
+
+
+class TestResultCache(unittest.TestCase):
+    def test_init_give_invalid_args(self):
+        self.assertRaises(ValueError, ResultCache, maxsize=0)
+        self.assertRaises(ValueError, ResultCache, ttl=0)
+        self.assertRaises(ValueError, ResultCache, failure_ttl=-1)
+
+    def test_make_key(self):
+        self.assertEqual(ResultCache.make_key((1,), {'a': 1, 'b': 2}), ResultCache.make_key((1,), {'b': 2, 'a': 1}))
+        self.assertNotEqual(ResultCache.make_key((1,), {}), ResultCache.make_key((1,), {'a': 1}))
+        self.assertEqual((1, 2), ResultCache.make_key((1, 2), {}))
+        self.assertIsNone(ResultCache.make_key(([1],), {}))
+
+    def test_get_and_put(self):
+        cache = ResultCache()
+        self.assertIsNone(cache.get('key'))
+
+        result = Result.ok(1)
+        cache.put('key', result)
+        self.assertEqual(1, cache.get('key').value)
+        self.assertEqual(ResultCacheInfo(hits=1, misses=1, evictions=0, maxsize=128, currsize=1), cache.cache_info())
+
+        cache.cache_clear()
+        self.assertEqual(ResultCacheInfo(0, 0, 0, 128, 0), cache.cache_info())
+
+    def test_results_are_copied(self):
+        cache = ResultCache(failure_ttl=10)
+        result = Result.ok(1, SuccessDetail(more_data=['first']))
+        cache.put('key', result)
+        result.on_success_add_more_data('changed after put')
+
+        for n in range(3):
+            cached = cache.get('key')
+            self.assertIsNot(result, cached)
+            self.assertEqual(['first'], cached.detail.more_data)
+            cached.on_success_add_more_data(f'req{n}')
+
+        cache.put('empty', Result.ok())
+        self.assertIs(Result.ok(), cache.get('empty'))
+
+        cache.put('no detail', Result.ok(1))
+        cache.get('no detail').on_success_add_more_data('data')
+        self.assertIsNone(cache.get('no detail').detail)
+
+        failure = Result.fail(ErrorDetail())
+        failure.detail.more_data = None
+        cache.put('failure', failure)
+        self.assertIsNone(cache.get('failure').detail.more_data)
+
+        failure = Result.fail(ErrorDetail(errors={'name': 'required'}))
+        cache.put('errors', failure)
+        failure.detail.add_or_update_error('id', 'changed after put')
+        cache.get('errors').detail.add_or_update_error('age', 'changed after get')
+        self.assertEqual({'name': 'required'}, cache.get('errors').detail.errors)
+
+    def test_lru_eviction(self):
+        cache = ResultCache(maxsize=2)
+        cache.put(1, Result.ok(1))
+        cache.put(2, Result.ok(2))
+        cache.get(1)
+        cache.put(3, Result.ok(3))
+
+        self.assertIsNone(cache.get(2))
+        self.assertIsNotNone(cache.get(1))
+        self.assertIsNotNone(cache.get(3))
+        self.assertEqual(1, cache.cache_info().evictions)
+
+    def test_ttl(self):
+        cache = ResultCache(ttl=0.01)
+        cache.put('key', Result.ok(1))
+        self.assertIsNotNone(cache.get('key'))
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(ResultCacheInfo(hits=1, misses=1, evictions=1, maxsize=128, currsize=0), cache.cache_info())
+
+    def test_negative_caching(self):
+        failure = Result.fail(ErrorDetail())
+        cache = ResultCache()
+        cache.put('key', failure)
+        self.assertIsNone(cache.get('key'))
+
+        cache = ResultCache(failure_ttl=0.01)
+        cache.put('key', failure)
+        self.assertIsInstance(cache.get('key').detail, ErrorDetail)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('key'))
+
+    def test_thread_safety(self):
+        cache = ResultCache(maxsize=10)
+
+        def use():
+            for i in range(1000):
+                cache.put(i % 20, Result.ok(i))
+                cache.get(i % 20)
+
+        threads = [threading.Thread(target=use) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        info = cache.cache_info()
+        self.assertEqual(4000, info.hits + info.misses)
+        self.assertEqual(10, info.currsize)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,14 @@
 # pylint: disable=all
 
+import copy
+import pickle
 import unittest
 
-from on_rails.ResultDetail import ResultDetail
+from on_rails.ResultDetail import (ResultDetail, _detail_types,
+                                   get_detail_type, register_detail_type)
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.Errors import NotFoundError, ValidationError
+from on_rails.ResultDetails.Success import CreatedDetail
 from on_rails.test_helpers import assert_result_detail
 
 
@@ -18,6 +24,35 @@ class TestResultDetail(unittest.TestCase):
         assert_result_detail(test_class=self, target_result_detail=result_detail, expected_title='title', expected_message='message', expected_code=100,
                              expected_more_data=["more data"])
 
+    def test_slots(self):
+        for detail in [ResultDetail('title'), ValidationError(), NotFoundError(), CreatedDetail()]:
+            self.assertFalse(hasattr(detail, '__dict__'), msg=type(detail).__name__)
+
+        detail = FakeDetail('title')
+        detail.custom = 1
+        self.assertEqual(1, detail.custom)
+
+    def test_pickle_and_copy(self):
+        for detail in [ResultDetail('title', 'message', 100, [1]), NotFoundError(), CreatedDetail()]:
+            for new in [pickle.loads(pickle.dumps(detail)), copy.copy(detail), copy.deepcopy(detail)]:
+                self.assertIs(type(detail), type(new))
+                assert_result_detail(self, new, detail.title, detail.message, detail.code, detail.more_data)
+
+        detail = FakeDetail('title', more_data=[[1]])
+        detail.custom = [2]
+        for new in [pickle.loads(pickle.dumps(detail)), copy.deepcopy(detail)]:
+            self.assertEqual([2], new.custom)
+            self.assertEqual([[1]], new.more_data)
+            self.assertIsNot(detail.more_data, new.more_data)
+        self.assertIs(detail.custom, copy.copy(detail).custom)
+
+        # The slots that are not set are not copied.
+        detail = ResultDetail.__new__(ResultDetail)
+        detail.title = 'title'
+        for new in [copy.copy(detail), copy.deepcopy(detail)]:
+            self.assertEqual('title', new.title)
+            self.assertFalse(hasattr(new, 'message'))
+
     def test_init_without_required_args(self):
         self.assertRaises(ValueError, ResultDetail, title=None)
         self.assertRaises(ValueError, ResultDetail, title='')
@@ -73,6 +108,88 @@ class TestResultDetail(unittest.TestCase):
         self.assertEqual(expected, repr(result_detail))
 
 
+    def test_to_dict(self):
+        result_detail = ResultDetail(title='title', message='message', code=100, more_data=[1, (2, 3), {'a': {4}}])
+        self.assertEqual({'type': 'ResultDetail', 'title': 'title', 'message': 'message', 'code': 100,
+                          'more_data': [1, [2, 3], {'a': [4]}]}, result_detail.to_dict())
+
+        result_detail = CreatedDetail(more_data=[NotFoundError(), object])
+        data = result_detail.to_dict()
+        self.assertEqual('CreatedDetail', data['type'])
+        self.assertEqual('NotFoundError', data['more_data'][0]['type'])
+        self.assertIs(object, data['more_data'][1])
+
+        result_detail = FakeDetail('title')
+        result_detail.more_data = None
+        self.assertEqual({'type': 'FakeDetail', 'title': 'title', 'message': None, 'code': None, 'more_data': None},
+                         result_detail.to_dict())
+
+    def test_from_dict(self):
+        for result_detail in (ResultDetail('title', 'message', 100, more_data=[1]), CreatedDetail(), FakeDetail('t')):
+            new = ResultDetail.from_dict(result_detail.to_dict())
+            self.assertIs(result_detail.__class__, new.__class__)
+            self.assertEqual(result_detail.to_dict(), new.to_dict())
+
+        new = ResultDetail.from_dict({'title': 'title', 'more_data': None})
+        self.assertEqual((ResultDetail, []), (new.__class__, new.more_data))
+
+    def test_from_dict_by_code(self):
+        self.assertIs(CreatedDetail, ResultDetail.from_dict({'title': 'title', 'code': 201}).__class__)
+        self.assertIs(NotFoundError, ResultDetail.from_dict({'type': 'Unknown', 'title': 'title', 'code': 404}).__class__)
+        self.assertIs(FakeDetail, ResultDetail.from_dict({'title': 'title', 'code': 404}, FakeDetail).__class__)
+
+    def test_register_detail_type(self):
+        self.assertIs(NotFoundError, get_detail_type('NotFoundError'))
+        self.assertIsNone(get_detail_type('RemoteNotFound'))
+
+        self.addCleanup(_detail_types.pop, 'RemoteNotFound')
+        register_detail_type(NotFoundError, 'RemoteNotFound')
+        self.assertIs(NotFoundError, get_detail_type('RemoteNotFound'))
+        self.assertIs(NotFoundError, ResultDetail.from_dict({'type': 'RemoteNotFound', 'title': 'title'}).__class__)
+
+        self.assertRaises(ValueError, register_detail_type, object)
+        self.assertRaises(ValueError, register_detail_type, 'NotFoundError')
+
+    def test_registration_does_not_replace_names(self):
+        app_class = type('NotFoundError', (ResultDetail,), {})  # An unrelated class with the name of a built-in error
+
+        self.assertIs(NotFoundError, get_detail_type('NotFoundError'))
+        detail = ResultDetail.from_dict({'type': 'NotFoundError', 'title': 'title', 'code': 404}, ErrorDetail)
+        self.assertIs(NotFoundError, detail.__class__)
+
+        try:
+            register_detail_type(app_class)
+            self.assertIs(app_class, get_detail_type('NotFoundError'))
+            # The registered class is not an error detail, so it is not used for errors.
+            detail = ResultDetail.from_dict({'type': 'NotFoundError', 'title': 'title', 'code': 404}, ErrorDetail)
+            self.assertIs(NotFoundError, detail.__class__)
+        finally:
+            register_detail_type(NotFoundError)
+
+    def test_register_detail_type_without_code(self):
+        class TitledDetail(ResultDetail):
+            def __init__(self, title: str = 'titled'):
+                super().__init__(title)
+
+        self.addCleanup(_detail_types.pop, 'TitledDetail')
+        self.assertIs(TitledDetail, get_detail_type('TitledDetail'))
+        detail = ResultDetail.from_dict({'type': 'TitledDetail', 'title': 'title'})
+        self.assertIs(TitledDetail, detail.__class__)
+        self.assertIsNone(detail.code)
+
+    def test_from_dict_type_of_default_type(self):
+        detail = ResultDetail.from_dict({'type': 'CreatedDetail', 'title': 'title', 'code': 201}, ErrorDetail)
+        self.assertIs(ErrorDetail, detail.__class__)
+        detail = ResultDetail.from_dict({'type': 'CreatedDetail', 'title': 'title', 'code': 404}, ErrorDetail)
+        self.assertIs(NotFoundError, detail.__class__)
+
+    def test_from_dict_invalid_data(self):
+        for data in ([], {}, {'title': ''}, {'title': 'title', 'type': 1}, {'title': 'title', 'code': '404'},
+                     {'title': 'title', 'code': True}, {'title': 'title', 'more_data': 1},
+                     {'title': 'title', 'errors': []}):
+            self.assertRaises(ValueError, ResultDetail.from_dict, data)
+
+
 class FakeDetail(ResultDetail):
     pass
 
@@ -0,0 +1,61 @@
+# pylint: disable=all
+
+import time
+import unittest
+
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.RetryPolicy import JitterMode, RetryPolicy
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_init_give_invalid_args(self):
+        self.assertRaises(ValueError, RetryPolicy, base_delay=-1)
+        self.assertRaises(ValueError, RetryPolicy, max_delay=-1)
+        self.assertRaises(ValueError, RetryPolicy, multiplier=0.5)
+        self.assertRaises(ValueError, RetryPolicy, jitter='full')
+        self.assertRaises(ValueError, RetryPolicy, retry_on="ValueError")
+
+    def test_get_delay_without_jitter(self):
+        policy = RetryPolicy(base_delay=1, max_delay=5, jitter=JitterMode.NONE)
+        self.assertEqual([1, 2, 4, 5, 5], [policy.get_delay(attempt) for attempt in range(1, 6)])
+
+    def test_get_delay_full_jitter(self):
+        policy = RetryPolicy(base_delay=1, max_delay=5, jitter=JitterMode.FULL)
+        for attempt in range(1, 6):
+            delay = policy.get_delay(attempt)
+            self.assertTrue(0 <= delay <= min(5, 2 ** (attempt - 1)))
+
+    def test_get_delay_decorrelated_jitter(self):
+        policy = RetryPolicy(base_delay=1, max_delay=5, jitter=JitterMode.DECORRELATED)
+        delay = None
+        for attempt in range(1, 10):
+            new_delay = policy.get_delay(attempt, delay)
+            self.assertTrue(1 <= new_delay <= min(5, (delay if delay else 1) * 3))
+            delay = new_delay
+
+    def test_should_retry(self):
+        self.assertTrue(RetryPolicy().should_retry(ValueError()))
+        self.assertTrue(RetryPolicy(retry_on=ValueError).should_retry(ValueError()))
+
+        policy = RetryPolicy(retry_on=(ValueError, ErrorDetail))
+        self.assertTrue(policy.should_retry(ValueError()))
+        self.assertTrue(policy.should_retry(ErrorDetail()))
+        self.assertFalse(policy.should_retry(TypeError()))
+        self.assertFalse(policy.should_retry(None))
+
+        policy = RetryPolicy(retry_on=lambda error: str(error) == "retry")
+        self.assertTrue(policy.should_retry(Exception("retry")))
+        self.assertFalse(policy.should_retry(Exception("fatal")))
+
+    def test_get_next_delay(self):
+        policy = RetryPolicy(base_delay=1, jitter=JitterMode.NONE, max_elapsed_time=2.5,
+                             retry_on=(ValueError,))
+        started_at = time.monotonic()
+        self.assertEqual(1, policy.get_next_delay(1, ValueError(), started_at))
+        self.assertEqual(2, policy.get_next_delay(2, ValueError(), started_at, 1))
+        self.assertIsNone(policy.get_next_delay(3, ValueError(), started_at, 2))
+        self.assertIsNone(policy.get_next_delay(1, TypeError(), started_at))
+
+
+if __name__ == '__main__':
+    unittest.main()
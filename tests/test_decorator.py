@@ -1,14 +1,23 @@
 # pylint: disable=all
 
 import asyncio
+import time
 import unittest
 from typing import Coroutine
 
+from on_rails.BreakRailsMode import BreakRailsMode
+from on_rails.CircuitBreaker import CircuitBreaker, CircuitState
 from on_rails.decorator import def_result
 from on_rails.Result import BreakFunctionException, BreakRailsException, Result
+from on_rails.ResultCache import ResultCache
 from on_rails.ResultDetails.ErrorDetail import ErrorDetail
 from on_rails.ResultDetails.Errors.BadRequestError import BadRequestError
+from on_rails.ResultDetails.Errors.GatewayTimeoutError import \
+    GatewayTimeoutError
+from on_rails.ResultDetails.Errors.ServiceUnavailableError import \
+    ServiceUnavailableError
 from on_rails.ResultDetails.SuccessDetail import SuccessDetail
+from on_rails.RetryPolicy import RetryPolicy
 from on_rails.test_helpers import (assert_error_detail, assert_result,
                                    assert_result_detail,
                                    assert_result_with_type)
@@ -89,6 +98,296 @@ class TestDefResultDecorator(unittest.TestCase):
                                              "the first exception being stored in the exception field.",
                             expected_code=500, expected_more_data=[FAKE_EXCEPTION], expected_exception=FAKE_EXCEPTION)
 
+    def test_def_result_with_retry_policy(self):
+        attempts = []
+
+        @def_result(num_of_try=3, retry_policy=RetryPolicy(base_delay=0, retry_on=(ValueError,)))
+        def func():
+            attempts.append(1)
+            raise TypeError()
+
+        self.assertFalse(func().success)
+        self.assertEqual(1, len(attempts))
+
+    def test_def_result_with_func_keyword_argument(self):
+        @def_result(num_of_try=2)
+        def apply(func, value):
+            return func(value)
+
+        @def_result(timeout=1)
+        def apply_with_timeout(func, value):
+            return func(value)
+
+        assert_result(self, apply(func=str, value=1), expected_success=True, expected_value='1')
+        assert_result(self, apply_with_timeout(func=str, value=1), expected_success=True, expected_value='1')
+
+    def test_def_result_with_timeout(self):
+        @def_result(timeout=0.01)
+        def func(seconds):
+            time.sleep(seconds)
+            return seconds
+
+        assert_result_with_type(self, func(0.5), expected_success=False, expected_detail_type=GatewayTimeoutError)
+        assert_result(self, func(0), expected_success=True, expected_value=0)
+
+        @def_result(is_async=True, num_of_try=5, deadline=0.05)
+        async def func_async():
+            await asyncio.sleep(1)
+
+        result = asyncio.run(func_async())
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=GatewayTimeoutError)
+
+    def test_def_result_with_circuit_breaker(self):
+        calls = []
+        breaker = CircuitBreaker(window_size=2, min_calls=2)
+
+        @def_result(num_of_try=3, circuit_breaker=breaker)
+        def func(fail):
+            calls.append(1)
+            if fail:
+                raise FAKE_EXCEPTION
+            return Result.ok().break_function()
+
+        self.assertTrue(func(False).success)
+        self.assertFalse(func(True).success)
+        self.assertEqual(CircuitState.OPEN, breaker.state)
+        self.assertEqual(4, len(calls))
+
+        result = func(False)
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=ServiceUnavailableError)
+        self.assertEqual(4, len(calls))
+
+        @def_result(is_async=True, circuit_breaker=breaker)
+        async def func_async():
+            calls.append(1)
+
+        result = asyncio.run(func_async())
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=ServiceUnavailableError)
+        breaker.reset()
+        self.assertTrue(asyncio.run(func_async()).success)
+        self.assertEqual(5, len(calls))
+
+    def test_def_result_with_circuit_breaker_cancelled_trial(self):
+        calls = []
+        breaker = CircuitBreaker(window_size=1, min_calls=1, recovery_timeout=0.01)
+        breaker.record_result(Result.fail())
+        time.sleep(0.02)
+
+        @def_result(is_async=True, circuit_breaker=breaker)
+        async def func_async(delay):
+            calls.append(delay)
+            await asyncio.sleep(delay)
+            return delay
+
+        async def run():
+            task = asyncio.ensure_future(func_async(1))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertEqual(CircuitState.HALF_OPEN, breaker.state)
+            for _ in range(3):
+                assert_result(self, await func_async(0), expected_success=True, expected_value=0)
+            self.assertEqual([1, 0, 0, 0], calls)
+            self.assertEqual(CircuitState.CLOSED, breaker.state)
+
+        asyncio.run(run())
+
+        @def_result(circuit_breaker=breaker)
+        def interrupted():
+            raise KeyboardInterrupt()
+
+        breaker.record_result(Result.fail())
+        time.sleep(0.02)
+        self.assertRaises(KeyboardInterrupt, interrupted)
+        self.assertEqual(CircuitState.HALF_OPEN, breaker.state)
+        self.assertTrue(breaker.allow_request())
+
+    def test_def_result_with_circuit_breaker_stale_result(self):
+        breaker = CircuitBreaker(window_size=1, min_calls=1, recovery_timeout=0.01)
+
+        @def_result(is_async=True, circuit_breaker=breaker)
+        async def func_async(delay, fail=False):
+            await asyncio.sleep(delay)
+            return Result.fail() if fail else Result.ok(delay)
+
+        async def run():
+            stale_call = asyncio.ensure_future(func_async(0.05))  # Allowed while closed
+            await asyncio.sleep(0)
+            breaker.record_result(Result.fail())
+            await asyncio.sleep(0.02)
+            trial = asyncio.ensure_future(func_async(0.1, fail=True))
+            assert_result(self, await stale_call, expected_success=True, expected_value=0.05)
+            self.assertEqual(CircuitState.HALF_OPEN, breaker.state)
+            self.assertFalse((await trial).success)
+            self.assertEqual(CircuitState.OPEN, breaker.state)
+
+        asyncio.run(run())
+
+    def test_def_result_cancelled_without_circuit_breaker(self):
+        @def_result(is_async=True, num_of_try=2)
+        async def func_async():
+            await asyncio.sleep(1)
+
+        @def_result(num_of_try=2)
+        def interrupted():
+            raise KeyboardInterrupt()
+
+        async def run():
+            task = asyncio.ensure_future(func_async())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        self.assertRaises(KeyboardInterrupt, interrupted)
+
+    def test_def_result_with_cache(self):
+        calls = []
+        cache = ResultCache(failure_ttl=10)
+
+        @def_result(cache=cache)
+        def func(value, items=None):
+            calls.append(value)
+            if value < 0:
+                raise FAKE_EXCEPTION
+            return value
+
+        first = func(1)
+        self.assertEqual(first.value, func(1).value)
+        self.assertEqual(func(-1).detail.title, func(-1).detail.title)
+        self.assertEqual([1, -1], calls)
+
+        func(1, items=[1])  # Not hashable
+        func(1, items=[1])
+        self.assertEqual([1, -1, 1, 1], calls)
+        self.assertEqual(2, cache.cache_info().hits)
+
+        # Each caller receives its own copy, so changing it does not change the cached result.
+        for n in range(3):
+            func(1).on_success_add_more_data(f"req{n}")
+        self.assertEqual([f"req{n}"], func(1).on_success_add_more_data(f"req{n}").detail.more_data)
+
+        @def_result(is_async=True, cache=ResultCache())
+        async def func_async(value):
+            calls.append(value)
+            return value
+
+        self.assertEqual(asyncio.run(func_async(2)).value, asyncio.run(func_async(2)).value)
+        self.assertEqual(2, calls[-1])
+        self.assertEqual(5, len(calls))
+
+    def test_def_result_with_cache_and_open_circuit_breaker(self):
+        breaker = CircuitBreaker(window_size=1, min_calls=1)
+        breaker.record_result(Result.fail())
+        cache = ResultCache(failure_ttl=10)
+
+        @def_result(circuit_breaker=breaker, cache=cache)
+        def func():
+            return 1
+
+        self.assertFalse(func().success)
+        self.assertEqual(0, cache.cache_info().currsize)
+
+    def test_def_result_single_flight(self):
+        calls = []
+
+        @def_result(is_async=True, single_flight=True)
+        async def func(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return Result.ok(value)
+
+        async def run():
+            results = await asyncio.gather(*[func(1) for _ in range(50)], func(2), func([3]), func([3]))
+            self.assertEqual(50, len({id(result) for result in results[:50]}))  # Each caller has its own copy
+            self.assertTrue(all(result.value == 1 for result in results[:50]))
+            self.assertEqual(1, results[0].value)
+            self.assertEqual(2, results[50].value)
+            self.assertEqual([1, 1, 2], sorted(calls.count(value) for value in [1, 2, [3]]))  # [3] is not hashable
+
+            assert_result(self, await func(1), expected_success=True, expected_value=1)
+            self.assertEqual(5, len(calls))
+
+        asyncio.run(run())
+
+    def test_def_result_single_flight_copies_results(self):
+        @def_result(is_async=True, single_flight=True)
+        async def func():
+            await asyncio.sleep(0.01)
+            return Result.ok(1, SuccessDetail(more_data=['shared']))
+
+        async def run():
+            first, second = await asyncio.gather(func(), func())
+            first.on_success_add_more_data('first')
+            self.assertEqual(['shared'], second.detail.more_data)
+            self.assertIsNot(first.detail, second.detail)
+
+        asyncio.run(run())
+
+    def test_def_result_single_flight_cancel_one_caller(self):
+        calls = []
+
+        @def_result(is_async=True, single_flight=True)
+        async def func():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 1
+
+        async def run():
+            first = asyncio.ensure_future(func())
+            second = asyncio.ensure_future(func())
+            await asyncio.sleep(0.01)
+            first.cancel()
+            assert_result(self, await second, expected_success=True, expected_value=1)
+            self.assertTrue(first.cancelled())
+            self.assertEqual(1, len(calls))
+
+        asyncio.run(run())
+
+        with self.assertRaises(ValueError):
+            def_result(single_flight=True)(lambda: 1)
+
+    def test_def_result_single_flight_with_cache(self):
+        cache = ResultCache()
+
+        @def_result(is_async=True, single_flight=True, cache=cache)
+        async def func(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        async def run():
+            await asyncio.gather(func(1), func(1))
+            assert_result(self, await func(1), expected_success=True, expected_value=1)
+
+        asyncio.run(run())
+        self.assertEqual((1, 2, 1), (cache.cache_info().hits, cache.cache_info().misses, cache.cache_info().currsize))
+
+    def test_def_result_detects_async_functions(self):
+        @def_result()
+        async def func_async(value):
+            """ Doc of func_async """
+            await asyncio.sleep(0)
+            return value
+
+        self.assertTrue(asyncio.iscoroutinefunction(func_async))
+        self.assertEqual("func_async", func_async.__name__)
+        self.assertEqual(" Doc of func_async ", func_async.__doc__)
+        assert_result(self, asyncio.run(func_async(5)), expected_success=True, expected_value=5)
+
+        func = def_result()(divide_numbers)
+        self.assertFalse(asyncio.iscoroutinefunction(func))
+        self.assertIs(divide_numbers, func.__wrapped__)
+        assert_result(self, func(10, 2), expected_success=True, expected_value=5)
+
+    def test_def_result_force_sync_wrapper_for_async_function(self):
+        result = def_result(is_async=False)(divide_numbers_async)(10, 5)
+        assert_result(self, result, expected_success=True, expected_value=2)
+
+        result = def_result(is_async=False, num_of_try=2)(divide_numbers_async)(10, 5)
+        assert_result(self, result, expected_success=True, expected_value=2)
+
     def test_break_rails_with_result_ok(self):
         result_ok = Result.ok(1, SuccessDetail())
         break_rails = BreakRailsException(result_ok)
@@ -103,6 +402,23 @@ class TestDefResultDecorator(unittest.TestCase):
         result = def_result()(raise_exception)(break_rails)
         self.assertEqual(result_fail, result)
 
+    def test_break_rails_sentinel_mode(self):
+        calls = []
+
+        @def_result()
+        def func(value):
+            return Result.ok(value) \
+                .on_success_break_rails(lambda v: v > 10, mode=BreakRailsMode.SENTINEL) \
+                .on_success(lambda v: calls.append(v))
+
+        result = func(20)
+        assert_result(self, result, expected_success=True, expected_value=20)
+        self.assertFalse(result.is_broken)
+        self.assertEqual([], calls)
+
+        func(1)
+        self.assertEqual([1], calls)
+
     def test_break_function_with_result_ok(self):
         result_ok = Result.ok(1, SuccessDetail())
         break_function = BreakFunctionException(result_ok)
@@ -193,6 +509,18 @@ class TestDefResultDecoratorAsync(unittest.IsolatedAsyncioTestCase):
         result = await def_result(is_async=True)(raise_exception_async)(break_function)
         self.assertEqual(result_fail, result)
 
+    async def test_break_function_with_retries_async(self):
+        attempts = []
+
+        @def_result(num_of_try=2)
+        async def func():
+            attempts.append(1)
+            return Result.fail(ErrorDetail()).break_function()
+
+        result = await func()
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=ErrorDetail)
+        self.assertEqual(1, len(attempts))  # The function is not tried again
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,122 @@
+# pylint: disable=all
+
+import asyncio
+import time
+import unittest
+from typing import Optional
+
+from on_rails.gather import ReturnWhen, gather_results
+from on_rails.Result import BreakFunctionException, Result
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.RetryPolicy import RetryPolicy
+from on_rails.test_helpers import assert_result
+from tests.helpers import assert_result_with_type
+
+FAKE_EXCEPTION = Exception("fake")
+
+
+async def function_raise_exception_async():
+    raise FAKE_EXCEPTION
+
+
+async def function_fails_async(error_detail: Optional[ErrorDetail] = None):
+    await asyncio.sleep(0)
+    return Result.fail(detail=error_detail)
+
+
+async def async_function():
+    await asyncio.sleep(0)
+    return 5
+
+
+async def async_function_with_parameter(number: int):
+    await asyncio.sleep(0)
+    return number + 1
+
+
+class TestGather(unittest.IsolatedAsyncioTestCase):
+    # region gather_results
+
+    async def test_gather_results(self):
+        result = await gather_results([async_function(), lambda: async_function_with_parameter(1), lambda: 7])
+        assert_result(self, result, expected_success=True, expected_value=[5, 2, 7])
+
+        assert_result(self, await gather_results([]), expected_success=True, expected_value=[])
+
+        error = ErrorDetail()
+        result = await gather_results([function_raise_exception_async, lambda: function_fails_async(error), lambda: 1])
+        assert_result_with_type(self, result, expected_success=False, expected_detail_type=ErrorDetail)
+        self.assertEqual(2, len(result.detail.more_data))
+        self.assertIs(error, result.detail.more_data[1])
+
+    async def test_gather_results_limit(self):
+        running = []
+        max_running = []
+
+        async def func():
+            running.append(1)
+            max_running.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+
+        result = await gather_results([func] * 10, limit=3)
+        assert_result(self, result, expected_success=True, expected_value=[None] * 10)
+        self.assertEqual(3, max(max_running))
+
+        with self.assertRaises(ValueError):
+            await gather_results([func], limit=0)
+        with self.assertRaises(ValueError):
+            await gather_results([func], return_when='all')
+
+    async def test_gather_results_first_failure(self):
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+
+        error = ErrorDetail()
+        coroutine = slow()
+        result = await gather_results([slow, lambda: function_fails_async(error), coroutine],
+                                      limit=2, return_when=ReturnWhen.FIRST_FAILURE)
+        assert_result(self, result, expected_success=False, expected_detail=error)
+        self.assertTrue(cancelled)
+        self.assertIsNone(coroutine.cr_frame)  # Cancelled or closed before starting
+
+        result = await gather_results([lambda: 1, async_function], return_when=ReturnWhen.FIRST_FAILURE)
+        assert_result(self, result, expected_success=True, expected_value=[1, 5])
+
+    async def test_gather_results_retry_and_break_function(self):
+        attempts = []
+
+        async def func():
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise FAKE_EXCEPTION
+            return len(attempts)
+
+        result = await gather_results([func], num_of_try=2)
+        assert_result(self, result, expected_success=True, expected_value=[2])
+
+        with self.assertRaises(BreakFunctionException):
+            await gather_results([lambda: Result.ok().break_function()], return_when=ReturnWhen.FIRST_FAILURE)
+
+    async def test_gather_results_does_not_retry_awaitables(self):
+        async def boom():
+            raise ValueError()
+
+        started_at = time.monotonic()
+        result = await gather_results([boom()], num_of_try=3, retry_policy=RetryPolicy(base_delay=1))
+        self.assertLess(time.monotonic() - started_at, 0.5)
+        self.assertFalse(result.success)
+        errors = result.detail.more_data[0].more_data
+        self.assertEqual(['ValueError'], [type(error).__name__ for error in errors])
+
+    # endregion
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+# pylint: disable=all
+
+import asyncio
+import unittest
+
+from on_rails import instrument
+from on_rails.AsyncResult import AsyncResult
+from on_rails.decorator import def_result
+from on_rails.instrument import Observer, StepEvent
+from on_rails.Result import Result, try_func, try_func_async
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+
+FAKE_ERROR = ErrorDetail("fake")
+
+
+class RecordingObserver(Observer):
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def on_step_start(self, event):
+        self.starts.append(event)
+
+    def on_step_end(self, event):
+        self.ends.append(event)
+
+    def get_ends(self):
+        return [(event.step, event.func_name, event.attempt, event.success) for event in self.ends]
+
+
+def add_one(value):
+    return value + 1
+
+
+def fail():
+    return Result.fail(FAKE_ERROR)
+
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self):
+        self.observer = RecordingObserver()
+        instrument.set_observer(self.observer)
+
+    def tearDown(self):
+        instrument.set_observer(None)
+
+    def test_set_observer(self):
+        self.assertIs(self.observer, instrument.get_observer())
+        self.assertRaises(ValueError, instrument.set_observer, object())
+        self.assertIs(self.observer, instrument.get_observer())
+
+        instrument.set_observer(None)
+        self.assertIsNone(instrument.get_observer())
+        result = Result.ok(1).on_success(add_one)
+        self.assertEqual(2, result.value)
+        self.assertEqual([], self.observer.ends)
+
+    def test_get_func_name(self):
+        self.assertEqual('add_one', instrument.get_func_name(add_one))
+        self.assertEqual('RecordingObserver.get_ends', instrument.get_func_name(RecordingObserver.get_ends))
+        self.assertEqual('RecordingObserver', instrument.get_func_name(RecordingObserver()))
+
+    def test_try_func(self):
+        attempts = []
+
+        def func():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise Exception("fake")
+            return len(attempts)
+
+        result = try_func(func, num_of_try=3)
+        self.assertEqual(3, result.value)
+        self.assertEqual([StepEvent('try_func', func.__qualname__, attempt) for attempt in range(1, 4)],
+                         self.observer.starts)
+        self.assertEqual([('try_func', func.__qualname__, 1, False), ('try_func', func.__qualname__, 2, False),
+                          ('try_func', func.__qualname__, 3, True)], self.observer.get_ends())
+        self.assertTrue(all(event.duration_ns >= 0 for event in self.observer.ends))
+
+    def test_try_func_failed_result(self):
+        try_func(fail)
+        try_func(lambda: None, none_means_success=False)
+        self.assertEqual([False, False], [event.success for event in self.observer.ends])
+
+    def test_chain_steps(self):
+        Result.ok(1) \
+            .on_success(add_one) \
+            .on_success_tee(lambda value: value) \
+            .on_success(fail) \
+            .on_fail_tee(lambda prev: None) \
+            .on_fail(lambda prev: 5) \
+            .finally_tee(lambda: None)
+        self.assertEqual(['on_success', 'on_success_tee', 'on_success', 'on_fail_tee', 'on_fail', 'finally_tee'],
+                         [event.step for event in self.observer.ends])
+        self.assertEqual('add_one', self.observer.ends[0].func_name)
+        self.assertEqual('fail', self.observer.ends[2].func_name)
+        self.assertEqual([True, True, False, True, True, True], [event.success for event in self.observer.ends])
+
+    def test_skipped_steps_are_not_observed(self):
+        Result.fail(FAKE_ERROR).on_success(add_one).on_success_tee(add_one)
+        Result.ok(1).on_fail(add_one).on_fail_tee(add_one)
+        self.assertEqual([], self.observer.starts)
+
+    def test_break_rails(self):
+        result = Result.ok(1).on_success(lambda: Result.ok(2).break_rails())
+        self.assertEqual(2, result.value)
+        self.assertEqual([('on_success', 'TestInstrument.test_break_rails.<locals>.<lambda>', 1, True)],
+                         self.observer.get_ends())
+
+    def test_def_result(self):
+        @def_result()
+        def func(value):
+            return value + 1
+
+        @def_result(num_of_try=2)
+        def func_with_retry():
+            return Result.fail(FAKE_ERROR)
+
+        self.assertEqual(2, func(1).value)
+        func_with_retry()
+        self.assertEqual([('def_result', func.__qualname__, 1, True),
+                          ('def_result', func_with_retry.__qualname__, 1, False)], self.observer.get_ends())
+
+    def test_def_result_exception(self):
+        @def_result()
+        def func():
+            raise Exception("fake")
+
+        self.assertFalse(func().success)
+        self.assertEqual([('def_result', func.__qualname__, 1, False)], self.observer.get_ends())
+
+
+class TestInstrumentAsync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.observer = RecordingObserver()
+        instrument.set_observer(self.observer)
+
+    def tearDown(self):
+        instrument.set_observer(None)
+
+    async def test_try_func_async(self):
+        async def func():
+            await asyncio.sleep(0.01)
+            return 1
+
+        result = await try_func_async(func)
+        self.assertEqual(1, result.value)
+        self.assertEqual([('try_func_async', func.__qualname__, 1, True)], self.observer.get_ends())
+        self.assertGreaterEqual(self.observer.ends[0].duration_ns, 10_000_000)
+
+    async def test_timeout(self):
+        async def func():
+            await asyncio.sleep(1)
+
+        result = await try_func_async(func, timeout=0.01)
+        self.assertFalse(result.success)
+        self.assertEqual([('try_func_async', func.__qualname__, 1, None)], self.observer.get_ends())
+
+    async def test_async_result(self):
+        async def add_one_async(value):
+            return value + 1
+
+        await AsyncResult(Result.ok(1)).on_success(add_one_async).on_success_tee(add_one).on_fail(add_one)
+        self.assertEqual([('on_success', add_one_async.__qualname__, 1, True), ('on_success_tee', 'add_one', 1, True)],
+                         self.observer.get_ends())
+
+    async def test_def_result(self):
+        @def_result()
+        async def func():
+            return Result.fail(FAKE_ERROR)
+
+        @def_result(num_of_try=2, try_only_on_exceptions=False)
+        async def func_with_retry():
+            return Result.fail(FAKE_ERROR)
+
+        await func()
+        await func_with_retry()
+        self.assertEqual([('def_result', func.__qualname__, 1, False),
+                          ('def_result', func_with_retry.__qualname__, 1, False),
+                          ('def_result', func_with_retry.__qualname__, 2, False)], self.observer.get_ends())
+
+    async def test_def_result_exception(self):
+        @def_result()
+        async def func():
+            raise Exception("fake")
+
+        @def_result()
+        async def func_break_function():
+            return Result.ok(1).break_function()
+
+        self.assertFalse((await func()).success)
+        self.assertTrue((await func_break_function()).success)
+        self.assertEqual([('def_result', func.__qualname__, 1, False),
+                          ('def_result', func_break_function.__qualname__, 1, True)], self.observer.get_ends())
+
+
+if __name__ == '__main__':
+    unittest.main()
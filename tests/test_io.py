@@ -0,0 +1,77 @@
+# pylint: disable=all
+
+import io
+import unittest
+
+from on_rails.io import read_ndjson, write_ndjson
+from on_rails.Result import Result
+from on_rails.ResultDetails.Errors import NotFoundError, ValidationError
+from on_rails.ResultDetails.Success import CreatedDetail
+
+
+def make_results(count):
+    for i in range(count):
+        if i % 3 == 0:
+            yield Result.ok(i, CreatedDetail())
+        elif i % 3 == 1:
+            yield Result.fail(NotFoundError(message=f"Line\n{i}"))
+        else:
+            yield Result.fail(ValidationError(errors={'id': i}))
+
+
+class FakeFile:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(data)
+
+
+class TestIO(unittest.TestCase):
+    def test_write_and_read_text(self):
+        file = io.StringIO()
+        self.assertEqual(100, write_ndjson(make_results(100), file))
+        self.assertEqual(100, len(file.getvalue().splitlines()))
+
+        file.seek(0)
+        results = list(read_ndjson(file))
+        self.assertEqual([(result.success, result.value, result.detail.__class__) for result in make_results(100)],
+                         [(result.success, result.value, result.detail.__class__) for result in results])
+        self.assertEqual("Line\n1", results[1].detail.message)
+        self.assertEqual({'id': 2}, results[2].detail.errors)
+
+    def test_write_and_read_binary(self):
+        file = io.BytesIO()
+        write_ndjson([Result.ok('ü')], file)
+        write_ndjson([Result.fail()], file, encoder=lambda data: b'{"success":false}')
+        self.assertEqual('{"success":true,"value":"ü","detail":null}\n{"success":false}\n', file.getvalue().decode())
+
+        file = io.BytesIO(file.getvalue() + b'\n')
+        self.assertEqual([('ü', True), (None, False)],
+                         [(result.value, result.success) for result in read_ndjson(file)])
+
+    def test_write_in_chunks(self):
+        file = FakeFile()
+        self.assertEqual(1000, write_ndjson(make_results(1000), file, chunk_size=4096))
+        self.assertTrue(all(4096 <= len(data) < 4096 + 200 for data in file.writes[:-1]))
+        self.assertLess(len(file.writes[-1]), 4096 + 200)
+        self.assertEqual(1000, b''.join(file.writes).count(b'\n'))
+
+        file = FakeFile()
+        self.assertEqual(0, write_ndjson([], file))
+        self.assertEqual([], file.writes)
+        self.assertRaises(ValueError, write_ndjson, [], file, chunk_size=0)
+
+    def test_read_lazily(self):
+        results = read_ndjson(iter(['{"success":true}\n', 'not json\n']))
+        self.assertTrue(next(results).success)
+        with self.assertRaises(ValueError) as context:
+            next(results)
+        self.assertTrue(str(context.exception).startswith("Line 2 is not a valid result: "))
+
+        self.assertRaises(ValueError, list, read_ndjson(io.StringIO('[{"success":true}]\n')))
+        self.assertTrue(next(read_ndjson(io.StringIO('x'), decoder=lambda line: {'success': True})).success)
+
+
+if __name__ == '__main__':
+    unittest.main()
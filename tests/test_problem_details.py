@@ -0,0 +1,69 @@
+# pylint: disable=all
+
+import io
+import json
+import unittest
+
+from on_rails import problem_details
+from on_rails.problem_details import (get_problem_type, get_problem_type_base,
+                                      register_problem_type,
+                                      set_problem_type_base, to_problem_json,
+                                      write_problem)
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.Errors import (BadRequestError, ExceptionError,
+                                           InternalError, NotFoundError,
+                                           ValidationError)
+from on_rails.ResultDetails.SuccessDetail import SuccessDetail
+
+
+class TestProblemDetails(unittest.TestCase):
+    def tearDown(self):
+        set_problem_type_base(None)
+        problem_details._problem_types.clear()
+
+    def test_to_problem_json(self):
+        detail = NotFoundError(message='The user "1" is not found.', errors={'id': 'ü'})
+        self.assertEqual({'type': 'about:blank', 'status': 404, 'title': detail.title,
+                          'detail': 'The user "1" is not found.', 'errors': {'id': 'ü'}, 'instance': '/users/1'},
+                         json.loads(to_problem_json(detail, instance='/users/1')))
+
+        self.assertEqual(b'{"type":"about:blank","status":500,"title":"An error occurred"}',
+                         to_problem_json(ErrorDetail(code=None)))
+        self.assertEqual({'type': 'about:blank', 'status': 400, 'title': 'title', 'detail': '1'},
+                         json.loads(to_problem_json(BadRequestError(title='title', message=1))))
+
+    def test_write_problem(self):
+        buffer = bytearray(b'prefix')
+        size = write_problem(ValidationError(errors={'name': 'is required'}), buffer)
+        self.assertEqual(len(buffer) - len('prefix'), size)
+        self.assertEqual(to_problem_json(ValidationError(errors={'name': 'is required'})), buffer[len('prefix'):])
+
+        file = io.BytesIO()
+        size = write_problem(InternalError(), file)
+        self.assertEqual(to_problem_json(InternalError()), file.getvalue())
+        self.assertEqual(len(file.getvalue()), size)
+
+        self.assertRaises(ValueError, write_problem, SuccessDetail(), bytearray())
+
+    def test_problem_type(self):
+        self.assertIsNone(get_problem_type_base())
+        self.assertEqual('about:blank', get_problem_type(NotFoundError))
+
+        set_problem_type_base('https://example.com/problems/')
+        self.assertEqual('https://example.com/problems/', get_problem_type_base())
+        self.assertEqual('https://example.com/problems/not-found', get_problem_type(NotFoundError))
+        self.assertEqual('https://example.com/problems/error-detail', get_problem_type(ErrorDetail))
+        self.assertEqual('https://example.com/problems/bad-request',
+                         json.loads(to_problem_json(BadRequestError()))['type'])
+
+        register_problem_type(InternalError, 'https://example.com/internal')
+        self.assertEqual('https://example.com/internal', get_problem_type(ExceptionError))
+        self.assertEqual('https://example.com/internal', json.loads(to_problem_json(InternalError()))['type'])
+
+        self.assertRaises(ValueError, register_problem_type, SuccessDetail, 'uri')
+        self.assertRaises(ValueError, register_problem_type, 'NotFoundError', 'uri')
+        self.assertRaises(ValueError, register_problem_type, NotFoundError, '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+# pylint: disable=all
+
+import json
+import unittest
+
+from on_rails.Result import Result
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.Errors.NotFoundError import NotFoundError
+from on_rails.serialization import (dumps, get_default_encoder,
+                                    set_default_encoder)
+
+
+class TestSerialization(unittest.TestCase):
+    def test_dumps(self):
+        result = Result.fail(NotFoundError(message="message", more_data=[object]))
+        text = dumps(result)
+        self.assertTrue(text.startswith('{"success":false,"value":null,"detail":{"type":"NotFoundError"'))
+        data = json.loads(text)
+        self.assertEqual(result.to_dict()['detail']['title'], data['detail']['title'])
+        self.assertEqual([str(object)], data['detail']['more_data'])
+        self.assertNotIn('stack_trace', data['detail'])
+
+        self.assertEqual('{"type":"ErrorDetail","title":"ü"', dumps(ErrorDetail(title='ü'))[:33])
+        self.assertEqual('"text"', dumps('text'))
+
+    def test_dumps_list(self):
+        data = json.loads(dumps([Result.ok(1), Result.fail(ErrorDetail())], include_stack_trace=True))
+        self.assertEqual([True, False], [item['success'] for item in data])
+        self.assertIn('stack_trace', data[1]['detail'])
+
+    def test_encoder(self):
+        self.assertEqual(b'True', dumps(Result.ok(), encoder=lambda data: str(data['success']).encode()))
+
+        default_encoder = get_default_encoder()
+        try:
+            set_default_encoder(lambda data: 'encoded')
+            self.assertEqual('encoded', dumps(Result.ok()))
+            set_default_encoder(None)
+            self.assertIs(default_encoder, get_default_encoder())
+        finally:
+            set_default_encoder(default_encoder)
+
+        self.assertRaises(ValueError, set_default_encoder, 'json')
+
+
+if __name__ == '__main__':
+    unittest.main()
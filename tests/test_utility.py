@@ -1,10 +1,21 @@
 # pylint: disable=all
 import asyncio
+import functools
+import sys
+import threading
+import time
 import unittest
+from concurrent.futures import wait
 
-from on_rails._utility import (await_func, generate_error, get_loop,
+from on_rails._utility import (AttemptRejectedError, AttemptTimeoutError,
+                               _ArityCache, _get_timeout_executor,
+                               arity_cache_clear, arity_cache_info, await_func,
+                               call_with_timeout, generate_error, get_loop,
                                get_num_of_function_parameters, is_async)
+from on_rails.Result import try_func
 from on_rails.ResultDetails.ErrorDetail import ErrorDetail
+from on_rails.ResultDetails.Errors.GatewayTimeoutError import \
+    GatewayTimeoutError
 from tests.helpers import assert_error_detail
 
 
@@ -28,6 +39,118 @@ class TestUtility(unittest.TestCase):
 
         self.assertRaises(AttributeError, get_num_of_function_parameters, print)
 
+    def test_get_num_of_function_parameters_cache(self):
+        arity_cache_clear()
+
+        for _ in range(3):
+            self.assertEqual(1, get_num_of_function_parameters(lambda x: x))
+        info = arity_cache_info()
+        self.assertEqual(1, info.misses)
+        self.assertEqual(2, info.hits)
+        self.assertEqual(1, info.currsize)
+
+        arity_cache_clear()
+        info = arity_cache_info()
+        self.assertEqual((0, 0, 0), (info.hits, info.misses, info.currsize))
+
+    def test_get_num_of_function_parameters_cache_callable_types(self):
+        class Sample:
+            def method(self, a, b):
+                pass
+
+            def __call__(self, a):
+                pass
+
+        def wrapped(a, b, c):
+            pass
+
+        @functools.wraps(wrapped)
+        def wrapper(*args, **kwargs):
+            pass
+
+        arity_cache_clear()
+        for _ in range(2):
+            self.assertEqual(2, get_num_of_function_parameters(Sample().method))
+            self.assertEqual(3, get_num_of_function_parameters(Sample.method))
+            self.assertEqual(1, get_num_of_function_parameters(Sample()))
+            self.assertEqual(1, get_num_of_function_parameters(functools.partial(lambda a, b: a, 1)))
+            self.assertEqual(3, get_num_of_function_parameters(wrapper))
+            self.assertEqual(2, get_num_of_function_parameters(sum))
+        self.assertEqual(4, arity_cache_info().hits)
+
+    def test_arity_cache_maxsize(self):
+        class Sample:
+            def __call__(self):
+                pass
+
+            @functools.wraps(lambda a: a)
+            def wrapped_method(self, *args):
+                pass
+
+        def first(): pass
+
+        def second(): pass
+
+        def third(): pass
+
+        cache = _ArityCache(maxsize=2)
+        for func in (first, second, third):
+            cache.set(func, 0)
+        self.assertEqual(2, cache.info().currsize)
+        self.assertIsNone(cache.get(first))  # The oldest entry is removed
+        self.assertEqual(0, cache.get(third))
+
+        callable_object = Sample()
+        cache.set(callable_object, 0)  # The entries of the other kinds are removed when its kind has no entry.
+        self.assertEqual(2, cache.info().currsize)
+        self.assertIsNone(cache.get(second))
+        self.assertEqual(0, cache.get(callable_object))
+
+        cache = _ArityCache(maxsize=3)
+        cache.set(first, 0)
+        cache.set(callable_object, 0)
+        cache.set(Sample().wrapped_method, 1)
+        cache.set(second, 0)
+        self.assertEqual(3, cache.info().maxsize)
+        self.assertEqual(3, cache.info().currsize)
+        self.assertEqual(1, cache.get(Sample().wrapped_method))
+
+        cache = _ArityCache(maxsize=0)
+        cache.set(first, 0)
+        self.assertEqual(0, cache.info().currsize)
+
+    def test_arity_cache_threads(self):
+        class Callable:
+            def __call__(self):
+                pass
+
+        cache = _ArityCache(maxsize=4)
+        errors = []
+
+        def work():
+            try:
+                for func in [Callable() for _ in range(500)]:
+                    cache.set(func, 0)
+                    cache.get(func)
+            except Exception as e:
+                errors.append(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=work) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertEqual([], errors)
+        info = cache.info()
+        self.assertEqual(8 * 500, info.hits + info.misses)
+        self.assertLessEqual(info.currsize, 4)
+
     # endregion
 
     # region is_async
@@ -95,6 +218,67 @@ class TestUtility(unittest.TestCase):
         self.assertEqual("Hello, World!", result)
 
         self.assertEqual(5, await_func(lambda: 5))
+        self.assertEqual('1', await_func(lambda func, value: func(value), func=str, value=1))
+
+    def test_call_with_timeout_bounds_threads(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = threading.Semaphore(0)
+        executor = _get_timeout_executor()
+        threads_before = threading.active_count()
+
+        def hang():
+            started.release()
+            release.wait()
+
+        with self.assertRaises(AttemptTimeoutError):
+            call_with_timeout(hang, 0.05)
+        # Waits for all the hung attempts to start, so no worker is free.
+        hung = [executor.submit(hang) for _ in range(executor._max_workers - 1)]
+        for _ in range(executor._max_workers):
+            self.assertTrue(started.acquire(timeout=5))
+
+        for _ in range(executor._max_workers * 2):
+            with self.assertRaises(AttemptRejectedError):
+                call_with_timeout(release.wait, 0.001)
+        self.assertLessEqual(threading.active_count() - threads_before, executor._max_workers)
+
+        # The hung attempts keep all the workers, so a healthy attempt is rejected instead of timing out.
+        with self.assertRaises(AttemptRejectedError):
+            call_with_timeout(lambda: 5, 0.05)
+        result = try_func(lambda: 42, timeout=0.05)
+        self.assertFalse(result.success)
+        self.assertNotIsInstance(result.detail, GatewayTimeoutError)
+        self.assertIsInstance(result.detail.exception, AttemptRejectedError)
+
+        release.set()
+        wait(hung)
+        self.assertEqual(5, call_with_timeout(lambda: 5, 5))
+
+    def test_call_with_timeout_counts_from_start(self):
+        executor = _get_timeout_executor()
+        busy = [executor.submit(time.sleep, 0.2) for _ in range(executor._max_workers)]
+
+        started_at = time.monotonic()
+        self.assertEqual(1, call_with_timeout(lambda: time.sleep(0.15) or 1, 0.25))
+        self.assertGreater(time.monotonic() - started_at, 0.25)
+        wait(busy)
+
+    def test_call_with_timeout_reuses_event_loops(self):
+        async def get_running_loop():
+            return asyncio.get_running_loop()
+
+        loops = {call_with_timeout(get_running_loop, 5) for _ in range(100)}
+        self.assertLessEqual(len(loops), _get_timeout_executor()._max_workers)
+        self.assertFalse(any(loop.is_closed() for loop in loops))
+
+    def test_call_with_timeout_raises_errors_of_function(self):
+        def raise_timeout_error():
+            raise TimeoutError("the error of the function")
+
+        with self.assertRaises(TimeoutError) as context:
+            call_with_timeout(raise_timeout_error, 5)
+        self.assertNotIsInstance(context.exception, AttemptTimeoutError)
 
 
 if __name__ == '__main__':
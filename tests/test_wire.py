@@ -0,0 +1,110 @@
+# pylint: disable=all
+
+import pickle
+import unittest
+
+from on_rails import wire
+from on_rails.Result import Result
+from on_rails.ResultDetail import ResultDetail
+from on_rails.ResultDetails.ErrorDetail import ErrorDetail, RemoteException
+from on_rails.ResultDetails.Errors import NotFoundError, ValidationError
+from on_rails.ResultDetails.Success import CreatedDetail
+from on_rails.ResultDetails.SuccessDetail import SuccessDetail
+
+
+class TestWire(unittest.TestCase):
+    def test_round_trip(self):
+        for value in (None, True, False, 0, 1, -1, 127, 128, -2 ** 70, 2 ** 70, 1.5, float('inf'), '', 'ü' * 100,
+                      b'\x00\xff', [1, [2]], {'a': {1: None}}):
+            self.assertEqual(value, wire.decode(wire.encode(value)))
+        self.assertEqual([1, 2], wire.decode(wire.encode((1, 2))))
+        self.assertEqual(str(object), wire.decode(wire.encode(object)))
+
+    def test_result(self):
+        detail = NotFoundError(message='ü', more_data=[{'id': 1}, CreatedDetail(), Result.ok(2)])
+        result = wire.decode(wire.encode(Result.fail(detail)))
+        self.assertFalse(result.success)
+        self.assertIs(NotFoundError, result.detail.__class__)
+        self.assertEqual(('ü', 404, []), (result.detail.message, result.detail.code, result.detail.stack_trace))
+        self.assertEqual({'id': 1}, result.detail.more_data[0])
+        self.assertIs(CreatedDetail, result.detail.more_data[1].__class__)
+        self.assertEqual((True, 2), (result.detail.more_data[2].success, result.detail.more_data[2].value))
+
+        result = wire.decode(wire.encode(Result.ok([1, 'a'], CreatedDetail())))
+        self.assertEqual((True, [1, 'a'], CreatedDetail), (result.success, result.value, result.detail.__class__))
+
+        result = wire.decode(wire.encode(Result.fail(ValidationError(errors={'a': 'b'}, exception=ValueError('v')))))
+        self.assertEqual({'a': 'b'}, result.detail.errors)
+        self.assertIsInstance(result.detail.exception, RemoteException)
+        self.assertEqual(('builtins.ValueError', 'v'), (result.detail.exception.type_name,
+                                                        result.detail.exception.message))
+
+    def test_detail_type(self):
+        self.assertIs(WireFakeDetail, wire.decode(wire.encode(WireFakeDetail('title'))).__class__)
+
+        # The types that are not registered in the receiver are created by the success of their results.
+        def encode_unknown(obj):
+            return wire.encode(obj).replace(b'WireFakeDetail', b'UnknownDetail1')
+
+        self.assertIs(ResultDetail, wire.decode(encode_unknown(WireFakeDetail('title'))).__class__)
+        self.assertIs(ErrorDetail, wire.decode(encode_unknown(Result.fail(WireFakeDetail('title')))).detail.__class__)
+        result = wire.decode(encode_unknown(Result.ok(None, WireFakeDetail('title'))))
+        self.assertIs(SuccessDetail, result.detail.__class__)
+
+    def test_interned_table(self):
+        results = [Result.fail(NotFoundError(message=str(i))) for i in range(100)]
+        data = wire.encode(results)
+        self.assertEqual(1, data.count(NotFoundError().title.encode()))
+        self.assertLess(len(data), len(pickle.dumps(results)))
+        self.assertEqual([str(i) for i in range(100)], [result.detail.message for result in wire.decode(data)])
+
+    def test_decode_memoryview(self):
+        data = wire.encode([Result.ok('value'), Result.fail()])
+        buffer = bytearray(b'head' + data + b'tail')
+        results = wire.decode(memoryview(buffer)[4:-4])
+        self.assertEqual([('value', True), (None, False)], [(result.value, result.success) for result in results])
+
+    def test_decode_invalid_data(self):
+        data = wire.encode(Result.fail(NotFoundError(more_data=[1])))
+        for invalid in (b'', b'ORW', b'JSON', data[:-1], data + b'\x00', data[:4] + b'\x00\x63', data[:4] + b'\x00\x7f',
+                        data[:4] + b'\x00\x08\x01\x07\x00\x00', data[:4] + b'\x00\x0a\x00\x03\x02'):
+            self.assertRaises(ValueError, wire.decode, invalid)
+
+        with self.assertRaises(ValueError) as context:
+            wire.decode(b'ORW\x02')
+        self.assertEqual("The version 2 of the wire format is not supported.", str(context.exception))
+
+        # The size of the more_data list does not match its items.
+        index = data.index(bytes([wire._SIZED_LIST]) + b'\x02\x01')
+        self.assertRaises(ValueError, wire.decode, data[:index + 1] + b'\x01' + data[index + 2:])
+
+        with self.assertRaises(ValueError) as context:
+            wire.decode(data[:4] + bytes([0, wire._STR, 5]) + b'ab')
+        self.assertEqual("The data is not valid: The length is out of the data.", str(context.exception))
+
+    def test_decode_invalid_detail(self):
+        detail = ResultDetail(title='title')
+        for title in (None, 5):
+            detail.title = title  # The titles that are not strings are encoded as values.
+            with self.assertRaises(ValueError) as context:
+                wire.decode(wire.encode(detail))
+            self.assertEqual("The title of the detail is required.", str(context.exception))
+
+    def test_interned_indexes_out_of_inline_range(self):
+        results = [Result.fail(ErrorDetail(title=f'title {i}')) for i in range(200)]
+        decoded = wire.decode(wire.encode(results))
+        self.assertEqual([f'title {i}' for i in range(200)], [result.detail.title for result in decoded])
+
+    def test_readers(self):
+        # The decoder reads None and the strings inline, but its readers support them too.
+        decoder = wire._Decoder(memoryview(bytes([2]) + b'ab'), 0)
+        self.assertIsNone(decoder._readers[wire._NONE](wire._NONE))
+        self.assertEqual('ab', decoder._readers[wire._STR](wire._STR))
+
+
+class WireFakeDetail(ResultDetail):
+    pass
+
+
+if __name__ == '__main__':
+    unittest.main()